@@ -0,0 +1,74 @@
+from math import inf as infinity
+import os
+
+from compact_graph import CompactGraph
+from data_structures.queues import IndexedPriorityQueue
+from graphs import load_graph, retrace, by_distance, great_circle, City
+
+def astar(graph, source, destination, weight_factory, heuristic):
+    """
+    Dijkstra's algorithm steered towards the destination:
+    nodes come off the queue by their cost so far plus heuristic(node, destination), an estimate of the cost left.
+    The heuristic must never overestimate, and never drop by more than an edge's weight along that edge,
+    for the returned path to be the shortest one.
+    """
+    previous = {}
+    visited = set()
+    distance = {source: 0}
+    estimate = {} # heuristic values are computed once per node
+
+    unvisited = IndexedPriorityQueue()
+    unvisited.enqueue(heuristic(source, destination), source)
+
+    while unvisited:
+        current_node = unvisited.dequeue()
+        if current_node == destination:
+            break # with a consistent heuristic the first time we reach the destination is the cheapest
+        visited.add(current_node)
+        current_cost = distance[current_node]
+        for neighbor, weights in graph[current_node].items():
+            if neighbor not in visited:
+                new_distance = current_cost + weight_factory(weights)
+                if new_distance < distance.get(neighbor, infinity):
+                    distance[neighbor] = new_distance
+                    previous[neighbor] = current_node
+                    if neighbor not in estimate:
+                        estimate[neighbor] = heuristic(neighbor, destination)
+                    unvisited.enqueue(new_distance + estimate[neighbor], neighbor)
+
+    return retrace(previous, source, destination)
+
+def great_circle_heuristic(graph, weight_factory):
+    """
+    Heuristic for astar() from the cities' coordinates.
+    Edge weights are rounded and don't always follow the roads' real length, so the great-circle distance
+    gets scaled down by the smallest weight to great-circle ratio found on the graph's edges,
+    which keeps the heuristic from overestimating.
+    On a CompactGraph the heuristic takes node ids and looks their cities up in graph.cities.
+    """
+    if isinstance(graph, CompactGraph):
+        cities = graph.cities
+        def distance(node1, node2):
+            return great_circle(cities[node1], cities[node2])
+    else:
+        distance = great_circle
+
+    scale = 1.0
+    for node1, node2, weights in graph.edges(data=True):
+        if (straight_line := distance(node1, node2)) > 0:
+            scale = min(scale, weight_factory(weights) / straight_line)
+
+    def heuristic(node, destination):
+        return scale * distance(node, destination)
+    return heuristic
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    nodes, graph = load_graph(filepath, City.from_dict)
+    heuristic = great_circle_heuristic(graph, by_distance)
+
+    for city in astar(graph, nodes["london"], nodes["edinburgh"], by_distance, heuristic):
+        print(city.name)
+
+if __name__ == "__main__":
+    main()
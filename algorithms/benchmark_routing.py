@@ -0,0 +1,157 @@
+"""
+Point-to-point routing benchmarks: nodes settled and latency per query.
+Run from the algorithms/ directory: python benchmark_routing.py
+"""
+
+from random import Random
+from statistics import mean
+from time import perf_counter
+import os
+
+import networkx as nx
+
+from graphs import load_graph, by_distance, great_circle, City
+from dijkstra import dijkstra, bidirectional_dijkstra, shortest_path_tree, clear_shortest_path_trees
+from astar import astar, great_circle_heuristic
+from contraction_hierarchies import ContractionHierarchy
+from spatial_index import SpatialIndex
+
+class SettledCounter:
+    """Wraps a graph and counts how many times the search algorithms expand a node's edges"""
+    def __init__(self, graph):
+        self.graph = graph
+        self.settled = 0
+
+    def __getitem__(self, node):
+        self.settled += 1
+        return self.graph[node]
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+def road_grid(rows, columns, seed=0):
+    """
+    Road-like graph of rows x columns cities spread over Great Britain, each linked to its grid neighbours
+    by a road somewhat longer than the straight line between them
+    """
+    random = Random(seed)
+    cities = [
+        [
+            City(f"{row},{column}", "Grid", None, 50.0 + 8.0 * row / rows, -5.0 + 6.0 * column / columns)
+            for column in range(columns)
+        ]
+        for row in range(rows)
+    ]
+    graph = nx.Graph()
+    for row in range(rows):
+        for column in range(columns):
+            for next_row, next_column in ((row + 1, column), (row, column + 1)):
+                if next_row < rows and next_column < columns:
+                    city1, city2 = cities[row][column], cities[next_row][next_column]
+                    distance = great_circle(city1, city2) * random.uniform(1.0, 1.4)
+                    graph.add_edge(city1, city2, distance=distance)
+    return graph
+
+def algorithms(graph):
+    heuristic = great_circle_heuristic(graph, by_distance)
+    return {
+        "dijkstra": dijkstra,
+        "bidirectional": bidirectional_dijkstra,
+        "astar": lambda graph, source, destination, weight_factory:
+            astar(graph, source, destination, weight_factory, heuristic),
+    }
+
+def benchmark(name, graph, queries=50, seed=0):
+    random = Random(seed)
+    nodes = list(graph.nodes)
+    pairs = [(random.choice(nodes), random.choice(nodes)) for _ in range(queries)]
+
+    print(f"{name}: {len(nodes)} nodes, {queries} random queries")
+    print(f"{'algorithm':14} {'settled/query':>14} {'ms/query':>10}")
+    for algorithm_name, algorithm in algorithms(graph).items():
+        settled, latencies = [], []
+        for source, destination in pairs:
+            counter = SettledCounter(graph)
+            start = perf_counter()
+            algorithm(counter, source, destination, by_distance)
+            latencies.append(perf_counter() - start)
+            settled.append(counter.settled)
+        print(f"{algorithm_name:14} {mean(settled):14.1f} {1000 * mean(latencies):10.3f}")
+    print()
+
+def benchmark_depots(name, graph, depots=3, queries=500, seed=0):
+    """Many queries from a handful of depots: one search per query versus one cached shortest path tree per depot"""
+    random = Random(seed)
+    nodes = list(graph.nodes)
+    sources = random.sample(nodes, depots)
+    pairs = [(random.choice(sources), random.choice(nodes)) for _ in range(queries)]
+    clear_shortest_path_trees(graph)
+
+    print(f"{name}: {queries} queries from {depots} depots")
+    print(f"{'mode':14} {'ms/query':>10}")
+    modes = {
+        "per query": lambda source, destination: dijkstra(graph, source, destination, by_distance),
+        "cached tree": lambda source, destination: shortest_path_tree(graph, source, by_distance).path_to(destination),
+    }
+    for mode, query in modes.items():
+        start = perf_counter()
+        for source, destination in pairs:
+            query(source, destination)
+        print(f"{mode:14} {1000 * (perf_counter() - start) / queries:10.3f}")
+    print()
+
+def benchmark_contraction_hierarchy(name, graph, queries=200, seed=0):
+    """One-off preprocessing time, then query latency of the contraction hierarchy against dijkstra()"""
+    start = perf_counter()
+    hierarchy = ContractionHierarchy.build(graph, by_distance)
+    print(f"{name}: contraction hierarchy built in {perf_counter() - start:.2f}s")
+
+    random = Random(seed)
+    nodes = list(graph.nodes)
+    pairs = [(random.choice(nodes), random.choice(nodes)) for _ in range(queries)]
+    print(f"{'algorithm':14} {'ms/query':>10}")
+    for algorithm_name, query in {
+        "dijkstra": lambda source, destination: dijkstra(graph, source, destination, by_distance),
+        "hierarchy": hierarchy.shortest_path,
+    }.items():
+        start = perf_counter()
+        for source, destination in pairs:
+            query(source, destination)
+        print(f"{algorithm_name:14} {1000 * (perf_counter() - start) / queries:10.3f}")
+    print()
+
+def benchmark_snapping(name, graph, points=2000, seed=0):
+    """Snapping random GPS points to their nearest node: linear scan over the nodes against the spatial index"""
+    random = Random(seed)
+    cities = list(graph.nodes)
+    positions = [(random.uniform(50.0, 58.0), random.uniform(-5.0, 1.0)) for _ in range(points)]
+    start = perf_counter()
+    index = SpatialIndex(cities)
+    print(f"{name}: {points} GPS points, spatial index built in {perf_counter() - start:.2f}s")
+
+    def linear_scan(latitude, longitude):
+        point = City("", "", None, latitude, longitude)
+        return min(cities, key=lambda city: great_circle(point, city))
+
+    print(f"{'method':14} {'ms/point':>10}")
+    for method, snap in {
+        "linear scan": lambda: [linear_scan(*position) for position in positions[:points // 20]],
+        "spatial index": lambda: index.nearest_many(positions),
+    }.items():
+        start = perf_counter()
+        snapped = snap()
+        print(f"{method:14} {1000 * (perf_counter() - start) / len(snapped):10.3f}")
+    print()
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    _, graph = load_graph(filepath, City.from_dict)
+    benchmark("roadmap.dot", graph)
+    grid = road_grid(200, 200)
+    benchmark("road grid", grid)
+    benchmark_depots("road grid", grid)
+    benchmark_contraction_hierarchy("road grid", road_grid(60, 60))
+    benchmark_snapping("road grid", grid)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Graph representation benchmarks: memory per edge and traversal throughput of networkx.Graph against CompactGraph.
+Run from the algorithms/ directory: python benchmark_traversal.py [rows] [depth-first nodes]
+"""
+
+from time import perf_counter
+import sys
+import tracemalloc
+
+import networkx as nx
+
+from graphs import (
+    breadth_first_traverse, breadth_first_levels, depth_first_traverse, depth_first_events, by_distance,
+    PRE_ORDER, POST_ORDER, ALL_EVENTS,
+)
+from dijkstra import single_source_dijkstra
+from compact_graph import CompactGraph
+from benchmark_routing import road_grid
+
+def allocated(build):
+    """Result of build() and the bytes it still holds on to once built"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def benchmark_memory(edges):
+    cities = {city for edge in edges for city in edge[:2]} # shared by both representations, left out of the count
+    graph, graph_bytes = allocated(lambda: _networkx_graph(edges))
+    compact, compact_bytes = allocated(lambda: CompactGraph.from_networkx(graph))
+
+    print(f"{len(cities)} nodes, {len(edges)} edges")
+    print(f"{'graph':14} {'bytes/edge':>11}")
+    print(f"{'networkx':14} {graph_bytes / len(edges):11.1f}")
+    print(f"{'compact':14} {compact_bytes / len(edges):11.1f}")
+    print()
+    return graph, compact
+
+def benchmark_traversals(graph, compact):
+    source = next(iter(graph.nodes))
+    sources = {"networkx": source, "compact": compact.node_id(source)}
+    traversals = {
+        "bfs": lambda graph, source: sum(1 for _ in breadth_first_traverse(graph, source)),
+        "bfs levels": lambda graph, source: sum(len(level) for level in breadth_first_levels(graph, source)),
+        "dfs": lambda graph, source: sum(1 for _ in depth_first_traverse(graph, source)),
+        "dijkstra": lambda graph, source: single_source_dijkstra(graph, source, by_distance),
+    }
+    edges = 2 * graph.number_of_edges() # each undirected edge is looked at from both ends
+
+    print(f"{'traversal':12} {'graph':10} {'seconds':>8} {'edges/s':>12}")
+    for name, traverse in traversals.items():
+        for graph_name, target in (("networkx", graph), ("compact", compact)):
+            start = perf_counter()
+            traverse(target, sources[graph_name])
+            elapsed = perf_counter() - start
+            print(f"{name:12} {graph_name:10} {elapsed:8.2f} {edges / elapsed:12,.0f}")
+    print()
+
+def path_graph(n):
+    return CompactGraph.from_edges(range(n), ((node, node + 1, {}) for node in range(n - 1)))
+
+def grid_graph(side):
+    return CompactGraph.from_edges(range(side * side), (
+        (node, neighbor, {})
+        for node in range(side * side)
+        for neighbor in (node + 1 if (node + 1) % side else None, node + side if node + side < side * side else None)
+        if neighbor is not None
+    ))
+
+def benchmark_depth_first(nodes):
+    """Depth-first traversals of a path, as deep as a graph gets, and of a square grid, both with about nodes nodes"""
+    side = round(nodes ** 0.5)
+    graphs = {f"path {nodes}": path_graph(nodes), f"grid {side}x{side}": grid_graph(side)}
+    traversals = {
+        "pre-order": {PRE_ORDER},
+        "post-order": {POST_ORDER},
+        "all events": ALL_EVENTS,
+    }
+
+    print(f"{'graph':16} {'events':12} {'seconds':>8} {'nodes/s':>12}")
+    for graph_name, graph in graphs.items():
+        for name, events in traversals.items():
+            start = perf_counter()
+            for _ in depth_first_events(graph, 0, events=events):
+                pass
+            elapsed = perf_counter() - start
+            print(f"{graph_name:16} {name:12} {elapsed:8.2f} {len(graph) / elapsed:12,.0f}")
+    print()
+
+def _networkx_graph(edges):
+    graph = nx.Graph()
+    graph.add_edges_from(edges)
+    return graph
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    depth_first_nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 10 ** 6
+    grid = road_grid(rows, rows)
+    edges = list(grid.edges(data=True))
+    del grid
+    graph, compact = benchmark_memory(edges)
+    del edges
+    benchmark_traversals(graph, compact)
+    benchmark_depth_first(depth_first_nodes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+from array import array
+from itertools import filterfalse
+
+class EdgeAttributes:
+    """
+    Read-only, dict-like view of one edge's attributes stored in the columns of a CompactGraph.
+    Edges without some attribute hold None in its column, which the view reports as absent like a networkx edge would.
+    """
+    __slots__ = ("_columns", "_edge")
+
+    def __init__(self, columns, edge):
+        self._columns = columns
+        self._edge = edge
+
+    def __getitem__(self, name):
+        value = self._columns[name][self._edge]
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name):
+        column = self._columns.get(name)
+        return column is not None and column[self._edge] is not None
+
+    def __iter__(self):
+        return (name for name, column in self._columns.items() if column[self._edge] is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def get(self, name, default=None):
+        column = self._columns.get(name)
+        value = None if column is None else column[self._edge]
+        return default if value is None else value
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        edge = self._edge
+        return ((name, column[edge]) for name, column in self._columns.items() if column[edge] is not None)
+
+class Adjacency:
+    """Neighbours of one node and the attributes of the edges leading to them, like networkx's graph[node]"""
+    __slots__ = ("_graph", "_start", "_stop")
+
+    def __init__(self, graph, start, stop):
+        self._graph = graph
+        self._start = start
+        self._stop = stop
+
+    def __iter__(self):
+        return iter(self._graph.targets[self._start:self._stop])
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __contains__(self, node):
+        return node in self._graph.targets[self._start:self._stop]
+
+    def __getitem__(self, node):
+        targets = self._graph.targets
+        for edge in range(self._start, self._stop):
+            if targets[edge] == node:
+                return EdgeAttributes(self._graph.columns, edge)
+        raise KeyError(node)
+
+    def items(self):
+        columns = self._graph.columns
+        targets = self._graph.targets
+        for edge in range(self._start, self._stop):
+            yield targets[edge], EdgeAttributes(columns, edge)
+
+class CompactGraph:
+    """
+    Undirected graph in compressed sparse row (CSR) form, independent of networkx:
+    * nodes are the integers 0 to n - 1, and cities[node] is the object (e.g. a City) each one stands for
+    * the neighbours of a node are targets[offsets[node]:offsets[node + 1]], every edge being stored in both directions
+    * edge attributes are kept column by column, aligned with targets. An attribute whose values all parse as numbers
+      is stored as floats in an array, so the strings read from a DOT file, which load_graph() keeps as they are,
+      come back as floats here, e.g. 61.0 for distance="61". Weight factories that convert with float(),
+      like by_distance, give the same weights on both
+    It offers the part of networkx.Graph's interface used by the traversal and shortest path functions in graphs.py
+    and dijkstra.py, which run on it unchanged with node ids in place of cities.
+    """
+    def __init__(self, cities, offsets, targets, columns):
+        self.cities = cities
+        self.offsets = offsets
+        self.targets = targets
+        self.columns = columns
+        self._ids = None
+        self._weights = {}
+
+    @classmethod
+    def from_edges(cls, cities, edges):
+        """Build from a list of cities and (node id, node id, attributes) tuples, one per undirected edge"""
+        adjacency = [[] for _ in cities]
+        for node1, node2, attributes in edges:
+            adjacency[node1].append((node2, attributes))
+            adjacency[node2].append((node1, attributes))
+        return cls.from_adjacency(cities, adjacency)
+
+    @classmethod
+    def from_networkx(cls, graph):
+        """Same nodes, edges and neighbour order as graph, so traversals visit nodes in the same order"""
+        cities = list(graph.nodes)
+        ids = {city: node for node, city in enumerate(cities)}
+        return cls.from_adjacency(cities, (
+            [(ids[neighbor], attributes) for neighbor, attributes in graph[city].items()]
+            for city in cities
+        ))
+
+    @classmethod
+    def from_adjacency(cls, cities, adjacency):
+        """Build from the list of (neighbour id, attributes) pairs of every node, in node id order"""
+        offsets = array("q", [0])
+        targets = array("q")
+        attributes = []
+        for neighbors in adjacency:
+            for target, edge_attributes in neighbors:
+                targets.append(target)
+                attributes.append(edge_attributes)
+            offsets.append(len(targets))
+
+        names = []
+        for edge_attributes in attributes:
+            names.extend(name for name in edge_attributes if name not in names)
+        columns = {}
+        for name in names:
+            values = [edge_attributes.get(name) for edge_attributes in attributes]
+            if all(_is_number(value) for value in values):
+                columns[name] = array("d", map(float, values))
+            else:
+                columns[name] = values
+        return cls(cities, offsets, targets, columns)
+
+    def __getstate__(self):
+        # memoryviews over a memory-mapped snapshot can't be pickled, send copies of the arrays instead
+        state = dict(self.__dict__)
+        state["cities"] = list(self.cities)
+        state["offsets"] = _as_array(self.offsets)
+        state["targets"] = _as_array(self.targets)
+        state["columns"] = {name: _as_array(column) for name, column in self.columns.items()}
+        return state
+
+    def __len__(self):
+        return len(self.cities)
+
+    def __iter__(self):
+        return iter(range(len(self.cities)))
+
+    def __contains__(self, node):
+        return isinstance(node, int) and 0 <= node < len(self.cities)
+
+    def __getitem__(self, node):
+        return Adjacency(self, self.offsets[node], self.offsets[node + 1])
+
+    @property
+    def nodes(self):
+        return range(len(self.cities))
+
+    def neighbors(self, node):
+        return iter(self.targets[self.offsets[node]:self.offsets[node + 1]])
+
+    def degree(self, node):
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def edges(self, data=False):
+        """Every undirected edge once, as (node, node) or (node, node, attributes)"""
+        targets = self.targets
+        for node in range(len(self.cities)):
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                if node < targets[edge]:
+                    yield (node, targets[edge], EdgeAttributes(self.columns, edge)) if data else (node, targets[edge])
+
+    def number_of_nodes(self):
+        return len(self.cities)
+
+    def number_of_edges(self):
+        return len(self.targets) // 2
+
+    def is_directed(self):
+        return False
+
+    def frontiers(self, source):
+        """
+        Breadth-first levels from source, each one a list of node ids.
+        A whole level is expanded at once: its neighbour slices are gathered into one array,
+        deduplicated in first-seen order and filtered against a bytearray of visited flags,
+        so the per-edge work happens inside array and dict rather than in Python bytecode.
+        """
+        offsets = self.offsets
+        targets = memoryview(self.targets)
+        size = targets.itemsize
+        targets = targets.cast("B") # raw bytes, so that each slice is appended with a single copy
+        visited = bytearray(len(self.cities))
+        visited[source] = 1
+        frontier = [source]
+        while frontier:
+            yield frontier
+            candidates = array("q")
+            for node in frontier:
+                candidates.frombytes(targets[size * offsets[node]:size * offsets[node + 1]])
+            frontier = list(filterfalse(visited.__getitem__, dict.fromkeys(candidates)))
+            for node in frontier:
+                visited[node] = 1
+
+    def node_id(self, city):
+        """Reverse lookup from the side table, built on first use"""
+        if self._ids is None:
+            self._ids = {city: node for node, city in enumerate(self.cities)}
+        return self._ids[city]
+
+    def weights(self, weight_factory):
+        """Float array of weight_factory applied to every edge, aligned with targets and cached per weight factory"""
+        if weight_factory not in self._weights:
+            self._weights[weight_factory] = array("d", (
+                weight_factory(EdgeAttributes(self.columns, edge)) for edge in range(len(self.targets))
+            ))
+        return self._weights[weight_factory]
+
+def _as_array(values):
+    return array(values.format, values.tobytes()) if isinstance(values, memoryview) else values
+
+def _is_number(value):
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
@@ -0,0 +1,37 @@
+from random import Random
+import os
+
+import networkx as nx
+import pytest
+
+from graphs import load_graph, City
+
+ROADMAP = os.path.join(os.path.dirname(__file__), "input/roadmap.dot")
+
+@pytest.fixture(scope="session")
+def roadmap():
+    """(cities by name, networkx.Graph of cities) of input/roadmap.dot, shared by every test so don't change it"""
+    return load_graph(ROADMAP, City.from_dict)
+
+@pytest.fixture
+def random_graphs():
+    """Random undirected graphs over the integers with a random "distance" on every edge, some of them disconnected"""
+    def build(count=20, seed=0):
+        random = Random(seed)
+        graphs = []
+        for _ in range(count):
+            nodes = random.randint(2, 40)
+            graph = nx.gnm_random_graph(nodes, random.randint(nodes // 2, 3 * nodes), seed=random.randrange(2**32))
+            for _, _, weights in graph.edges(data=True):
+                weights["distance"] = random.randint(1, 20)
+            graphs.append(graph)
+        return graphs
+    return build
+
+@pytest.fixture
+def path_cost():
+    """Total weight of a path, checking that each of its steps is an edge of the graph"""
+    def cost(graph, path, weight_factory):
+        assert all(node2 in graph[node1] for node1, node2 in zip(path, path[1:]))
+        return sum(weight_factory(graph[node1][node2]) for node1, node2 in zip(path, path[1:]))
+    return cost
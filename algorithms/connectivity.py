@@ -0,0 +1,189 @@
+"""
+Batch connectivity and hop distance queries for reports that ask about many (source, destination) pairs at once:
+* connected components are found once with union-find, after which is_connected() is a couple of array lookups
+* hop distances run one breadth-first search per distinct source, skipping pairs in different components,
+  spread over a process pool whose workers read the graph's CSR arrays from shared memory instead of unpickling it
+"""
+
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from random import Random
+from time import perf_counter
+import os
+
+from compact_graph import CompactGraph
+from graphs import load_compact_graph, City
+
+class UnionFind:
+    """Disjoint sets over the integers 0 to n - 1, union by size with path halving"""
+    def __init__(self, n):
+        self.parent = array("q", range(n))
+        self.size = array("q", [1]) * n
+        self.count = n # number of disjoint sets
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]] # point to the grandparent, halving the path
+            item = parent[item]
+        return item
+
+    def union(self, item1, item2):
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return False
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        self.count -= 1
+        return True
+
+class Components:
+    """
+    Connected components of an undirected graph, networkx.Graph or CompactGraph.
+    Edges added to the graph later can be reported with add_edge(), removed edges need a new Components.
+    """
+    def __init__(self, graph):
+        if isinstance(graph, CompactGraph):
+            self._index = int # node ids already are 0 to n - 1
+        else:
+            self._index = {node: index for index, node in enumerate(graph.nodes)}.__getitem__
+        self._sets = UnionFind(len(graph))
+        for node1, node2 in graph.edges():
+            self.add_edge(node1, node2)
+
+    def __len__(self):
+        return self._sets.count
+
+    def add_edge(self, node1, node2):
+        self._sets.union(self._index(node1), self._index(node2))
+
+    def component(self, node):
+        """Representative of the node's component, the same for every node of that component"""
+        return self._sets.find(self._index(node))
+
+    def is_connected(self, source, destination):
+        return self.component(source) == self.component(destination)
+
+    def connected_pairs(self, pairs):
+        return [self.is_connected(source, destination) for source, destination in pairs]
+
+def hop_distances(graph, pairs, components=None, max_workers=None):
+    """
+    Number of edges on a shortest path for each (source, destination) pair, None when there is no path.
+    Pairs are grouped by whichever of their nodes is queried more often, so that one breadth-first search
+    answers all the pairs of a group and stops as soon as it has reached all their other nodes.
+    Searches run in max_workers processes, or in this process when max_workers is 1.
+    components, the Components of graph itself, saves finding them again.
+    """
+    pairs = list(pairs)
+    compact = graph if isinstance(graph, CompactGraph) else CompactGraph.from_networkx(graph)
+    node_id = (lambda node: node) if compact is graph else compact.node_id
+    if components is None:
+        components = Components(graph)
+
+    frequency = Counter(node for pair in pairs for node in pair)
+    groups = defaultdict(list) # source id -> destination ids
+    for source, destination in pairs:
+        if frequency[destination] > frequency[source]:
+            source, destination = destination, source
+        if components.is_connected(source, destination): # components takes the caller's nodes, not ids
+            groups[node_id(source)].append(node_id(destination))
+
+    sources = list(groups)
+    if max_workers == 1 or len(sources) < 2:
+        searches = (_hops(compact, source, groups[source]) for source in sources)
+        hops = dict(zip(sources, searches))
+    else:
+        with SharedGraph(compact) as shared:
+            with ProcessPoolExecutor(max_workers, initializer=_attach_worker_graph, initargs=(shared.handle,)) as executor:
+                searches = executor.map(
+                    _hops_from, sources, (groups[source] for source in sources),
+                    chunksize=max(len(sources) // (4 * (max_workers or os.cpu_count() or 1)), 1),
+                )
+                hops = dict(zip(sources, searches))
+
+    def answer(source, destination):
+        if frequency[destination] > frequency[source]:
+            source, destination = destination, source
+        return hops.get(node_id(source), {}).get(node_id(destination))
+    return [answer(source, destination) for source, destination in pairs]
+
+class SharedGraph:
+    """
+    Copy of a CompactGraph's offsets and targets in shared memory for the lifetime of a with block.
+    Worker processes rebuild the graph from handle without copying or unpickling the arrays.
+    """
+    def __init__(self, graph):
+        self._blocks = []
+        self.handle = tuple(self._share(values) for values in (graph.offsets, graph.targets))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def _share(self, values):
+        data = memoryview(values).cast("B")
+        block = SharedMemory(create=True, size=max(len(data), 1))
+        block.buf[:len(data)] = data
+        self._blocks.append(block)
+        return block.name, len(values)
+
+def attach(handle):
+    """CompactGraph over the shared memory blocks of a SharedGraph handle, with neither cities nor edge attributes"""
+    blocks = [SharedMemory(name) for name, _ in handle]
+    (_, num_offsets), (_, num_targets) = handle
+    offsets = blocks[0].buf[:8 * num_offsets].cast("q")
+    targets = blocks[1].buf[:8 * num_targets].cast("q")
+    graph = CompactGraph(range(num_offsets - 1), offsets, targets, {})
+    graph._blocks = blocks # keep the mappings open for as long as the graph lives
+    return graph
+
+def _hops(graph, source, destinations):
+    """Level of each destination in a breadth-first search from source, stopping once they are all reached"""
+    wanted = set(destinations)
+    hops = {}
+    for level, frontier in enumerate(graph.frontiers(source)):
+        found = wanted.intersection(frontier)
+        if found:
+            hops.update(dict.fromkeys(found, level))
+            wanted -= found
+            if not wanted:
+                break
+    return hops
+
+_worker_graph = None
+
+def _attach_worker_graph(handle):
+    global _worker_graph
+    _worker_graph = attach(handle)
+
+def _hops_from(source, destinations):
+    return _hops(_worker_graph, source, destinations)
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    nodes, graph = load_compact_graph(filepath, City.from_dict)
+    components = Components(graph)
+    print("Components:", len(components))
+    print("london - edinburgh connected:", components.is_connected(nodes["london"], nodes["edinburgh"]))
+    print("london - belfast connected:", components.is_connected(nodes["london"], nodes["belfast"]))
+
+    # a reachability report over many random pairs
+    random = Random(0)
+    pairs = [(random.randrange(len(graph)), random.randrange(len(graph))) for _ in range(100_000)]
+    start = perf_counter()
+    hops = hop_distances(graph, pairs, components)
+    elapsed = perf_counter() - start
+    reachable = [hop for hop in hops if hop is not None]
+    print(f"{len(pairs)} pairs in {elapsed:.2f}s: {len(reachable)} reachable, at most {max(reachable)} hops apart")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+from heapq import heappush, heappop
+from math import inf as infinity
+import os
+import pickle
+
+from graphs import load_graph, by_distance, City
+
+class ContractionHierarchy:
+    """
+    Shortest path index for an undirected graph, built once per map:
+    * nodes are contracted one at a time, least important first, adding a shortcut edge between two neighbours
+      whenever the path through the contracted node is the only shortest one between them
+    * a query runs Dijkstra's algorithm from both ends following only edges towards more important nodes,
+      which only settles a few hundred nodes even on large road networks
+    * shortcuts remember the node they bypass so that paths can be unpacked into the original edges
+    """
+    def __init__(self, nodes, upward, middle, cache_key=None):
+        self.nodes = nodes # node id -> node
+        self._ids = {node: node_id for node_id, node in enumerate(nodes)}
+        self._upward = upward # node id -> {more important neighbour id: weight}
+        self._middle = middle # (node id, node id) of a shortcut -> id of the node it bypasses
+        self.cache_key = cache_key # identifies the weights the index was built with, None when unknown
+
+    @classmethod
+    def build(cls, graph, weight_factory, witness_limit=64, cache_key=None):
+        """
+        Contract every node of graph, ordering them by edge difference (shortcuts added minus edges removed)
+        plus the number of neighbours already contracted, which keeps the contraction spread evenly over the map.
+        Witness searches stop after settling witness_limit nodes, which can only add a few unneeded shortcuts.
+        cache_key defaults to the weight factory's name when it's a module level function.
+        """
+        nodes = list(graph.nodes)
+        ids = {node: node_id for node_id, node in enumerate(nodes)}
+        remaining = [{} for _ in nodes] # edges between nodes that haven't been contracted yet
+        for node1, node2, weights in graph.edges(data=True):
+            if node1 != node2:
+                id1, id2 = ids[node1], ids[node2]
+                weight = min(weight_factory(weights), remaining[id1].get(id2, infinity))
+                remaining[id1][id2] = remaining[id2][id1] = weight
+
+        upward = [{} for _ in nodes]
+        middle = {}
+        contracted_neighbors = [0] * len(nodes)
+
+        def priority(node_id):
+            shortcuts = _shortcuts(remaining, node_id, witness_limit)
+            return len(shortcuts) - len(remaining[node_id]) + contracted_neighbors[node_id]
+
+        queue = [(priority(node_id), node_id) for node_id in range(len(nodes))]
+        queue.sort()
+        while queue:
+            _, node_id = heappop(queue)
+            # lazy update: priorities go stale as neighbours get contracted, so recompute before committing
+            current = priority(node_id)
+            if queue and current > queue[0][0]:
+                heappush(queue, (current, node_id))
+                continue
+
+            for id1, id2, weight in _shortcuts(remaining, node_id, witness_limit):
+                if weight < remaining[id1].get(id2, infinity):
+                    remaining[id1][id2] = remaining[id2][id1] = weight
+                    middle[_edge(id1, id2)] = node_id
+
+            for neighbor_id, weight in remaining[node_id].items():
+                upward[node_id][neighbor_id] = weight
+                del remaining[neighbor_id][node_id]
+                contracted_neighbors[neighbor_id] += 1
+            remaining[node_id] = {}
+
+        return cls(nodes, upward, middle, cache_key or _cache_key(weight_factory))
+
+    def shortest_path(self, source, destination):
+        """Same path as dijkstra(graph, source, destination, weight_factory), or None when unreachable"""
+        return self.query(source, destination)[1]
+
+    def query(self, source, destination):
+        """Cost and path of the shortest path, (infinity, None) when unreachable"""
+        source_id, destination_id = self._ids[source], self._ids[destination]
+        distance = ({source_id: 0}, {destination_id: 0})
+        previous = ({}, {})
+        settled = (set(), set())
+        unvisited = ([(0, source_id)], [(0, destination_id)])
+
+        # both searches climb towards more important nodes and the shortest path peaks where they meet
+        best_cost, top = infinity, None
+        while unvisited[0] or unvisited[1]:
+            for side in (0, 1):
+                if not unvisited[side]:
+                    continue
+                cost, node_id = heappop(unvisited[side])
+                if cost >= best_cost:
+                    unvisited[side].clear() # nothing left on this side can lead to a cheaper path
+                    continue
+                if node_id in settled[side]:
+                    continue
+                settled[side].add(node_id)
+
+                if node_id in distance[1 - side] and cost + distance[1 - side][node_id] < best_cost:
+                    best_cost, top = cost + distance[1 - side][node_id], node_id
+
+                edges = self._upward[node_id]
+                # stall on demand: reaching this node through a more important one is cheaper, don't expand it
+                if any(distance[side].get(neighbor_id, infinity) + weight < cost for neighbor_id, weight in edges.items()):
+                    continue
+                for neighbor_id, weight in edges.items():
+                    if cost + weight < distance[side].get(neighbor_id, infinity):
+                        distance[side][neighbor_id] = cost + weight
+                        previous[side][neighbor_id] = node_id
+                        heappush(unvisited[side], (cost + weight, neighbor_id))
+
+        if top is None:
+            return infinity, None
+
+        route = _climb(previous[0], top)[::-1] + _climb(previous[1], top)[1:]
+        node_ids = [source_id]
+        for id1, id2 in zip(route, route[1:]):
+            node_ids.extend(self._unpack(id1, id2)[1:])
+        return best_cost, [self.nodes[node_id] for node_id in node_ids]
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            pickle.dump((self.nodes, self._upward, self._middle, self.cache_key), file, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls(*pickle.load(file))
+
+    def _unpack(self, id1, id2):
+        """Original path behind the edge id1 - id2, replacing shortcuts by the two edges they bypass"""
+        path = [id1]
+        stack = [id2]
+        while stack:
+            target = stack[-1]
+            bypassed = self._middle.get(_edge(path[-1], target))
+            if bypassed is None:
+                path.append(stack.pop())
+            else:
+                stack.append(bypassed)
+        return path
+
+def load_or_build(filename, node_factory, weight_factory, index_filename=None, cache_key=None):
+    """
+    Load the contraction hierarchy saved next to a map, or build and save it when it's missing,
+    older than the map or built with another cache_key.
+    cache_key names the weights, change it whenever weight_factory changes. Without it a module level function
+    is identified by its module and name, anything else (lambda, functools.partial, nested function, ...)
+    can't be told apart from another one so the hierarchy is always rebuilt.
+    """
+    index_filename = index_filename or os.path.splitext(filename)[0] + ".ch"
+    cache_key = cache_key or _cache_key(weight_factory)
+    if cache_key is not None and os.path.exists(index_filename) \
+            and os.path.getmtime(index_filename) >= os.path.getmtime(filename):
+        hierarchy = ContractionHierarchy.load(index_filename)
+        if hierarchy.cache_key == cache_key:
+            return hierarchy
+
+    _, graph = load_graph(filename, node_factory)
+    hierarchy = ContractionHierarchy.build(graph, weight_factory, cache_key=cache_key)
+    hierarchy.save(index_filename)
+    return hierarchy
+
+def _cache_key(weight_factory):
+    """"module.name" of a module level function, None for anything that can't be found again by that name"""
+    module = getattr(weight_factory, "__module__", None)
+    qualname = getattr(weight_factory, "__qualname__", None)
+    if module is None or qualname is None or "<" in qualname or "." in qualname:
+        return None
+    return f"{module}.{qualname}"
+
+def _edge(id1, id2):
+    return (id1, id2) if id1 < id2 else (id2, id1)
+
+def _shortcuts(remaining, node_id, witness_limit):
+    """Shortcuts (id1, id2, weight) needed to keep the shortest paths through node_id once it's contracted"""
+    neighbors = list(remaining[node_id].items())
+    shortcuts = []
+    for i, (id1, weight1) in enumerate(neighbors[:-1]):
+        targets = {id2: weight1 + weight2 for id2, weight2 in neighbors[i + 1:]}
+        witness = _witness_search(remaining, id1, node_id, targets, max(targets.values()), witness_limit)
+        for id2, weight in targets.items():
+            if witness.get(id2, infinity) > weight:
+                shortcuts.append((id1, id2, weight))
+    return shortcuts
+
+def _witness_search(remaining, source_id, excluded_id, targets, max_cost, limit):
+    """Dijkstra's algorithm from source_id avoiding excluded_id, bounded by cost and number of settled nodes"""
+    distance = {source_id: 0}
+    unvisited = [(0, source_id)]
+    settled = set()
+    found = 0
+    while unvisited and len(settled) < limit:
+        cost, node_id = heappop(unvisited)
+        if node_id in settled:
+            continue
+        if cost > max_cost:
+            break
+        settled.add(node_id)
+        if node_id in targets:
+            found += 1
+            if found == len(targets):
+                break
+        for neighbor_id, weight in remaining[node_id].items():
+            if neighbor_id != excluded_id and cost + weight < distance.get(neighbor_id, infinity):
+                distance[neighbor_id] = cost + weight
+                heappush(unvisited, (cost + weight, neighbor_id))
+    return distance
+
+def _climb(previous, node_id):
+    """Ids from node_id back down to the search's source"""
+    path = [node_id]
+    while path[-1] in previous:
+        path.append(previous[path[-1]])
+    return path
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    hierarchy = load_or_build(filepath, City.from_dict, by_distance)
+    london, edinburgh = (
+        next(city for city in hierarchy.nodes if city.name == name) for name in ("City of London", "Edinburgh")
+    )
+
+    cost, path = hierarchy.query(london, edinburgh)
+    for city in path:
+        print(city.name)
+    print("Distance:", cost)
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,175 @@
-from queue import PriorityQueue
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from math import inf as infinity
-from graphs import load_graph, retrace, by_distance, City
+from typing import NamedTuple, Any
+from weakref import WeakKeyDictionary
 import os
-    
+
+from data_structures.cache import LRUCache
+from data_structures.queues import IndexedPriorityQueue
+from graphs import load_compact_graph, retrace, by_distance, City
+
+class ShortestPathTree(NamedTuple):
+    """Distances and previous nodes from a source to every node it can reach, shared between queries so treat as read-only"""
+    source: Any
+    distance: dict
+    previous: dict
+
+    def path_to(self, destination):
+        return retrace(self.previous, self.source, destination)
+
+    def cost_to(self, destination):
+        return self.distance.get(destination, infinity)
+
 def dijkstra(graph, source, destination, weight_factory):
+    """Shortest path from source to destination, the search stops as soon as the destination is settled"""
+    _, previous = single_source_dijkstra(graph, source, weight_factory, destination)
+    return retrace(previous, source, destination)
+
+TREES_PER_GRAPH = 256
+
+_trees = WeakKeyDictionary() # graph -> LRUCache of its shortest path trees by (source, weight_factory)
+
+def shortest_path_tree(graph, source, weight_factory):
+    """
+    Full shortest path tree from source, cached with the graph by (source, weight_factory)
+    so that repeated queries from the same source are answered by path_to() without searching again.
+    Each graph keeps its TREES_PER_GRAPH most recently used trees, which go away along with the graph.
+    Call clear_shortest_path_trees() after changing a graph.
+    """
+    try:
+        trees = _trees.get(graph)
+        if trees is None:
+            trees = _trees[graph] = LRUCache(TREES_PER_GRAPH)
+    except TypeError: # the graph can't be weakly referenced
+        return ShortestPathTree(source, *single_source_dijkstra(graph, source, weight_factory))
+
+    key = (source, weight_factory)
+    try:
+        return trees[key]
+    except KeyError:
+        tree = trees[key] = ShortestPathTree(source, *single_source_dijkstra(graph, source, weight_factory))
+        return tree
+
+def clear_shortest_path_trees(graph=None):
+    if graph is None:
+        _trees.clear()
+    else:
+        _trees.pop(graph, None)
+
+def all_pairs_dijkstra(graph, weight_factory, sources=None, max_workers=None):
+    """
+    Shortest path trees from every source (every node by default), one search per source spread over a process pool.
+    The graph is sent once to each worker process rather than with every task,
+    so weight_factory has to be a module-level function that can be pickled.
+    """
+    sources = list(graph.nodes if sources is None else sources)
+    with ProcessPoolExecutor(max_workers, initializer=_set_worker_graph, initargs=(graph,)) as executor:
+        searches = executor.map(_search_from, sources, repeat(weight_factory), chunksize=max(len(sources) // 64, 1))
+        return {
+            source: ShortestPathTree(source, distance, previous)
+            for source, (distance, previous) in zip(sources, searches)
+        }
+
+def single_source_dijkstra(graph, source, weight_factory, destination=None):
+    """
+    Dijkstra's algorithm from source until destination is settled, or over the whole graph when it's None.
+    Returns the (distance, previous) dictionaries of a ShortestPathTree, built afresh without going through the cache.
+    """
     previous = {}
     visited = set()
 
-    # assign all paths from source node to the next node to infinity
-    # this gives us a dictionary where we can look up the cost values by providing a node
-    distance = {node: infinity for node in graph.nodes}
-    distance[source] = 0 # set source node to be 0 distance
+    # cost of the best path found so far to each node, unreached nodes are missing i.e. at infinity
+    distance = {source: 0}
 
-    unvisited = PriorityQueue() # min-heap implementation
-    unvisited.put((distance[source], source)) # tuple (priority, value)
+    # indexed min-heap holding each node at most once, so a cheaper path lowers its key instead of queueing a duplicate
+    unvisited = IndexedPriorityQueue()
+    unvisited.enqueue(distance[source], source)
 
-    while not unvisited.empty():
-        current_cost, current_node = unvisited.get()
+    while unvisited:
+        current_cost, current_node = unvisited.dequeue_with_priority()
+        if current_node == destination:
+            break # settled: no cheaper path to it can be found anymore
         visited.add(current_node) # mark current node as visited
         for neighbor, weights in graph[current_node].items():
             if neighbor not in visited:
                 weight = weight_factory(weights)
                 new_distance = current_cost + weight
-                if new_distance < distance[neighbor]:
-                    # update the distance dictionary with the new cost then add it to the queue
+                if new_distance < distance.get(neighbor, infinity):
+                    # update the distance dictionary with the new cost then add it to the queue or lower its key
                     distance[neighbor] = new_distance
                     # link the current node to the neighbor
                     previous[neighbor] = current_node
-                    unvisited.put((distance[neighbor], neighbor))
+                    unvisited.enqueue(new_distance, neighbor)
 
-    return retrace(previous, source, destination)
+    return distance, previous
+
+_worker_graph = None
+
+def _set_worker_graph(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+def _search_from(source, weight_factory):
+    return single_source_dijkstra(_worker_graph, source, weight_factory)
+
+def bidirectional_dijkstra(graph, source, destination, weight_factory):
+    """
+    Two Dijkstra searches on an undirected graph, one forward from the source and one backward from the destination,
+    that stop once the two frontiers together cannot beat the best meeting point found so far.
+    Each search only has to reach about half as far as a single one, which settles far fewer nodes.
+    """
+    if source == destination:
+        return [source]
+
+    distance = ({source: 0}, {destination: 0})
+    previous = ({}, {})
+    visited = (set(), set())
+    unvisited = (IndexedPriorityQueue(), IndexedPriorityQueue())
+    unvisited[0].enqueue(0, source)
+    unvisited[1].enqueue(0, destination)
+
+    best_cost, meeting_node = infinity, None
+    while unvisited[0] and unvisited[1]:
+        if unvisited[0].peek()[0] + unvisited[1].peek()[0] >= best_cost:
+            break
+
+        side = 0 if len(unvisited[0]) <= len(unvisited[1]) else 1 # grow the smaller frontier
+        other = 1 - side
+        current_cost, current_node = unvisited[side].dequeue_with_priority()
+        visited[side].add(current_node)
+        for neighbor, weights in graph[current_node].items():
+            new_distance = current_cost + weight_factory(weights)
+            if neighbor not in visited[side] and new_distance < distance[side].get(neighbor, infinity):
+                distance[side][neighbor] = new_distance
+                previous[side][neighbor] = current_node
+                unvisited[side].enqueue(new_distance, neighbor)
+            if neighbor in distance[other] and new_distance + distance[other][neighbor] < best_cost:
+                best_cost = new_distance + distance[other][neighbor]
+                meeting_node = (current_node, neighbor) if side == 0 else (neighbor, current_node)
+
+    if meeting_node is None:
+        return None
+    # stitch the forward path to the meeting edge and the reversed backward path from it
+    forward = retrace(previous[0], source, meeting_node[0])
+    backward = retrace(previous[1], destination, meeting_node[1])
+    return forward + backward[::-1]
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    nodes, graph = load_compact_graph(filepath, City.from_dict)
+    cities = graph.cities # node id -> City
+
+    city1 = nodes["london"]
+    city2 = nodes["edinburgh"]
 
-filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
-nodes, graph = load_graph(filepath, City.from_dict)
+    for node in dijkstra(graph, city1, city2, by_distance):
+        print(cities[node].name)
 
-city1 = nodes["london"]
-city2 = nodes["edinburgh"]
+    # many queries from the same depot reuse one cached shortest path tree
+    tree = shortest_path_tree(graph, city1, by_distance)
+    for destination in ("bristol", "york", "cardiff"):
+        print(destination, tree.cost_to(nodes[destination]), [cities[node].name for node in tree.path_to(nodes[destination])])
 
-for city in dijkstra(graph, city1, city2, by_distance):
-    print(city.name)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
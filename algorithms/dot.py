@@ -0,0 +1,191 @@
+"""
+Streaming readers for the graph files in input/, with no dependency on graphviz:
+* DOT files, covering the statements the maps use: node, edge and graph defaults, (nested) subgraphs,
+  node statements and edge chains such as a -- b -- c [distance=1]
+* edge lists, one "source target key=value ..." edge per line
+Both yield ("node", name, attributes) the first time a node appears and whenever a node statement adds attributes,
+and ("edge", name1, name2, attributes) for every edge, all values being strings as with pygraphviz.
+"""
+
+import os
+import re
+
+KEYWORDS = {"graph", "digraph", "subgraph", "node", "edge", "strict"}
+
+TOKEN = re.compile(r"""
+    (?P<space> \s+ | //[^\n]* | \#[^\n]* | /\*.*?\*/ )
+  | (?P<string> "(?:[^"\\]|\\.)*" )
+  | (?P<edge> -- | -> )
+  | (?P<number> -?(?:\.\d+|\d+(?:\.\d*)?) )
+  | (?P<name> [A-Za-z_\x80-\U0010FFFF][\w\x80-\U0010FFFF]* )
+  | (?P<punctuation> [{}\[\];,=:] )
+""", re.VERBOSE | re.DOTALL)
+
+def read_graph(filename):
+    """Attributes of every node by name, in order of first appearance, and the list of (name, name, attributes) edges"""
+    nodes, edges = {}, []
+    for statement in parse_graph_file(filename):
+        if statement[0] == "node":
+            _, name, attributes = statement
+            nodes.setdefault(name, {}).update(attributes)
+        else:
+            edges.append(statement[1:])
+    return nodes, edges
+
+def parse_graph_file(filename):
+    """Statements of a DOT file (.dot or .gv) or of an edge list (any other extension)"""
+    parse = parse_dot if os.path.splitext(filename)[1] in (".dot", ".gv") else parse_edge_list
+    with open(filename, encoding="utf-8") as file:
+        yield from parse(file)
+
+def parse_edge_list(lines):
+    seen = set()
+    for number, line in enumerate(lines, start=1):
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            continue
+        if len(fields) < 2 or any("=" not in field for field in fields[2:]):
+            raise ValueError(f"Line {number}: expected 'source target key=value ...', got {line.strip()!r}")
+        name1, name2 = fields[:2]
+        for name in (name1, name2):
+            if name not in seen:
+                seen.add(name)
+                yield "node", name, {}
+        yield "edge", name1, name2, dict(field.split("=", 1) for field in fields[2:])
+
+def parse_dot(lines):
+    tokens = _Tokens(_tokenize(lines))
+    if tokens.is_keyword("strict"):
+        tokens.next()
+    if not (tokens.is_keyword("graph") or tokens.is_keyword("digraph")):
+        raise ValueError(f"Expected graph or digraph, got {tokens.peek()[1]!r}")
+    tokens.next()
+    if tokens.peek()[0] in ("name", "number", "string"):
+        tokens.next() # graph name
+    tokens.expect("{")
+    yield from _statements(tokens, {"node": {}, "edge": {}}, set())
+    if tokens.peek() is not None:
+        raise ValueError(f"Unexpected {tokens.peek()[1]!r} after the end of the graph")
+
+def _statements(tokens, defaults, seen):
+    """Statements up to the closing brace of the current graph or subgraph, which scopes the defaults"""
+    defaults = {kind: dict(attributes) for kind, attributes in defaults.items()}
+    while not tokens.accept("}"):
+        kind, value = tokens.peek() or (None, None)
+        if kind is None:
+            raise ValueError("Missing closing brace")
+        if tokens.is_keyword("node") or tokens.is_keyword("edge") or tokens.is_keyword("graph"):
+            tokens.next()
+            defaults.get(value.lower(), {}).update(_attribute_lists(tokens))
+        elif tokens.is_keyword("subgraph") or value == "{":
+            if tokens.is_keyword("subgraph"):
+                tokens.next()
+                if tokens.peek()[0] in ("name", "number", "string"):
+                    tokens.next() # subgraph name
+            tokens.expect("{")
+            yield from _statements(tokens, defaults, seen)
+            if tokens.peek() and tokens.peek()[0] == "edge":
+                raise ValueError("Edges to or from a subgraph aren't supported")
+        elif kind in ("name", "number", "string"):
+            yield from _node_or_edges(tokens, defaults, seen)
+        else:
+            raise ValueError(f"Unexpected {value!r}")
+        tokens.accept(";")
+
+def _node_or_edges(tokens, defaults, seen):
+    names = [_node_id(tokens)]
+    if tokens.accept("="):
+        _node_id(tokens) # graph attribute such as layout=fdp
+        return
+    while tokens.peek() and tokens.peek()[0] == "edge":
+        tokens.next()
+        if tokens.peek() and (tokens.peek()[1] == "{" or tokens.is_keyword("subgraph")):
+            raise ValueError("Edges to or from a subgraph aren't supported")
+        names.append(_node_id(tokens))
+    attributes = _attribute_lists(tokens)
+
+    for name in names:
+        if name not in seen:
+            seen.add(name)
+            # a node takes the defaults in force where it first appears
+            node_attributes = dict(defaults["node"])
+            if len(names) == 1:
+                node_attributes.update(attributes)
+            yield "node", name, node_attributes
+        elif len(names) == 1 and attributes:
+            yield "node", name, attributes
+
+    edge_attributes = {**defaults["edge"], **attributes}
+    for name1, name2 in zip(names, names[1:]):
+        yield "edge", name1, name2, dict(edge_attributes)
+
+def _node_id(tokens):
+    kind, value = tokens.next()
+    if kind not in ("name", "number", "string") or (kind == "name" and value.lower() in KEYWORDS):
+        raise ValueError(f"Expected a node name, got {value!r}")
+    if tokens.accept(":"): # ports only matter for drawing
+        _node_id(tokens)
+        if tokens.accept(":"):
+            _node_id(tokens)
+    return value
+
+def _attribute_lists(tokens):
+    attributes = {}
+    while tokens.accept("["):
+        while not tokens.accept("]"):
+            key = _node_id(tokens)
+            attributes[key] = _node_id(tokens) if tokens.accept("=") else "true"
+            tokens.accept(",") or tokens.accept(";")
+    return attributes
+
+class _Tokens:
+    """Token stream with one token of lookahead, None once exhausted"""
+    def __init__(self, tokens):
+        self._tokens = tokens
+        self._next = next(tokens, None)
+
+    def peek(self):
+        return self._next
+
+    def next(self):
+        if self._next is None:
+            raise ValueError("Unexpected end of file")
+        token, self._next = self._next, next(self._tokens, None)
+        return token
+
+    def accept(self, punctuation):
+        if self._next is not None and self._next[0] == "punctuation" and self._next[1] == punctuation:
+            self.next()
+            return True
+        return False
+
+    def expect(self, punctuation):
+        if not self.accept(punctuation):
+            raise ValueError(f"Expected {punctuation!r}, got {self._next and self._next[1]!r}")
+
+    def is_keyword(self, keyword):
+        return self._next is not None and self._next[0] == "name" and self._next[1].lower() == keyword
+
+def _tokenize(lines):
+    """(kind, value) tokens, reading one line at a time and carrying over strings and comments that span lines"""
+    pending = ""
+    for line in lines:
+        text = pending + line
+        pending = ""
+        position = 0
+        while position < len(text):
+            match = TOKEN.match(text, position)
+            if match is None:
+                if text.startswith(('"', "/*"), position):
+                    pending = text[position:] # unterminated so far, finish it with the next line
+                    break
+                raise ValueError(f"Unexpected character {text[position]!r} in {line.strip()!r}")
+            position = match.end()
+            kind = match.lastgroup
+            if kind == "string":
+                # graphviz only unescapes quotes and joins lines ending with a backslash
+                yield "string", match.group()[1:-1].replace('\\"', '"').replace("\\\n", "")
+            elif kind != "space":
+                yield kind, match.group()
+    if pending.strip():
+        raise ValueError("Unterminated string or comment at the end of the file")
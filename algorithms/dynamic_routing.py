@@ -0,0 +1,152 @@
+from collections import defaultdict
+from math import inf as infinity
+import os
+
+from data_structures.queues import IndexedPriorityQueue
+from graphs import load_graph, by_distance, clear_neighbor_orders, City
+from dijkstra import ShortestPathTree, single_source_dijkstra, clear_shortest_path_trees
+
+class DynamicShortestPaths:
+    """
+    Shortest path trees from any number of sources on a networkx.Graph that keeps changing, e.g. under live traffic.
+    Roads are added, removed and reweighted through this class, which repairs the cached trees
+    instead of searching again from every source (in the style of Ramalingam and Reps):
+    * a cheaper road only spreads shorter distances outwards from its far end
+    * a dearer or closed road only matters to the trees using it, and then only to the subtree hanging from it,
+      whose nodes get reconnected from their unaffected neighbours
+    Updates return the sources whose trees changed, the only cached queries whose answers may differ.
+    Trees are updated in place, so a tree obtained earlier always reflects the current graph.
+    """
+    def __init__(self, graph, weight_factory):
+        self.graph = graph
+        self.weight_factory = weight_factory
+        self._trees = {}
+
+    def tree(self, source):
+        if source not in self._trees:
+            self._trees[source] = ShortestPathTree(source, *single_source_dijkstra(self.graph, source, self.weight_factory))
+        return self._trees[source]
+
+    def shortest_path(self, source, destination):
+        return self.tree(source).path_to(destination)
+
+    def cost(self, source, destination):
+        return self.tree(source).cost_to(destination)
+
+    def forget(self, source):
+        self._trees.pop(source, None)
+
+    def add_edge(self, node1, node2, **attributes):
+        """Add a road, or update the attributes of an existing one"""
+        if self.graph.has_edge(node1, node2):
+            return self.update_edge(node1, node2, **attributes)
+        self.graph.add_edge(node1, node2, **attributes)
+        self._clear_caches()
+        weight = self.weight_factory(self.graph[node1][node2])
+        return {source for source, tree in self._trees.items() if self._decrease(tree, node1, node2, weight)}
+
+    def remove_edge(self, node1, node2):
+        self.graph.remove_edge(node1, node2)
+        self._clear_caches()
+        return {source for source, tree in self._trees.items() if self._increase(tree, node1, node2)}
+
+    def update_edge(self, node1, node2, **attributes):
+        """Change some attributes of a road, which may change its weight"""
+        old_weight = self.weight_factory(self.graph[node1][node2])
+        self.graph[node1][node2].update(attributes)
+        new_weight = self.weight_factory(self.graph[node1][node2])
+        self._clear_caches()
+        if new_weight < old_weight:
+            return {source for source, tree in self._trees.items() if self._decrease(tree, node1, node2, new_weight)}
+        if new_weight > old_weight:
+            return {source for source, tree in self._trees.items() if self._increase(tree, node1, node2)}
+        return set()
+
+    def _clear_caches(self):
+        """Trees cached by dijkstra.py and neighbour orders cached by graphs.py don't know about the change"""
+        clear_shortest_path_trees(self.graph)
+        clear_neighbor_orders(self.graph)
+
+    def _decrease(self, tree, node1, node2, weight):
+        """Spread the shorter distances a new or cheaper road node1 - node2 leads to, if any"""
+        distance, previous = tree.distance, tree.previous
+        if distance.get(node1, infinity) + weight < distance.get(node2, infinity):
+            near, far = node1, node2
+        elif distance.get(node2, infinity) + weight < distance.get(node1, infinity):
+            near, far = node2, node1
+        else:
+            return False
+
+        distance[far] = distance[near] + weight
+        previous[far] = near
+        unvisited = IndexedPriorityQueue()
+        unvisited.enqueue(distance[far], far)
+        while unvisited:
+            current_cost, current_node = unvisited.dequeue_with_priority()
+            for neighbor, weights in self.graph[current_node].items():
+                new_distance = current_cost + self.weight_factory(weights)
+                if new_distance < distance.get(neighbor, infinity):
+                    distance[neighbor] = new_distance
+                    previous[neighbor] = current_node
+                    unvisited.enqueue(new_distance, neighbor)
+        return True
+
+    def _increase(self, tree, node1, node2):
+        """Repair the subtree that hung from a road that got dearer or closed, if the tree used it"""
+        distance, previous = tree.distance, tree.previous
+        if previous.get(node2) == node1:
+            child = node2
+        elif previous.get(node1) == node2:
+            child = node1
+        else:
+            return False # the tree doesn't use that road, no distance can change
+
+        children = defaultdict(list)
+        for node, parent in previous.items():
+            children[parent].append(node)
+        affected = set()
+        stack = [child]
+        while stack:
+            node = stack.pop()
+            affected.add(node)
+            stack.extend(children[node])
+        for node in affected:
+            del distance[node]
+            del previous[node]
+
+        # reconnect each affected node through its best unaffected neighbour, then settle them like Dijkstra would
+        unvisited = IndexedPriorityQueue()
+        for node in affected:
+            for neighbor, weights in self.graph[node].items():
+                if neighbor in distance and neighbor not in affected:
+                    new_distance = distance[neighbor] + self.weight_factory(weights)
+                    if new_distance < distance.get(node, infinity):
+                        distance[node] = new_distance
+                        previous[node] = neighbor
+                        unvisited.enqueue(new_distance, node)
+        while unvisited:
+            current_cost, current_node = unvisited.dequeue_with_priority()
+            for neighbor, weights in self.graph[current_node].items():
+                new_distance = current_cost + self.weight_factory(weights)
+                if neighbor in affected and new_distance < distance.get(neighbor, infinity):
+                    distance[neighbor] = new_distance
+                    previous[neighbor] = current_node
+                    unvisited.enqueue(new_distance, neighbor)
+        return True
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    nodes, graph = load_graph(filepath, City.from_dict)
+    routes = DynamicShortestPaths(graph, by_distance)
+    london, edinburgh = nodes["london"], nodes["edinburgh"]
+
+    print("Before:", routes.cost(london, edinburgh), [city.name for city in routes.shortest_path(london, edinburgh)])
+    routes.tree(nodes["cardiff"])
+
+    # the M6 closes between Preston and Lancaster
+    changed = routes.remove_edge(nodes["preston"], nodes["lancaster"])
+    print("Trees repaired:", sorted(city.name for city in changed))
+    print("After:", routes.cost(london, edinburgh), [city.name for city in routes.shortest_path(london, edinburgh)])
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 from typing import NamedTuple
-from queue import Queue, LifoQueue
 from collections import deque
+from itertools import chain
+from weakref import WeakKeyDictionary
+from math import radians, sin, cos, asin, sqrt
 import networkx as nx
 import os
 
+from compact_graph import CompactGraph
+from dot import read_graph
+import snapshot
+
+EARTH_RADIUS = 3958.8 # miles, the unit of the distances in roadmap.dot
+
 class City(NamedTuple):
     name: str
     country: str
@@ -23,17 +31,26 @@ class City(NamedTuple):
     
 # helper functions
 def load_graph(filename, node_factory) -> tuple:
-    graph = nx.nx_agraph.read_dot(filename)
+    attributes, edges = read_graph(filename)
     nodes = {
-        name: node_factory(attributes)
-        for name, attributes in graph.nodes(data=True)
+        name: node_factory(node_attributes)
+        for name, node_attributes in attributes.items()
     }
 
     return nodes, nx.Graph(
         (nodes[name1], nodes[name2], weights)
-        for name1, name2, weights in graph.edges(data=True)
+        for name1, name2, weights in edges
     )
 
+def load_compact_graph(filename, node_factory) -> tuple:
+    """
+    Same graph as load_graph() but as a CompactGraph, along with the node ids by name,
+    loaded from a binary snapshot cached next to the file which is rebuilt whenever the file changes.
+    Numeric edge attributes come back as floats rather than strings, see CompactGraph.
+    """
+    names, graph = snapshot.load_or_build(filename, node_factory)
+    return {name: node for node, name in enumerate(names)}, graph
+
 def is_twentieth_century(city):
     return 1901 <= city.year <= 2000
 
@@ -43,58 +60,168 @@ def sort_by(neighbors, strategy):
 def by_distance(weights):
     return float(weights["distance"])
 
+def by_hops(weights):
+    return 1 # every road counts the same, i.e. the fewest cities to go through
+
 def by_latitude(city):
     return city.latitude
 
+def great_circle(city1, city2):
+    """Distance in miles between two cities over the surface of the Earth (haversine formula)"""
+    latitude1, latitude2 = radians(city1.latitude), radians(city2.latitude)
+    delta_latitude = latitude2 - latitude1
+    delta_longitude = radians(city2.longitude - city1.longitude)
+    h = sin(delta_latitude / 2) ** 2 + cos(latitude1) * cos(latitude2) * sin(delta_longitude / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(sqrt(h))
+
 def order(neighbors):
     def by_latitude(city):
         return city.latitude
     return iter(sorted(neighbors, key=by_latitude, reverse=True))
 
 def breadth_first_traverse(graph, source, order_by=None):
-    queue = Queue()
-    queue.put(source) # add starting node to the queue
-    visited = set(source) # mark the starting node as already visited
+    if isinstance(graph, CompactGraph) and not order_by:
+        yield from chain.from_iterable(graph.frontiers(source)) # same order, a whole level at a time
+        return
 
-    while not queue.empty():
-        yield (node := queue.get()) # alternatively we can first assign the result of queue.get() to node then yield it
-        for neighbor in graph.neighbors(node):
+    queue = deque([source]) # add starting node to the queue
+    visited = {source} # mark the starting node as already visited
+    neighbors = _neighbors(graph, order_by)
+
+    while queue:
+        yield (node := queue.popleft()) # alternatively we can first assign the result of queue.popleft() to node then yield it
+        for neighbor in neighbors(node):
             if neighbor not in visited:
                 visited.add(neighbor) # mark as visited
-                queue.put(neighbor) # then add it to the queue to be processed
+                queue.append(neighbor) # then add it to the queue to be processed
+
+def breadth_first_levels(graph, source, order_by=None):
+    """
+    Level-synchronous breadth-first traversal: lists of the nodes 0, 1, 2... edges away from source.
+    Each frontier is expanded as a whole into the next one, which on a CompactGraph happens
+    on the CSR arrays with a bytearray of visited flags rather than a set of nodes.
+    """
+    if isinstance(graph, CompactGraph) and not order_by:
+        yield from graph.frontiers(source)
+        return
+
+    frontier = [source]
+    visited = {source}
+    neighbors = _neighbors(graph, order_by)
+    while frontier:
+        yield frontier
+        next_frontier = []
+        for node in frontier:
+            for neighbor in neighbors(node):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+# depth-first traversal events, (event, node, None) for nodes and (event, node, neighbor) for edges
+PRE_ORDER = "pre-order" # first visit of a node
+POST_ORDER = "post-order" # every node reachable from it has been visited
+TREE_EDGE = "tree" # edge to a node visited for the first time
+BACK_EDGE = "back" # edge to a node whose visit is still in progress, a cycle
+FORWARD_EDGE = "forward" # directed graphs only, edge to an already finished descendant
+CROSS_EDGE = "cross" # directed graphs only, edge to an already finished node in another branch
+EDGE_EVENTS = frozenset({TREE_EDGE, BACK_EDGE, FORWARD_EDGE, CROSS_EDGE})
+ALL_EVENTS = EDGE_EVENTS | {PRE_ORDER, POST_ORDER}
+
+def depth_first_events(graph, source, order_by=None, events=ALL_EVENTS):
+    """
+    Iterative depth-first traversal reporting the requested events, see PRE_ORDER and friends above.
+    The stack holds one neighbour iterator per node on the current path, so memory stays O(V) however deep
+    the graph goes and every node is only pushed once. Undirected edges are reported once: the edge back
+    to a node's parent is skipped and back edges are reported from the descendant's end.
+    """
+    neighbors = _neighbors(graph, order_by)
+    directed = graph.is_directed()
+    report_pre, report_post, report_tree = PRE_ORDER in events, POST_ORDER in events, TREE_EDGE in events
+    classify = not EDGE_EVENTS.isdisjoint(events - {TREE_EDGE})
+    discovered = {source: 0} # node -> discovery order
+    finished = set()
+
+    if report_pre:
+        yield PRE_ORDER, source, None
+    stack = [] # the ancestors of node with their neighbor iterators
+    node, parent, iterator = source, None, iter(neighbors(source))
+    while True:
+        for neighbor in iterator:
+            if neighbor not in discovered:
+                discovered[neighbor] = len(discovered)
+                if report_tree:
+                    yield TREE_EDGE, node, neighbor
+                if report_pre:
+                    yield PRE_ORDER, neighbor, None
+                # carry on with the neighbor, this node's iterator remembers where to resume
+                stack.append((node, parent, iterator))
+                node, parent, iterator = neighbor, node, iter(neighbors(neighbor))
+                break
+            if classify:
+                if neighbor not in finished:
+                    event = BACK_EDGE if directed or neighbor != parent else None
+                elif not directed:
+                    event = None # reported as a back edge from the other end already
+                elif discovered[node] < discovered[neighbor]:
+                    event = FORWARD_EDGE
+                else:
+                    event = CROSS_EDGE
+                if event in events:
+                    yield event, node, neighbor
+        else:
+            if classify:
+                finished.add(node)
+            if report_post:
+                yield POST_ORDER, node, None
+            if not stack:
+                return
+            node, parent, iterator = stack.pop()
 
 def depth_first_traverse(graph, source, order_by=None):
-    stack = LifoQueue()
-    stack.put(source) # add source node to stack
-    visited = set() # create an empty set, do not mark the node as visited just yet
-
-    while not stack.empty():
-        if (node := stack.get()) not in visited:
-            yield node # do work
-            visited.add(node) # mark current node as visited
-            neighbors = list(graph.neighbors(node)) # get its neighbors
-
-            if order_by:
-                neighbors.sort(key=order_by)
-            
-            for neighbor in reversed(neighbors):
-                stack.put(neighbor) # place its neighbor on the stack to be processed
+    return (node for _, node, _ in depth_first_events(graph, source, order_by, {PRE_ORDER}))
+
+def depth_first_post_order(graph, source, order_by=None):
+    return (node for _, node, _ in depth_first_events(graph, source, order_by, {POST_ORDER}))
 
 def recursive_depth_first_traverse(graph, source, order_by=None):
-    visited = set()
+    # same order as the recursive definition, without the recursion limit or the O(depth) cost of nested generators
+    return depth_first_traverse(graph, source, order_by)
 
-    def visit(node):
-        yield node
-        visited.add(node)
-        neighbors = list(graph.neighbors(node))
+_neighbor_orders = WeakKeyDictionary() # graph -> order_by -> node -> its neighbors sorted by order_by
 
-        if order_by:
-            neighbors.sort(key=order_by)
+def _neighbors(graph, order_by):
+    """
+    Neighbour lookup for the traversals, sorting each node's neighbours by order_by only once per graph and order_by.
+    Call clear_neighbor_orders() after changing a graph that was traversed with an order_by.
+    """
+    if not order_by:
+        return graph.neighbors
+    key = _node_key(graph, order_by)
+    try:
+        orders = _neighbor_orders.setdefault(graph, WeakKeyDictionary())
+        cache = orders.setdefault(order_by, {})
+    except TypeError: # graph or order_by can't be weakly referenced, e.g. operator.attrgetter
+        return lambda node: sorted(graph.neighbors(node), key=key)
 
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                yield from visit(neighbor)
-    return visit(source)
+    def neighbors(node):
+        if (ordered := cache.get(node)) is None:
+            ordered = cache[node] = sorted(graph.neighbors(node), key=key)
+        return ordered
+    return neighbors
+
+def _node_key(graph, order_by):
+    """order_by takes the cities themselves, so on a CompactGraph it gets applied to graph.cities[node id]"""
+    if isinstance(graph, CompactGraph):
+        cities = graph.cities
+        return lambda node: order_by(cities[node])
+    return order_by
+
+def clear_neighbor_orders(graph=None):
+    if graph is None:
+        _neighbor_orders.clear()
+    else:
+        _neighbor_orders.pop(graph, None)
 
 def breadth_first_search(graph, source, predicate, order_by=None):
     return search(breadth_first_traverse, graph, source, predicate, order_by)
@@ -108,22 +235,21 @@ def search(traverse, graph, source, predicate, order_by=None):
             return node
         
 def shortest_path(graph, source, destination, order_by=None, ascending=False):
-    queue = Queue()
-    queue.put(source) # add first node to the queue
-    visited = set(source) # mark it as visited
+    queue = deque([source]) # add first node to the queue
+    visited = {source} # mark it as visited
     previous = dict() # maintain a dictionary for fast lookup of previous nodes given a neighbor
 
-    while not queue.empty():
-        node = queue.get()
+    while queue:
+        node = queue.popleft()
         neighbors = list(graph.neighbors(node))
 
         if order_by:
-            neighbors.sort(key=order_by, reverse=ascending)
+            neighbors.sort(key=_node_key(graph, order_by), reverse=ascending)
 
         for neighbor in neighbors:
             if neighbor not in visited:
                 visited.add(neighbor)
-                queue.put(neighbor)
+                queue.append(neighbor)
                 previous[neighbor] = node
                 if neighbor == destination:
                     return retrace(previous, source, destination)
@@ -146,21 +272,22 @@ def retrace(previous, source, destination):
 
 def main():
     filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
-    nodes, graph = load_graph(filepath, City.from_dict)
+    nodes, graph = load_compact_graph(filepath, City.from_dict)
+    cities = graph.cities # node id -> City
 
     print("__DFS__")
-    for city in depth_first_traverse(graph, nodes["edinburgh"]):
-        print(city.name)
+    for node in depth_first_traverse(graph, nodes["edinburgh"]):
+        print(cities[node].name)
 
-    # for city in recursive_depth_first_traverse(graph, nodes["edinburgh"]):
-    #     print(city.name)
+    # for node in recursive_depth_first_traverse(graph, nodes["edinburgh"]):
+    #     print(cities[node].name)
 
     print("__BFS__")
-    city = breadth_first_search(graph, nodes["edinburgh"], is_twentieth_century)
-    print("City found:", city.name)
+    node = breadth_first_search(graph, nodes["edinburgh"], lambda node: is_twentieth_century(cities[node]))
+    print("City found:", cities[node].name)
 
-    for city in breadth_first_traverse(graph, nodes["edinburgh"]):
-        print(city.name)
+    for node in breadth_first_traverse(graph, nodes["edinburgh"]):
+        print(cities[node].name)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
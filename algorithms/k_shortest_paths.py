@@ -0,0 +1,97 @@
+from heapq import heappush, heappop
+from itertools import count, islice
+from math import inf as infinity
+import os
+
+from graphs import load_graph, by_distance, City
+from dijkstra import shortest_path_tree
+from astar import astar
+
+def k_shortest_paths(graph, source, destination, k, weight_factory):
+    """The k cheapest paths without repeated nodes as (cost, path) pairs, fewer when there aren't that many"""
+    return list(islice(shortest_simple_paths(graph, source, destination, weight_factory), k))
+
+def shortest_simple_paths(graph, source, destination, weight_factory):
+    """
+    Paths without repeated nodes from source to destination by increasing cost, as (cost, path) pairs (Yen's algorithm).
+    Each path found leads to candidates that follow it up to a spur node then take another road from there.
+    * the shortest path tree towards the destination is computed once and shared by every spur search:
+      when the tree's own path from the spur node avoids the removed roads it is the spur path as is,
+      otherwise its distances guide an A* search, as roads removed can only make the way longer
+    * spur nodes before the point where a path left its parent path were tried already (Lawler's improvement)
+    """
+    tree = shortest_path_tree(graph, destination, weight_factory)
+    if source not in tree.distance:
+        return
+
+    def heuristic(node, _):
+        return tree.distance.get(node, infinity)
+
+    def cost(path):
+        return sum(weight_factory(graph[node1][node2]) for node1, node2 in zip(path, path[1:]))
+
+    found = [] # paths yielded so far
+    seen = set() # every path found or queued as a candidate
+    tie_breaker = count()
+    first = tree.path_to(source)[::-1] # the tree's paths lead from the destination
+    candidates = [(tree.distance[source], next(tie_breaker), first, 0)]
+    seen.add(tuple(first))
+
+    while candidates:
+        path_cost, _, path, deviation = heappop(candidates)
+        yield path_cost, path
+        found.append(path)
+
+        for i in range(deviation, len(path) - 1):
+            spur, root = path[i], path[:i + 1]
+            # take the roads out of the spur node used by the paths that share this root, and the root's other nodes
+            removed_edges = {
+                (spur, other[i + 1]) for other in found if len(other) > i + 1 and other[:i + 1] == root
+            }
+            removed_nodes = set(root[:-1])
+
+            spur_path = _tree_path(tree, spur, removed_nodes, removed_edges)
+            if spur_path is None:
+                restricted = _RestrictedGraph(graph, removed_nodes, removed_edges)
+                spur_path = astar(restricted, spur, destination, weight_factory, heuristic)
+                if spur_path is None:
+                    continue
+
+            new_path = root[:-1] + spur_path
+            if tuple(new_path) not in seen:
+                seen.add(tuple(new_path))
+                heappush(candidates, (cost(new_path), next(tie_breaker), new_path, i))
+
+def _tree_path(tree, node, removed_nodes, removed_edges):
+    """Path from node to the tree's source (the destination) along the tree, None if it uses anything removed"""
+    path = [node]
+    while node != tree.source:
+        next_node = tree.previous[node]
+        if next_node in removed_nodes or (node, next_node) in removed_edges:
+            return None
+        path.append(node := next_node)
+    return path
+
+class _RestrictedGraph:
+    """Read-only view of an undirected graph without some nodes and without some roads out of some nodes"""
+    def __init__(self, graph, removed_nodes, removed_edges):
+        self.graph = graph
+        self.removed_nodes = removed_nodes
+        self.removed_edges = removed_edges
+
+    def __getitem__(self, node):
+        return {
+            neighbor: weights
+            for neighbor, weights in self.graph[node].items()
+            if neighbor not in self.removed_nodes and (node, neighbor) not in self.removed_edges
+        }
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    nodes, graph = load_graph(filepath, City.from_dict)
+
+    for cost, path in k_shortest_paths(graph, nodes["london"], nodes["edinburgh"], 5, by_distance):
+        print(f"{cost:5.0f} miles:", " - ".join(city.name for city in path))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from collections import defaultdict
+from heapq import heappush, heappop
+from itertools import count
+import os
+
+from graphs import load_graph, by_distance, by_hops, City
+from dijkstra import shortest_path_tree
+
+def pareto_paths(graph, source, destination, weight_factories):
+    """
+    Every Pareto-optimal path from source to destination when weighing edges by several weight factories at once:
+    no other path is at least as cheap on every criterion and cheaper on one of them.
+    Returns (costs, path) pairs by increasing costs, costs holding one total per weight factory.
+
+    Martins' label-setting algorithm: a node keeps one label per Pareto-optimal way of reaching it
+    and labels come off the queue in lexicographic order, so a settled label is never beaten later on.
+    The cost left to the destination under each criterion alone, read from cached shortest path trees,
+    steers the search like A* and prunes the labels that can't beat a path to the destination found already.
+    """
+    bounds = [shortest_path_tree(graph, destination, weight_factory).distance for weight_factory in weight_factories]
+    if source not in bounds[0]:
+        return []
+
+    def estimate(costs, node):
+        return tuple(cost + bound[node] for cost, bound in zip(costs, bounds))
+
+    settled = defaultdict(list) # node -> costs of its settled labels
+    found = settled[destination]
+    paths = []
+    tie_breaker = count()
+    costs = (0,) * len(weight_factories)
+    unvisited = [(estimate(costs, source), next(tie_breaker), costs, (source, None))]
+
+    while unvisited:
+        total, _, costs, label = heappop(unvisited)
+        node = label[0]
+        if _dominated(costs, settled[node]) or _dominated(total, found):
+            continue
+        settled[node].append(costs)
+        if node == destination:
+            paths.append((costs, _retrace(label)))
+            continue
+        for neighbor, weights in graph[node].items():
+            if neighbor not in bounds[0]:
+                continue # no way to the destination from there
+            new_costs = tuple(cost + weight_factory(weights) for cost, weight_factory in zip(costs, weight_factories))
+            new_total = estimate(new_costs, neighbor)
+            if not _dominated(new_costs, settled[neighbor]) and not _dominated(new_total, found):
+                heappush(unvisited, (new_total, next(tie_breaker), new_costs, (neighbor, label)))
+
+    return paths
+
+def _dominated(costs, others):
+    """Whether one of others is at least as cheap as costs on every criterion"""
+    return any(all(other <= cost for other, cost in zip(other_costs, costs)) for other_costs in others)
+
+def _retrace(label):
+    """Labels link back to the label they were extended from, down to the source's"""
+    path = []
+    while label is not None:
+        node, label = label
+        path.append(node)
+    return path[::-1]
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    nodes, graph = load_graph(filepath, City.from_dict)
+
+    # trade-offs between the distance driven and the number of cities driven through
+    for (distance, hops), path in pareto_paths(graph, nodes["london"], nodes["inverness"], (by_distance, by_hops)):
+        print(f"{distance:5.0f} miles, {hops:2} roads:", " - ".join(city.name for city in path))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Binary snapshots of parsed graph files, so that large maps are only parsed once.
+A snapshot is written next to its source file and holds:
+* a header with the size, modification time and digest of the source it was made from
+* the CompactGraph arrays (offsets, targets and numeric edge attribute columns) as raw native 64-bit values
+* the attributes of each node pickled separately, then the node names and any non-numeric edge attributes
+Loading memory-maps the file and casts memoryviews over the arrays, so no edge is copied or parsed,
+and nodes are only built when they're first accessed.
+"""
+
+from array import array
+from collections.abc import Sequence
+from contextlib import suppress
+from hashlib import blake2b
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+from compact_graph import CompactGraph
+from dot import read_graph
+
+MAGIC = b"CSRGRAF" + (b"<" if sys.byteorder == "little" else b">")
+HEADER = struct.Struct("<8sQQ32sQQQ") # magic, source size, source mtime, source digest, nodes, edge slots, numeric columns
+
+class NodeTable(Sequence):
+    """Nodes of a snapshot, each record unpickled and passed to node_factory the first time it's accessed"""
+    def __init__(self, records, offsets, node_factory):
+        self._records = records
+        self._offsets = offsets
+        self._node_factory = node_factory
+        self._nodes = [None] * (len(offsets) - 1)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __getitem__(self, node):
+        if (item := self._nodes[node]) is None:
+            record = self._records[self._offsets[node]:self._offsets[node + 1]]
+            item = self._nodes[node] = self._node_factory(pickle.loads(record))
+        return item
+
+def load_or_build(filename, node_factory, snapshot_filename=None):
+    """
+    Node names and CompactGraph of a graph file, whose cities are node_factory applied to each node's attributes,
+    from its snapshot when the file hasn't changed since, otherwise parsed and snapshotted for next time.
+    The file counts as unchanged when its size and modification time match, or failing that its contents do.
+    A snapshot that can't be written, e.g. in a read-only directory, is skipped and the parsed graph returned all the same.
+    """
+    snapshot_filename = snapshot_filename or os.path.splitext(filename)[0] + ".csr"
+    if _is_fresh(snapshot_filename, filename):
+        return load(snapshot_filename, node_factory)
+
+    attributes, edges = read_graph(filename)
+    names = list(attributes)
+    ids = {name: node for node, name in enumerate(names)}
+    graph = CompactGraph.from_edges(
+        [node_factory(node_attributes) for node_attributes in attributes.values()],
+        ((ids[name1], ids[name2], edge_attributes) for name1, name2, edge_attributes in edges),
+    )
+    try:
+        save(snapshot_filename, filename, names, attributes.values(), graph)
+    except OSError:
+        pass # the file will just be parsed again next time
+    return names, graph
+
+def save(path, source, names, attributes, graph):
+    records = [pickle.dumps(node_attributes, pickle.HIGHEST_PROTOCOL) for node_attributes in attributes]
+    record_offsets = array("q", [0])
+    for record in records:
+        record_offsets.append(record_offsets[-1] + len(record))
+    numeric = [name for name, column in graph.columns.items() if isinstance(column, array)]
+    others = {name: column for name, column in graph.columns.items() if name not in numeric}
+    metadata = pickle.dumps((names, numeric, others), pickle.HIGHEST_PROTOCOL)
+    stat = os.stat(source)
+
+    # write a temporary file then swap it in, a crash never leaves a truncated snapshot behind
+    temporary = path + ".tmp"
+    try:
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(
+                MAGIC, stat.st_size, stat.st_mtime_ns, _digest(source), len(graph), len(graph.targets), len(numeric)
+            ))
+            file.write(array("q", graph.offsets).tobytes())
+            file.write(array("q", graph.targets).tobytes())
+            for name in numeric:
+                file.write(graph.columns[name].tobytes())
+            file.write(record_offsets.tobytes())
+            file.writelines(records)
+            file.write(metadata)
+        os.replace(temporary, path)
+    except Exception:
+        with suppress(OSError):
+            os.remove(temporary)
+        raise
+
+def load(path, node_factory):
+    with open(path, "rb") as file:
+        # the mapping stays open for as long as the graph's memoryviews refer to it
+        view = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+    _, _, _, _, num_nodes, num_slots, num_numeric = HEADER.unpack_from(view)
+
+    position = HEADER.size
+    def take(size):
+        nonlocal position
+        start, position = position, position + size
+        return view[start:position]
+
+    offsets = take(8 * (num_nodes + 1)).cast("q")
+    targets = take(8 * num_slots).cast("q")
+    numeric_columns = [take(8 * num_slots).cast("d") for _ in range(num_numeric)]
+    record_offsets = take(8 * (num_nodes + 1)).cast("q")
+    records = take(record_offsets[-1])
+    names, numeric, others = pickle.loads(view[position:])
+
+    columns = dict(zip(numeric, numeric_columns))
+    columns.update(others)
+    cities = NodeTable(records, record_offsets, node_factory)
+    return names, CompactGraph(cities, offsets, targets, columns)
+
+def _is_fresh(path, source):
+    try:
+        with open(path, "rb") as file:
+            header = HEADER.unpack(file.read(HEADER.size))
+    except (OSError, struct.error):
+        return False
+    magic, size, mtime, digest, *counts = header
+    stat = os.stat(source)
+    if magic != MAGIC or size != stat.st_size:
+        return False
+    if mtime == stat.st_mtime_ns:
+        return True
+    if digest != _digest(source):
+        return False
+    # same contents with a new modification time (e.g. after a checkout), remember it to skip hashing next time
+    with suppress(OSError): # a read-only snapshot is still good, it'll be hashed again
+        with open(path, "r+b") as file:
+            file.write(HEADER.pack(magic, size, stat.st_mtime_ns, digest, *counts))
+    return True
+
+def _digest(filename):
+    digest = blake2b(digest_size=32)
+    with open(filename, "rb") as file:
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+    return digest.digest()
@@ -0,0 +1,161 @@
+from array import array
+from heapq import heappush, heappushpop
+from itertools import compress, filterfalse
+from math import radians, sin, cos, asin, pi
+import os
+
+from graphs import load_graph, EARTH_RADIUS, City
+
+LEAF_SIZE = 8 # ranges this small are scanned rather than split further
+
+class SpatialIndex:
+    """
+    KD-tree over the positions of cities (or anything with a latitude and longitude) for nearest and radius queries,
+    e.g. to snap GPS points to the closest nodes of a graph before routing.
+    * positions are stored as points on the unit sphere, where the straight-line distance between two points
+      grows with the great-circle distance, so there is no special case around the poles or the 180th meridian
+    * the tree is implicit: the items are ordered so that each range's median splits it in two along one axis,
+      and a query only descends into the halves that can still hold a closer point
+    Distances returned are great-circle distances in miles.
+    """
+    def __init__(self, items, position=lambda city: (city.latitude, city.longitude)):
+        items = list(items)
+        coordinates = tuple(zip(*(_to_unit_vector(*position(item)) for item in items))) or ((), (), ())
+        self._axes = array("b", bytes(len(items)))
+        order = self._build(coordinates, len(items))
+        self._coordinates = tuple(array("d", map(values.__getitem__, order)) for values in coordinates)
+        self._items = [items[index] for index in order]
+
+    @classmethod
+    def from_nodes(cls, nodes):
+        """Index the cities of load_graph()'s nodes dictionary, or of any iterable of cities"""
+        return cls(nodes.values() if isinstance(nodes, dict) else nodes)
+
+    def __len__(self):
+        return len(self._items)
+
+    def nearest(self, latitude, longitude, k=1):
+        """The k items closest to a position as (distance, item) pairs, closest first"""
+        if k < 1:
+            return []
+        point = _to_unit_vector(latitude, longitude)
+        xs, ys, zs = self._coordinates
+        best = [] # max-heap of the k closest so far: (-squared distance, index)
+
+        stack = [(0, len(self._items), 0.0)] # range of the tree and a lower bound of its squared distance
+        while stack:
+            start, stop, bound = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            if stop - start <= LEAF_SIZE:
+                for index in range(start, stop):
+                    squared = (xs[index] - point[0]) ** 2 + (ys[index] - point[1]) ** 2 + (zs[index] - point[2]) ** 2
+                    if len(best) < k:
+                        heappush(best, (-squared, index))
+                    elif squared < -best[0][0]:
+                        heappushpop(best, (-squared, index))
+                continue
+
+            middle = (start + stop) // 2
+            squared = (xs[middle] - point[0]) ** 2 + (ys[middle] - point[1]) ** 2 + (zs[middle] - point[2]) ** 2
+            if len(best) < k:
+                heappush(best, (-squared, middle))
+            elif squared < -best[0][0]:
+                heappushpop(best, (-squared, middle))
+
+            axis = self._axes[middle]
+            offset = point[axis] - self._coordinates[axis][middle]
+            near, far = ((start, middle), (middle + 1, stop)) if offset < 0 else ((middle + 1, stop), (start, middle))
+            stack.append((*far, max(bound, offset * offset))) # anything across the plane is at least that far
+            stack.append((*near, bound)) # searched first, it tightens the bound for the far side
+
+        return [(_miles(-squared), self._items[index]) for squared, index in sorted(best, reverse=True)]
+
+    def within(self, latitude, longitude, radius):
+        """Items no further than radius miles from a position as (distance, item) pairs, closest first"""
+        point = _to_unit_vector(latitude, longitude)
+        limit = (2 * sin(min(radius / EARTH_RADIUS, pi) / 2)) ** 2 # squared straight-line distance
+        xs, ys, zs = self._coordinates
+        found = []
+
+        stack = [(0, len(self._items))]
+        while stack:
+            start, stop = stack.pop()
+            if stop - start <= LEAF_SIZE:
+                for index in range(start, stop):
+                    squared = (xs[index] - point[0]) ** 2 + (ys[index] - point[1]) ** 2 + (zs[index] - point[2]) ** 2
+                    if squared <= limit:
+                        found.append((squared, index))
+                continue
+
+            middle = (start + stop) // 2
+            squared = (xs[middle] - point[0]) ** 2 + (ys[middle] - point[1]) ** 2 + (zs[middle] - point[2]) ** 2
+            if squared <= limit:
+                found.append((squared, middle))
+            offset = point[self._axes[middle]] - self._coordinates[self._axes[middle]][middle]
+            if offset < 0 or offset * offset <= limit:
+                stack.append((start, middle))
+            if offset >= 0 or offset * offset <= limit:
+                stack.append((middle + 1, stop))
+
+        return [(_miles(squared), self._items[index]) for squared, index in sorted(found)]
+
+    def nearest_many(self, positions, k=1):
+        """nearest() for each (latitude, longitude) of positions, e.g. a GPS trace"""
+        return [self.nearest(latitude, longitude, k) for latitude, longitude in positions]
+
+    def within_many(self, positions, radius):
+        return [self.within(latitude, longitude, radius) for latitude, longitude in positions]
+
+    def _build(self, coordinates, size):
+        """
+        Tree order of the item indices, splitting each range at the median of its widest axis.
+        Each range comes with its indices sorted along every axis, which the split partitions
+        without sorting again, O(n log n) overall.
+        """
+        order = [0] * size
+        stack = [(0, size, [sorted(range(size), key=values.__getitem__) for values in coordinates])]
+        while stack:
+            start, stop, by_axis = stack.pop()
+            if stop - start <= LEAF_SIZE:
+                order[start:stop] = by_axis[0]
+                continue
+            spreads = [values[indices[-1]] - values[indices[0]] for values, indices in zip(coordinates, by_axis)]
+            axis = spreads.index(max(spreads))
+            half = (stop - start) // 2
+            median = by_axis[axis][half]
+            order[start + half] = median
+            self._axes[start + half] = axis
+
+            lower = set(by_axis[axis][:half])
+            lower_by_axis, upper_by_axis = [], []
+            for indices in by_axis:
+                lower_by_axis.append(list(compress(indices, map(lower.__contains__, indices))))
+                upper_by_axis.append(list(filterfalse(lower.__contains__, indices)))
+                upper_by_axis[-1].remove(median)
+            stack.append((start, start + half, lower_by_axis))
+            stack.append((start + half + 1, stop, upper_by_axis))
+        return order
+
+def _to_unit_vector(latitude, longitude):
+    latitude, longitude = radians(latitude), radians(longitude)
+    return (cos(latitude) * cos(longitude), cos(latitude) * sin(longitude), sin(latitude))
+
+def _miles(squared):
+    """Great-circle distance between two points of the unit sphere squared distance apart"""
+    return 2 * EARTH_RADIUS * asin(min(squared ** 0.5 / 2, 1.0))
+
+def main():
+    filepath = os.path.join(os.path.dirname(__file__), 'input/roadmap.dot')
+    nodes, _ = load_graph(filepath, City.from_dict)
+    index = SpatialIndex.from_nodes(nodes)
+
+    # snap a few GPS fixes to the closest cities
+    trace = [(51.5072, -0.1276), (52.2053, 0.1218), (55.9533, -3.1883)]
+    for (latitude, longitude), [(distance, city)] in zip(trace, index.nearest_many(trace)):
+        print(f"({latitude}, {longitude}) -> {city.name}, {distance:.1f} miles away")
+
+    print("Within 20 miles of Manchester:", [city.name for _, city in index.within(53.4808, -2.2426, 20)])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import networkx as nx
+
+from astar import astar, great_circle_heuristic
+from dijkstra import dijkstra, bidirectional_dijkstra
+from graphs import by_distance
+
+def nx_weight(node1, node2, weights):
+    return by_distance(weights)
+
+def nx_distance(graph, source, destination):
+    try:
+        return nx.dijkstra_path_length(graph, source, destination, weight=nx_weight)
+    except nx.NetworkXNoPath:
+        return None
+
+def no_heuristic(node, destination):
+    return 0
+
+def test_should_find_shortest_paths_with_great_circle_heuristic(roadmap, path_cost):
+    nodes, graph = roadmap
+    heuristic = great_circle_heuristic(graph, by_distance)
+    london = nodes["london"]
+
+    for city in graph.nodes:
+        expected = nx_distance(graph, london, city)
+        path = astar(graph, london, city, by_distance, heuristic)
+        if expected is None:
+            assert path is None
+        else:
+            assert path[0] == london and path[-1] == city
+            assert path_cost(graph, path, by_distance) == expected
+
+def test_should_never_overestimate_with_great_circle_heuristic(roadmap):
+    nodes, graph = roadmap
+    heuristic = great_circle_heuristic(graph, by_distance)
+    edinburgh = nodes["edinburgh"]
+
+    for city, distance in nx.single_source_dijkstra_path_length(graph, edinburgh, weight=nx_weight).items():
+        assert heuristic(city, edinburgh) <= distance + 1e-9
+
+def test_should_match_dijkstra_without_heuristic(random_graphs, path_cost):
+    for graph in random_graphs():
+        for source in list(graph.nodes)[:5]:
+            for destination in graph.nodes:
+                expected = nx_distance(graph, source, destination)
+                path = astar(graph, source, destination, by_distance, no_heuristic)
+                assert (path is None) == (expected is None)
+                if path is not None:
+                    assert path_cost(graph, path, by_distance) == expected
+                    assert path_cost(graph, dijkstra(graph, source, destination, by_distance), by_distance) == expected
+
+def test_should_match_dijkstra_with_bidirectional_search(random_graphs, path_cost):
+    for graph in random_graphs(seed=1):
+        for source in list(graph.nodes)[:5]:
+            for destination in graph.nodes:
+                expected = nx_distance(graph, source, destination)
+                path = bidirectional_dijkstra(graph, source, destination, by_distance)
+                assert (path is None) == (expected is None)
+                if path is not None:
+                    assert path[0] == source and path[-1] == destination
+                    assert path_cost(graph, path, by_distance) == expected
+
+def test_should_route_across_the_roadmap_with_bidirectional_search(roadmap, path_cost):
+    nodes, graph = roadmap
+    path = bidirectional_dijkstra(graph, nodes["london"], nodes["edinburgh"], by_distance)
+
+    assert path_cost(graph, path, by_distance) == nx_distance(graph, nodes["london"], nodes["edinburgh"])
+    assert bidirectional_dijkstra(graph, nodes["london"], nodes["belfast"], by_distance) is None
@@ -0,0 +1,111 @@
+import shutil
+
+import networkx as nx
+import pytest
+
+from astar import astar, great_circle_heuristic
+from compact_graph import CompactGraph
+from conftest import ROADMAP
+from dijkstra import dijkstra
+from graphs import (
+    load_compact_graph, breadth_first_traverse, breadth_first_levels, depth_first_traverse, shortest_path,
+    by_distance, by_latitude, City,
+)
+
+@pytest.fixture(scope="module")
+def compact_roadmap(roadmap):
+    _, graph = roadmap
+    return CompactGraph.from_networkx(graph)
+
+def cities_of(compact, nodes):
+    return [compact.cities[node] for node in nodes]
+
+def test_should_have_the_same_nodes_and_edges_as_networkx(random_graphs):
+    for graph in random_graphs():
+        compact = CompactGraph.from_networkx(graph)
+
+        assert compact.number_of_nodes() == graph.number_of_nodes() == len(compact)
+        assert compact.number_of_edges() == graph.number_of_edges()
+        assert {frozenset(cities_of(compact, edge)) for edge in compact.edges()} \
+            == {frozenset(edge) for edge in graph.edges()}
+        for node in compact.nodes:
+            city = compact.cities[node]
+            assert compact.node_id(city) == node and node in compact
+            assert cities_of(compact, compact.neighbors(node)) == list(graph.neighbors(city))
+            assert compact.degree(node) == graph.degree(city)
+            for neighbor, weights in compact[node].items():
+                assert weights["distance"] == graph[city][compact.cities[neighbor]]["distance"]
+                assert compact[node][neighbor]["distance"] == weights["distance"]
+        assert len(compact) not in compact and -1 not in compact
+
+def test_should_build_the_same_graph_from_edges():
+    cities = ["a", "b", "c", "d"]
+    compact = CompactGraph.from_edges(cities, [(0, 1, {"distance": 3}), (1, 2, {"distance": 4, "road": "A1"})])
+
+    assert list(compact.edges()) == [(0, 1), (1, 2)]
+    assert list(compact.neighbors(1)) == [0, 2]
+    assert compact.degree(3) == 0
+    assert compact[1][2]["road"] == "A1" and compact[0][1].get("road") is None
+    assert list(compact.weights(by_distance)) == [3.0, 3.0, 4.0, 4.0]
+
+def test_should_treat_missing_attributes_as_absent():
+    compact = CompactGraph.from_edges(["a", "b", "c"], [(0, 1, {"distance": 3}), (1, 2, {"distance": 4, "toll": "2"})])
+    graph = nx.Graph([("a", "b", {"distance": 3}), ("b", "c", {"distance": 4, "toll": "2"})])
+
+    for node1, node2, weights in compact.edges(data=True):
+        expected = graph[compact.cities[node1]][compact.cities[node2]]
+        assert dict(weights.items()) == expected and len(weights) == len(expected)
+        assert list(weights) == list(weights.keys()) == list(expected)
+        assert ("toll" in weights) == ("toll" in expected)
+        assert weights.get("toll", "0") == expected.get("toll", "0")
+        assert "bridge" not in weights and weights.get("bridge", 1) == 1
+    with pytest.raises(KeyError):
+        compact[0][1]["toll"]
+
+def test_should_traverse_like_networkx(random_graphs):
+    for graph in random_graphs(seed=5):
+        compact = CompactGraph.from_networkx(graph)
+        for node in compact.nodes:
+            city = compact.cities[node]
+            assert cities_of(compact, breadth_first_traverse(compact, node)) == list(breadth_first_traverse(graph, city))
+            assert cities_of(compact, depth_first_traverse(compact, node)) == list(nx.dfs_preorder_nodes(graph, city))
+            assert [cities_of(compact, level) for level in breadth_first_levels(compact, node)] \
+                == list(breadth_first_levels(graph, city))
+
+def test_should_order_neighbors_by_city(roadmap, compact_roadmap):
+    nodes, graph = roadmap
+    edinburgh = compact_roadmap.node_id(nodes["edinburgh"])
+
+    for traverse in (breadth_first_traverse, depth_first_traverse):
+        expected = list(traverse(graph, nodes["edinburgh"], order_by=by_latitude))
+        assert cities_of(compact_roadmap, traverse(compact_roadmap, edinburgh, order_by=by_latitude)) == expected
+    assert [cities_of(compact_roadmap, level) for level in breadth_first_levels(compact_roadmap, edinburgh, by_latitude)] \
+        == list(breadth_first_levels(graph, nodes["edinburgh"], by_latitude))
+
+    london = compact_roadmap.node_id(nodes["london"])
+    path = shortest_path(compact_roadmap, edinburgh, london, order_by=by_latitude)
+    assert cities_of(compact_roadmap, path) == shortest_path(graph, nodes["edinburgh"], nodes["london"], order_by=by_latitude)
+
+def test_should_route_with_great_circle_heuristic(roadmap, compact_roadmap, path_cost):
+    nodes, graph = roadmap
+    heuristic = great_circle_heuristic(compact_roadmap, by_distance)
+    london = compact_roadmap.node_id(nodes["london"])
+
+    for node in compact_roadmap.nodes:
+        expected = dijkstra(compact_roadmap, london, node, by_distance)
+        path = astar(compact_roadmap, london, node, by_distance, heuristic)
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert path_cost(compact_roadmap, path, by_distance) == path_cost(compact_roadmap, expected, by_distance)
+    assert heuristic(london, london) == 0
+
+def test_should_load_the_same_graph_as_networkx(roadmap, tmp_path):
+    nodes, graph = roadmap
+    filename = tmp_path / "roadmap.dot"
+    shutil.copy(ROADMAP, filename)
+    ids, compact = load_compact_graph(str(filename), City.from_dict)
+
+    assert {name: compact.cities[node] for name, node in ids.items()} == nodes
+    assert {frozenset(cities_of(compact, edge)) for edge in compact.edges()} == {frozenset(edge) for edge in graph.edges()}
+    for node1, node2, weights in compact.edges(data=True):
+        assert weights["distance"] == by_distance(graph[compact.cities[node1]][compact.cities[node2]])
@@ -0,0 +1,89 @@
+from random import Random
+
+import networkx as nx
+import pytest
+
+from compact_graph import CompactGraph
+from connectivity import Components, UnionFind, SharedGraph, attach, hop_distances
+
+def nx_hops(graph, source, destination):
+    try:
+        return nx.shortest_path_length(graph, source, destination)
+    except nx.NetworkXNoPath:
+        return None
+
+def random_pairs(graph, count, seed=0):
+    random = Random(seed)
+    nodes = list(graph.nodes)
+    return [(random.choice(nodes), random.choice(nodes)) for _ in range(count)]
+
+def test_should_track_disjoint_sets():
+    sets = UnionFind(5)
+
+    assert sets.union(0, 1) and sets.union(3, 4) and sets.union(1, 4)
+    assert not sets.union(0, 3)
+    assert sets.count == 2
+    assert len({sets.find(item) for item in (0, 1, 3, 4)}) == 1 and sets.find(2) == 2
+
+def test_should_find_the_same_components_as_networkx(random_graphs):
+    for graph in random_graphs(seed=10):
+        expected = {node: frozenset(component) for component in nx.connected_components(graph) for node in component}
+        compact = CompactGraph.from_networkx(graph)
+        for candidate, city in ((graph, lambda node: node), (compact, compact.cities.__getitem__)):
+            components = Components(candidate)
+            pairs = [(node1, node2) for node1 in candidate.nodes for node2 in candidate.nodes]
+
+            assert len(components) == nx.number_connected_components(graph)
+            assert components.connected_pairs(pairs) == [city(node2) in expected[city(node1)] for node1, node2 in pairs]
+
+def test_should_add_edges():
+    graph = nx.Graph([("a", "b"), ("c", "d")])
+    components = Components(graph)
+    assert not components.is_connected("a", "d") and len(components) == 2
+
+    components.add_edge("b", "c")
+
+    assert components.is_connected("a", "d") and len(components) == 1
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_should_count_hops_like_networkx(random_graphs, max_workers):
+    for graph in random_graphs(count=5, seed=11):
+        pairs = random_pairs(graph, 200)
+        expected = [nx_hops(graph, source, destination) for source, destination in pairs]
+
+        assert hop_distances(graph, pairs, max_workers=max_workers) == expected
+        compact = CompactGraph.from_networkx(graph)
+        compact_pairs = [(compact.node_id(source), compact.node_id(destination)) for source, destination in pairs]
+        assert hop_distances(compact, compact_pairs, Components(compact), max_workers=max_workers) == expected
+
+def test_should_use_the_callers_components_on_a_networkx_graph():
+    # node 1 comes first so the compact ids don't match the labels
+    graph = nx.Graph()
+    graph.add_nodes_from([1, 0, 2])
+    graph.add_edge(1, 2)
+    pairs = [(1, 2), (0, 2), (0, 0)]
+
+    assert hop_distances(graph, pairs, Components(graph), max_workers=1) == [1, None, 0]
+    assert hop_distances(graph, pairs, max_workers=1) == [1, None, 0]
+
+def test_should_use_the_callers_components_with_any_node_type(roadmap):
+    nodes, graph = roadmap
+    components = Components(graph)
+    pairs = [(nodes["london"], nodes["edinburgh"]), (nodes["london"], nodes["belfast"]), (nodes["derry"], nodes["belfast"])]
+
+    assert hop_distances(graph, pairs, components, max_workers=1) == [nx_hops(graph, *pair) for pair in pairs]
+
+    cities = nx.relabel_nodes(graph, {city: city.name for city in graph.nodes})
+    names = [(source.name, destination.name) for source, destination in pairs]
+    assert hop_distances(cities, names, Components(cities), max_workers=1) == [nx_hops(graph, *pair) for pair in pairs]
+
+def test_should_share_the_graph_arrays(random_graphs):
+    graph = CompactGraph.from_networkx(random_graphs(count=1, seed=12)[0])
+    with SharedGraph(graph) as shared:
+        attached = attach(shared.handle)
+        assert list(attached.offsets) == list(graph.offsets)
+        assert list(attached.targets) == list(graph.targets)
+        assert [list(attached.neighbors(node)) for node in attached.nodes] == [list(graph.neighbors(node)) for node in graph.nodes]
+        del attached.offsets, attached.targets
+        for block in attached._blocks:
+            block.close()
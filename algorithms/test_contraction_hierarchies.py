@@ -0,0 +1,105 @@
+from functools import partial
+from math import inf as infinity
+import shutil
+
+import networkx as nx
+import pytest
+
+import contraction_hierarchies
+from contraction_hierarchies import ContractionHierarchy, load_or_build
+from conftest import ROADMAP
+from graphs import by_distance, City
+
+def nx_weight(node1, node2, weights):
+    return by_distance(weights)
+
+def scaled_distance(weights, factor):
+    return by_distance(weights) * factor
+
+def test_should_match_networkx_on_the_roadmap(roadmap, path_cost):
+    nodes, graph = roadmap
+    hierarchy = ContractionHierarchy.build(graph, by_distance)
+
+    for source in (nodes["london"], nodes["edinburgh"], nodes["belfast"]):
+        expected = nx.single_source_dijkstra_path_length(graph, source, weight=nx_weight)
+        for destination in graph.nodes:
+            cost, path = hierarchy.query(source, destination)
+            if destination not in expected:
+                assert (cost, path) == (infinity, None)
+            else:
+                assert cost == expected[destination]
+                assert path[0] == source and path[-1] == destination
+                assert path_cost(graph, path, by_distance) == cost
+
+@pytest.mark.parametrize("witness_limit", [1, 64])
+def test_should_match_networkx_on_random_graphs(random_graphs, path_cost, witness_limit):
+    for graph in random_graphs(seed=2):
+        hierarchy = ContractionHierarchy.build(graph, by_distance, witness_limit=witness_limit)
+        for source, expected in nx.all_pairs_dijkstra_path_length(graph, weight=nx_weight):
+            for destination in graph.nodes:
+                path = hierarchy.shortest_path(source, destination)
+                if destination not in expected:
+                    assert path is None
+                else:
+                    assert path_cost(graph, path, by_distance) == expected[destination]
+
+def test_should_save_and_load(random_graphs, tmp_path):
+    graph = random_graphs(count=1, seed=4)[0]
+    hierarchy = ContractionHierarchy.build(graph, by_distance)
+    hierarchy.save(tmp_path / "graph.ch")
+    loaded = ContractionHierarchy.load(tmp_path / "graph.ch")
+
+    assert loaded.cache_key == "graphs.by_distance"
+    for source in graph.nodes:
+        for destination in graph.nodes:
+            assert loaded.query(source, destination) == hierarchy.query(source, destination)
+
+@pytest.fixture
+def roadmap_copy(tmp_path):
+    filename = tmp_path / "roadmap.dot"
+    shutil.copy(ROADMAP, filename)
+    return str(filename)
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Weight factories the hierarchies got built with"""
+    built = []
+    build = ContractionHierarchy.build.__func__
+    def tracking_build(cls, graph, weight_factory, *args, **kwargs):
+        built.append(weight_factory)
+        return build(cls, graph, weight_factory, *args, **kwargs)
+    monkeypatch.setattr(ContractionHierarchy, "build", classmethod(tracking_build))
+    return built
+
+def test_should_reuse_the_index_of_a_module_level_function(roadmap_copy, builds):
+    load_or_build(roadmap_copy, City.from_dict, by_distance)
+    load_or_build(roadmap_copy, City.from_dict, by_distance)
+
+    assert builds == [by_distance]
+
+def test_should_rebuild_for_unnamed_weight_factories(roadmap_copy, builds):
+    costs = {}
+    for weight_factory in (lambda weights: 1, lambda weights: by_distance(weights), partial(scaled_distance, factor=2)):
+        hierarchy = load_or_build(roadmap_copy, City.from_dict, weight_factory)
+        london, edinburgh = (
+            next(city for city in hierarchy.nodes if city.name == name) for name in ("City of London", "Edinburgh")
+        )
+        costs[weight_factory] = hierarchy.query(london, edinburgh)[0]
+
+    assert len(builds) == 3
+    one, distance, doubled = costs.values()
+    assert doubled == 2 * distance and one < distance
+
+def test_should_reuse_the_index_with_an_explicit_cache_key(roadmap_copy, builds):
+    doubled = partial(scaled_distance, factor=2)
+    load_or_build(roadmap_copy, City.from_dict, doubled, cache_key="doubled distance")
+    load_or_build(roadmap_copy, City.from_dict, doubled, cache_key="doubled distance")
+    load_or_build(roadmap_copy, City.from_dict, doubled, cache_key="doubled distance v2")
+
+    assert builds == [doubled, doubled]
+
+def test_should_only_name_module_level_functions():
+    assert contraction_hierarchies._cache_key(by_distance) == "graphs.by_distance"
+    assert contraction_hierarchies._cache_key(lambda weights: 1) is None
+    assert contraction_hierarchies._cache_key(partial(scaled_distance, factor=2)) is None
+    assert contraction_hierarchies._cache_key(City.from_dict) is None
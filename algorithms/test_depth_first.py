@@ -0,0 +1,106 @@
+from random import Random
+import sys
+
+import networkx as nx
+
+from compact_graph import CompactGraph
+from graphs import (
+    depth_first_events, depth_first_traverse, depth_first_post_order, recursive_depth_first_traverse,
+    depth_first_search, by_latitude,
+    PRE_ORDER, POST_ORDER, TREE_EDGE, BACK_EDGE, FORWARD_EDGE, CROSS_EDGE, EDGE_EVENTS, ALL_EVENTS,
+)
+
+def reference_events(graph, source, order_by=None):
+    """The events of a textbook recursive depth-first search"""
+    events, discovered, finished = [], {}, set()
+    directed = graph.is_directed()
+
+    def visit(node, parent):
+        discovered[node] = len(discovered)
+        events.append((PRE_ORDER, node, None))
+        for neighbor in sorted(graph.neighbors(node), key=order_by) if order_by else graph.neighbors(node):
+            if neighbor not in discovered:
+                events.append((TREE_EDGE, node, neighbor))
+                visit(neighbor, node)
+            elif neighbor not in finished:
+                if directed or neighbor != parent:
+                    events.append((BACK_EDGE, node, neighbor))
+            elif directed:
+                events.append((FORWARD_EDGE if discovered[node] < discovered[neighbor] else CROSS_EDGE, node, neighbor))
+        finished.add(node)
+        events.append((POST_ORDER, node, None))
+
+    visit(source, None)
+    return events
+
+def directed_graphs(count=20, seed=0):
+    random = Random(seed)
+    graphs = []
+    for _ in range(count):
+        nodes = random.randint(2, 30)
+        graphs.append(nx.gnm_random_graph(nodes, random.randint(nodes, 3 * nodes), seed=random.randrange(2**32), directed=True))
+    return graphs
+
+def test_should_report_the_events_of_a_recursive_search(random_graphs):
+    for graph in random_graphs(seed=13) + directed_graphs():
+        for source in graph.nodes:
+            expected = reference_events(graph, source)
+
+            assert list(depth_first_events(graph, source)) == expected
+            for events in ({PRE_ORDER}, {POST_ORDER, BACK_EDGE}, EDGE_EVENTS, {CROSS_EDGE, FORWARD_EDGE}):
+                assert list(depth_first_events(graph, source, events=events)) \
+                    == [event for event in expected if event[0] in events]
+
+def test_should_classify_every_edge_once(random_graphs):
+    for graph in random_graphs(seed=14) + directed_graphs(seed=1):
+        for source in graph.nodes:
+            reachable = nx.descendants(graph, source) | {source}
+            edges = [(node1, node2) for _, node1, node2 in depth_first_events(graph, source, events=EDGE_EVENTS)]
+            if graph.is_directed():
+                assert sorted(edges) == sorted(graph.out_edges(reachable))
+            else:
+                assert sorted(map(frozenset, edges), key=sorted) \
+                    == sorted(map(frozenset, graph.edges(reachable)), key=sorted)
+
+def test_should_only_find_back_edges_on_cycles(random_graphs):
+    for graph in random_graphs(seed=15) + directed_graphs(seed=2):
+        source = next(iter(graph.nodes))
+        back_edges = list(depth_first_events(graph, source, events={BACK_EDGE}))
+        reachable = graph.subgraph(nx.descendants(graph, source) | {source})
+        has_cycle = not nx.is_directed_acyclic_graph(reachable) if graph.is_directed() else not nx.is_forest(reachable)
+        assert bool(back_edges) == has_cycle
+
+def test_should_visit_in_the_same_order_as_networkx(random_graphs):
+    for graph in random_graphs(seed=16) + directed_graphs(seed=3):
+        for source in graph.nodes:
+            assert list(depth_first_traverse(graph, source)) == list(nx.dfs_preorder_nodes(graph, source))
+            assert list(depth_first_post_order(graph, source)) == list(nx.dfs_postorder_nodes(graph, source))
+            assert list(recursive_depth_first_traverse(graph, source)) == list(nx.dfs_preorder_nodes(graph, source))
+            assert [(node1, node2) for _, node1, node2 in depth_first_events(graph, source, events={TREE_EDGE})] \
+                == list(nx.dfs_edges(graph, source))
+
+def test_should_follow_order_by(roadmap):
+    nodes, graph = roadmap
+    compact = CompactGraph.from_networkx(graph)
+
+    for source in (nodes["edinburgh"], nodes["london"], nodes["belfast"]):
+        expected = reference_events(graph, source, by_latitude)
+        assert list(depth_first_events(graph, source, by_latitude)) == expected
+        assert [(event, compact.cities[node], None if other is None else compact.cities[other])
+                for event, node, other in depth_first_events(compact, compact.node_id(source), by_latitude)] == expected
+
+def test_should_not_hit_the_recursion_limit():
+    length = 5 * sys.getrecursionlimit()
+    path = nx.path_graph(length)
+
+    assert list(depth_first_traverse(path, 0)) == list(range(length))
+    assert list(depth_first_post_order(path, 0)) == list(range(length))[::-1]
+    compact = CompactGraph.from_networkx(path)
+    assert sum(1 for _ in depth_first_events(compact, 0, events=ALL_EVENTS)) == 3 * length - 1
+
+def test_should_search_depth_first(roadmap):
+    nodes, graph = roadmap
+    found = depth_first_search(graph, nodes["edinburgh"], lambda city: city.country == "Wales")
+
+    assert found == next(city for city in nx.dfs_preorder_nodes(graph, nodes["edinburgh"]) if city.country == "Wales")
+    assert depth_first_search(graph, nodes["edinburgh"], lambda city: city.country == "Atlantis") is None
@@ -0,0 +1,60 @@
+import gc
+import weakref
+
+import networkx as nx
+
+from dijkstra import dijkstra, shortest_path_tree, clear_shortest_path_trees, all_pairs_dijkstra
+from graphs import by_distance
+
+def nx_weight(node1, node2, weights):
+    return by_distance(weights)
+
+def test_should_match_networkx_distances(random_graphs, path_cost):
+    for graph in random_graphs():
+        for source in graph.nodes:
+            expected = nx.single_source_dijkstra_path_length(graph, source, weight=nx_weight)
+            tree = shortest_path_tree(graph, source, by_distance)
+
+            assert tree.distance == expected
+            for destination, distance in expected.items():
+                assert path_cost(graph, tree.path_to(destination), by_distance) == distance
+                assert path_cost(graph, dijkstra(graph, source, destination, by_distance), by_distance) == distance
+
+def test_should_not_find_unreachable_destinations(roadmap):
+    nodes, graph = roadmap
+
+    assert dijkstra(graph, nodes["london"], nodes["belfast"], by_distance) is None
+    assert shortest_path_tree(graph, nodes["london"], by_distance).path_to(nodes["belfast"]) is None
+
+def test_should_cache_trees_per_graph(random_graphs):
+    graph = random_graphs(count=1)[0]
+    source = next(iter(graph.nodes))
+
+    assert shortest_path_tree(graph, source, by_distance) is shortest_path_tree(graph, source, by_distance)
+
+def test_should_search_again_after_clearing_a_changed_graph():
+    graph = nx.Graph([(0, 1, {"distance": 5}), (1, 2, {"distance": 5})])
+    assert shortest_path_tree(graph, 0, by_distance).cost_to(2) == 10
+
+    graph.add_edge(0, 2, distance=1)
+    clear_shortest_path_trees(graph)
+
+    assert shortest_path_tree(graph, 0, by_distance).cost_to(2) == 1
+
+def test_should_not_keep_graphs_alive():
+    graph = nx.Graph([(0, 1, {"distance": 5})])
+    shortest_path_tree(graph, 0, by_distance)
+    reference = weakref.ref(graph)
+
+    del graph
+    gc.collect()
+
+    assert reference() is None
+
+def test_should_compute_all_pairs(random_graphs):
+    graph = random_graphs(count=1, seed=3)[0]
+    trees = all_pairs_dijkstra(graph, by_distance, max_workers=2)
+
+    assert set(trees) == set(graph.nodes)
+    for source, tree in trees.items():
+        assert tree.distance == nx.single_source_dijkstra_path_length(graph, source, weight=nx_weight)
@@ -0,0 +1,121 @@
+from collections import Counter
+
+import networkx as nx
+import pytest
+
+from conftest import ROADMAP
+from dot import read_graph, parse_dot, parse_edge_list
+
+def parse(text):
+    return list(parse_dot(text.splitlines(keepends=True)))
+
+def test_should_apply_defaults_in_scope():
+    statements = parse("""
+        graph {
+            node [shape=point]
+            edge [color=gray]
+            subgraph wales {
+                node [country=Wales]
+                edge [color=red]
+                cardiff [year=1905]
+                cardiff -- newport
+            }
+            london [country=England]
+            london -- cardiff [distance=150]
+        }
+    """)
+
+    assert statements == [
+        ("node", "cardiff", {"shape": "point", "country": "Wales", "year": "1905"}),
+        ("node", "newport", {"shape": "point", "country": "Wales"}),
+        ("edge", "cardiff", "newport", {"color": "red"}),
+        ("node", "london", {"shape": "point", "country": "England"}),
+        ("edge", "london", "cardiff", {"color": "gray", "distance": "150"}),
+    ]
+
+def test_should_expand_edge_chains():
+    statements = parse("strict graph { a -- b -- c [distance=1]; c -- a }")
+
+    assert statements == [
+        ("node", "a", {}), ("node", "b", {}), ("node", "c", {}),
+        ("edge", "a", "b", {"distance": "1"}),
+        ("edge", "b", "c", {"distance": "1"}),
+        ("edge", "c", "a", {}),
+    ]
+
+def test_should_add_attributes_to_nodes_already_seen():
+    statements = parse("graph { a -- b; b [label=B]; b }")
+
+    assert statements[-1] == ("node", "b", {"label": "B"})
+    assert len(statements) == 4
+
+def test_should_skip_comments():
+    statements = parse("""
+        // a line comment
+        graph G { # a preprocessor style line
+            a /* inline */ -- b /* spanning
+            several lines -- c */ [distance=2] // trailing
+        }
+    """)
+
+    assert statements == [("node", "a", {}), ("node", "b", {}), ("edge", "a", "b", {"distance": "2"})]
+
+def test_should_read_quoted_and_multi_line_strings():
+    statements = parse('''graph {
+        "St Asaph" [xlabel="St \\"Asaph\\"", note="first
+second", joined="one \\
+two", year=-12.5]
+        "St Asaph" -- "St Davids"
+    }''')
+
+    assert statements[0] == (
+        "node", "St Asaph", {"xlabel": 'St "Asaph"', "note": "first\nsecond", "joined": "one two", "year": "-12.5"}
+    )
+    assert statements[-1] == ("edge", "St Asaph", "St Davids", {})
+
+def test_should_ignore_graph_attributes_and_ports():
+    statements = parse("digraph { layout=fdp; graph [bgcolor=white]; a:n -> b:s:w [weight=3] }")
+
+    assert statements == [("node", "a", {}), ("node", "b", {}), ("edge", "a", "b", {"weight": "3"})]
+
+@pytest.mark.parametrize("text", [
+    "graph { a -- b",
+    "graph { a -- }",
+    "graph { a -- {b c} }",
+    "graph { node -- b }",
+    "tree { a }",
+    "graph { a } b",
+    'graph { a [label="unterminated] }',
+    "graph { a ! b }",
+])
+def test_should_reject_invalid_files(text):
+    with pytest.raises(ValueError):
+        parse(text)
+
+def test_should_parse_edge_lists():
+    statements = list(parse_edge_list(["# comment\n", "a b distance=1\n", "\n", "b c distance=2 label=x # c\n"]))
+
+    assert statements == [
+        ("node", "a", {}), ("node", "b", {}), ("edge", "a", "b", {"distance": "1"}),
+        ("node", "c", {}), ("edge", "b", "c", {"distance": "2", "label": "x"}),
+    ]
+    with pytest.raises(ValueError):
+        list(parse_edge_list(["a b distance\n"]))
+
+def test_should_read_the_roadmap_like_pygraphviz():
+    pytest.importorskip("pygraphviz")
+    expected = nx.nx_agraph.read_dot(ROADMAP)
+    nodes, edges = read_graph(ROADMAP)
+
+    # pygraphviz leaves the top level defaults out of each node and edge and keeps them on the graph instead
+    def with_defaults(kind, attributes):
+        return {**{key: value for key, value in expected.graph[kind].items() if value}, **attributes}
+
+    assert list(nodes) == list(expected.nodes)
+    for name, attributes in nodes.items():
+        assert attributes == with_defaults("node", expected.nodes[name])
+    assert Counter((frozenset((name1, name2)), tuple(sorted(attributes.items()))) for name1, name2, attributes in edges) \
+        == Counter(
+            (frozenset((name1, name2)), tuple(sorted(with_defaults("edge", attributes).items())))
+            for name1, name2, attributes in expected.edges(data=True)
+        )
@@ -0,0 +1,85 @@
+from random import Random
+
+import networkx as nx
+
+from dijkstra import shortest_path_tree
+from dynamic_routing import DynamicShortestPaths
+from graphs import breadth_first_traverse, depth_first_traverse, by_distance
+
+def nx_weight(node1, node2, weights):
+    return by_distance(weights)
+
+def by_label(node):
+    return -node # any order_by, so that graphs.py caches the sorted neighbours
+
+def test_should_not_follow_closed_roads_in_ordered_traversals():
+    graph = nx.path_graph(4)
+    routes = DynamicShortestPaths(graph, by_distance)
+    assert list(depth_first_traverse(graph, 0, order_by=by_label)) == [0, 1, 2, 3]
+    assert list(breadth_first_traverse(graph, 0, order_by=by_label)) == [0, 1, 2, 3]
+
+    routes.remove_edge(1, 2)
+
+    assert list(depth_first_traverse(graph, 0, order_by=by_label)) == [0, 1]
+    assert list(breadth_first_traverse(graph, 0, order_by=by_label)) == [0, 1]
+
+def test_should_follow_new_roads_in_ordered_traversals():
+    graph = nx.Graph([(0, 1, {"distance": 1}), (1, 2, {"distance": 1})])
+    routes = DynamicShortestPaths(graph, by_distance)
+    assert list(depth_first_traverse(graph, 0, order_by=by_label)) == [0, 1, 2]
+
+    routes.add_edge(0, 3, distance=1)
+    routes.add_edge(0, 2, distance=5)
+
+    assert list(depth_first_traverse(graph, 0, order_by=by_label)) == [0, 3, 2, 1]
+
+def test_should_refresh_trees_cached_by_dijkstra():
+    graph = nx.Graph([(0, 1, {"distance": 5}), (1, 2, {"distance": 5})])
+    routes = DynamicShortestPaths(graph, by_distance)
+    assert shortest_path_tree(graph, 0, by_distance).cost_to(2) == 10
+
+    routes.add_edge(0, 2, distance=1)
+    assert shortest_path_tree(graph, 0, by_distance).cost_to(2) == 1
+    routes.update_edge(0, 2, distance=20)
+    assert shortest_path_tree(graph, 0, by_distance).cost_to(2) == 10
+    routes.remove_edge(1, 2)
+    assert shortest_path_tree(graph, 0, by_distance).cost_to(2) == 20
+
+def test_should_repair_trees_like_fresh_searches(random_graphs, path_cost):
+    random = Random(0)
+    for graph in random_graphs(count=10, seed=17):
+        routes = DynamicShortestPaths(graph, by_distance)
+        nodes = list(graph.nodes)
+        sources = nodes[:5]
+        trees = {source: routes.tree(source) for source in sources}
+
+        for _ in range(30):
+            before = {source: dict(trees[source].distance) for source in sources}
+            node1, node2 = random.sample(nodes, 2) if len(nodes) > 1 else (nodes[0], nodes[0])
+            if graph.has_edge(node1, node2) and random.random() < 0.5:
+                changed = routes.remove_edge(node1, node2)
+            elif graph.has_edge(node1, node2):
+                changed = routes.update_edge(node1, node2, distance=random.randint(1, 20))
+            else:
+                changed = routes.add_edge(node1, node2, distance=random.randint(1, 20))
+
+            for source in sources:
+                expected = nx.single_source_dijkstra_path_length(graph, source, weight=nx_weight)
+                tree = routes.tree(source)
+                assert tree is trees[source] # repaired in place
+                assert tree.distance == expected
+                for destination, distance in expected.items():
+                    assert path_cost(graph, routes.shortest_path(source, destination), by_distance) == distance
+                if before[source] != expected:
+                    assert source in changed
+
+def test_should_route_around_a_closed_road(roadmap, path_cost):
+    nodes, graph = roadmap
+    graph = graph.copy() # shared by the other tests
+    routes = DynamicShortestPaths(graph, by_distance)
+    london, edinburgh = nodes["london"], nodes["edinburgh"]
+    path = routes.shortest_path(london, edinburgh)
+
+    assert routes.remove_edge(path[1], path[2]) == {london}
+    expected = nx.dijkstra_path_length(graph, london, edinburgh, weight=nx_weight)
+    assert path_cost(graph, routes.shortest_path(london, edinburgh), by_distance) == routes.cost(london, edinburgh) == expected
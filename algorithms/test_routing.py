@@ -0,0 +1,81 @@
+from random import Random
+
+import networkx as nx
+
+from graphs import by_distance, by_hops
+from k_shortest_paths import k_shortest_paths, shortest_simple_paths
+from multi_criteria import pareto_paths
+
+def by_toll(weights):
+    return weights["toll"]
+
+def small_graphs(count=30, seed=0):
+    """Graphs small enough to enumerate every simple path, with a "distance" and a "toll" on each edge"""
+    random = Random(seed)
+    graphs = []
+    for _ in range(count):
+        nodes = random.randint(2, 9)
+        graph = nx.gnm_random_graph(nodes, random.randint(nodes - 1, 2 * nodes), seed=random.randrange(2**32))
+        for _, _, weights in graph.edges(data=True):
+            weights["distance"] = random.randint(1, 10)
+            weights["toll"] = random.randint(0, 5)
+        graphs.append(graph)
+    return graphs
+
+def all_paths(graph, source, destination, weight_factories):
+    """(costs, path) of every simple path, by brute force"""
+    if source == destination:
+        return [((0,) * len(weight_factories), [source])]
+    return [
+        (tuple(sum(weight_factory(graph[node1][node2]) for node1, node2 in zip(path, path[1:])) for weight_factory in weight_factories), path)
+        for path in nx.all_simple_paths(graph, source, destination)
+    ]
+
+def pareto_front(costs):
+    return {
+        cost for cost in costs
+        if not any(other != cost and all(o <= c for o, c in zip(other, cost)) for other in costs)
+    }
+
+def test_should_find_the_k_cheapest_simple_paths(path_cost):
+    for graph in small_graphs():
+        for source in graph.nodes:
+            for destination in graph.nodes:
+                expected = sorted(costs[0] for costs, _ in all_paths(graph, source, destination, [by_distance]))
+                found = list(shortest_simple_paths(graph, source, destination, by_distance))
+
+                assert [cost for cost, _ in found] == expected
+                assert len({tuple(path) for _, path in found}) == len(found)
+                for cost, path in found:
+                    assert path[0] == source and path[-1] == destination and len(set(path)) == len(path)
+                    assert path_cost(graph, path, by_distance) == cost
+                assert k_shortest_paths(graph, source, destination, 3, by_distance) == found[:3]
+
+def test_should_match_networkx_shortest_simple_paths(roadmap, path_cost):
+    nodes, graph = roadmap
+    found = k_shortest_paths(graph, nodes["london"], nodes["edinburgh"], 10, by_distance)
+    expected = nx.shortest_simple_paths(graph, nodes["london"], nodes["edinburgh"], weight=lambda *edge: by_distance(edge[2]))
+
+    assert [cost for cost, _ in found] == [path_cost(graph, path, by_distance) for path, _ in zip(expected, range(10))]
+    assert k_shortest_paths(graph, nodes["london"], nodes["belfast"], 10, by_distance) == []
+
+def test_should_find_the_pareto_front(path_cost):
+    for weight_factories in ((by_distance, by_hops), (by_distance, by_toll), (by_distance, by_toll, by_hops)):
+        for graph in small_graphs(seed=1):
+            for source in graph.nodes:
+                for destination in graph.nodes:
+                    candidates = all_paths(graph, source, destination, weight_factories)
+                    found = pareto_paths(graph, source, destination, weight_factories)
+
+                    assert [costs for costs, _ in found] == sorted(pareto_front([costs for costs, _ in candidates]))
+                    for costs, path in found:
+                        assert path[0] == source and path[-1] == destination and len(set(path)) == len(path)
+                        assert all(path_cost(graph, path, weight_factory) == cost for weight_factory, cost in zip(weight_factories, costs))
+
+def test_should_find_a_single_path_for_a_single_criterion(roadmap, path_cost):
+    nodes, graph = roadmap
+    (costs, path), = pareto_paths(graph, nodes["london"], nodes["inverness"], (by_distance,))
+
+    assert costs == (nx.dijkstra_path_length(graph, nodes["london"], nodes["inverness"], weight=lambda *edge: by_distance(edge[2])),)
+    assert path_cost(graph, path, by_distance) == costs[0]
+    assert pareto_paths(graph, nodes["london"], nodes["belfast"], (by_distance, by_hops)) == []
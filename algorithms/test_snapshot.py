@@ -0,0 +1,134 @@
+import os
+import shutil
+
+import pytest
+
+import snapshot
+from dot import read_graph
+from conftest import ROADMAP
+from graphs import City
+
+GRAPH = """graph {
+    a [label=A]
+    b [label=B]
+    a -- b [distance=5, road=A1]
+    b -- c [distance=7.5]
+}
+"""
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Files the snapshots had to be built from"""
+    parsed = []
+    def tracking_read_graph(filename):
+        parsed.append(filename)
+        return read_graph(filename)
+    monkeypatch.setattr(snapshot, "read_graph", tracking_read_graph)
+    return parsed
+
+@pytest.fixture
+def dot_file(tmp_path):
+    filename = tmp_path / "graph.dot"
+    filename.write_text(GRAPH)
+    return str(filename)
+
+def edges_of(names, graph):
+    return sorted(
+        (names[node1], names[node2], dict(attributes.items())) for node1, node2, attributes in graph.edges(data=True)
+    )
+
+def test_should_load_the_same_graph_as_it_saved(dot_file, parses):
+    built = snapshot.load_or_build(dot_file, dict)
+    loaded = snapshot.load_or_build(dot_file, dict)
+
+    assert parses == [dot_file]
+    for names, graph in (built, loaded):
+        assert names == ["a", "b", "c"]
+        assert list(graph.cities) == [{"label": "A"}, {"label": "B"}, {}]
+        assert edges_of(names, graph) == [
+            ("a", "b", {"distance": 5.0, "road": "A1"}),
+            ("b", "c", {"distance": 7.5}),
+        ]
+        assert [list(graph.neighbors(node)) for node in graph.nodes] == [[1], [0, 2], [1]]
+
+def test_should_load_the_roadmap(roadmap, tmp_path):
+    nodes, graph = roadmap
+    filename = tmp_path / "roadmap.dot"
+    shutil.copy(ROADMAP, filename)
+    snapshot.load_or_build(str(filename), City.from_dict)
+    names, compact = snapshot.load(str(tmp_path / "roadmap.csr"), City.from_dict)
+
+    assert [compact.cities[node] for node in compact.nodes] == [nodes[name] for name in names]
+    assert compact.number_of_edges() == graph.number_of_edges()
+    for node1, node2, attributes in compact.edges(data=True):
+        assert attributes["distance"] == float(graph[compact.cities[node1]][compact.cities[node2]]["distance"])
+
+def test_should_rebuild_after_the_file_changes(dot_file, parses):
+    snapshot.load_or_build(dot_file, dict)
+    stat = os.stat(dot_file)
+    with open(dot_file, "w") as file:
+        file.write(GRAPH.replace("distance=5,", "distance=6,"))
+    os.utime(dot_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1)) # same size, the digest tells them apart
+    names, graph = snapshot.load_or_build(dot_file, dict)
+
+    assert parses == [dot_file, dot_file]
+    assert edges_of(names, graph)[0] == ("a", "b", {"distance": 6.0, "road": "A1"})
+    assert snapshot.load_or_build(dot_file, dict)[0] == names
+    assert len(parses) == 2
+
+def test_should_rebuild_when_the_size_changes(dot_file, parses):
+    snapshot.load_or_build(dot_file, dict)
+    stat = os.stat(dot_file)
+    with open(dot_file, "a") as file:
+        file.write("// one more line\n")
+    os.utime(dot_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    snapshot.load_or_build(dot_file, dict)
+
+    assert parses == [dot_file, dot_file]
+
+def test_should_reuse_the_snapshot_when_only_the_mtime_changed(dot_file, parses, monkeypatch):
+    snapshot.load_or_build(dot_file, dict)
+    stat = os.stat(dot_file)
+    os.utime(dot_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    names, graph = snapshot.load_or_build(dot_file, dict)
+
+    assert parses == [dot_file]
+    assert names == ["a", "b", "c"]
+    # the new mtime was written to the header, so the next load doesn't hash the file again
+    digests = []
+    monkeypatch.setattr(snapshot, "_digest", lambda filename: digests.append(filename))
+    snapshot.load_or_build(dot_file, dict)
+    assert parses == [dot_file] and digests == []
+
+@pytest.mark.parametrize("contents", [b"", b"CSRGRAF", b"not a snapshot" * 20])
+def test_should_rebuild_invalid_snapshots(dot_file, parses, tmp_path, contents):
+    (tmp_path / "graph.csr").write_bytes(contents)
+    names, _ = snapshot.load_or_build(dot_file, dict)
+
+    assert parses == [dot_file] and names == ["a", "b", "c"]
+    assert not os.path.exists(tmp_path / "graph.csr.tmp")
+
+def test_should_still_load_when_the_snapshot_cant_be_written(dot_file, parses, tmp_path, monkeypatch):
+    def read_only(source, destination):
+        raise PermissionError(destination)
+    monkeypatch.setattr(snapshot.os, "replace", read_only)
+    names, graph = snapshot.load_or_build(dot_file, dict)
+
+    assert names == ["a", "b", "c"] and graph.number_of_edges() == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["graph.dot"] # no snapshot, nor temporary file
+    snapshot.load_or_build(dot_file, dict)
+    assert parses == [dot_file, dot_file]
+
+def test_should_reuse_a_snapshot_whose_header_cant_be_updated(dot_file, parses, monkeypatch):
+    snapshot.load_or_build(dot_file, dict)
+    stat = os.stat(dot_file)
+    os.utime(dot_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    real_open = open
+    def read_only_open(path, mode="r", *args, **kwargs):
+        if "+" in mode or "w" in mode:
+            raise PermissionError(path)
+        return real_open(path, mode, *args, **kwargs)
+    monkeypatch.setattr(snapshot, "open", read_only_open, raising=False)
+
+    assert snapshot.load_or_build(dot_file, dict)[0] == ["a", "b", "c"]
+    assert parses == [dot_file]
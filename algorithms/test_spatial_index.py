@@ -0,0 +1,71 @@
+from random import Random
+from typing import NamedTuple
+
+import pytest
+
+from graphs import great_circle
+from spatial_index import SpatialIndex, LEAF_SIZE
+
+class Point(NamedTuple):
+    latitude: float
+    longitude: float
+
+def random_points(count, seed=0):
+    random = Random(seed)
+    return [Point(random.uniform(-90, 90), random.uniform(-180, 180)) for _ in range(count)]
+
+def linear_scan(items, latitude, longitude):
+    here = Point(latitude, longitude)
+    return sorted((great_circle(here, item), item) for item in items)
+
+def assert_same(found, expected):
+    assert [item for _, item in found] == [item for _, item in expected]
+    assert [distance for distance, _ in found] == pytest.approx([distance for distance, _ in expected], abs=1e-6)
+
+# around the poles, across the 180th meridian and anywhere else
+QUERIES = [(89.9, 10), (-89.5, -170), (0, 179.9), (10, -179.9), *random_points(50, seed=1)]
+
+@pytest.mark.parametrize("size", [0, 1, LEAF_SIZE, LEAF_SIZE + 1, 500])
+def test_should_find_the_nearest_like_a_linear_scan(size):
+    items = random_points(size)
+    index = SpatialIndex(items)
+
+    assert len(index) == size
+    for latitude, longitude in QUERIES:
+        expected = linear_scan(items, latitude, longitude)
+        assert_same(index.nearest(latitude, longitude), expected[:1])
+        for k in (3, 20, size + 5):
+            assert_same(index.nearest(latitude, longitude, k), expected[:k])
+    assert index.nearest(0, 0, k=0) == []
+
+@pytest.mark.parametrize("radius", [0, 100, 1500, 20000])
+def test_should_find_everything_within_a_radius_like_a_linear_scan(radius):
+    items = random_points(500, seed=2)
+    index = SpatialIndex(items)
+
+    for latitude, longitude in QUERIES:
+        expected = [(distance, item) for distance, item in linear_scan(items, latitude, longitude) if distance <= radius]
+        assert_same(index.within(latitude, longitude, radius), expected)
+
+def test_should_query_many_positions():
+    items = random_points(100, seed=3)
+    index = SpatialIndex(items)
+    positions = [(latitude, longitude) for latitude, longitude in QUERIES[:10]]
+
+    assert index.nearest_many(positions, k=2) == [index.nearest(*position, k=2) for position in positions]
+    assert index.within_many(positions, 1000) == [index.within(*position, 1000) for position in positions]
+
+def test_should_find_cities_on_the_roadmap(roadmap):
+    nodes, _ = roadmap
+    index = SpatialIndex.from_nodes(nodes)
+
+    for city in nodes.values():
+        distance, nearest = index.nearest(city.latitude, city.longitude)[0]
+        assert distance == pytest.approx(0, abs=1e-6) and (nearest.latitude, nearest.longitude) == (city.latitude, city.longitude)
+        assert_same(index.nearest(city.latitude, city.longitude, 5), linear_scan(nodes.values(), city.latitude, city.longitude)[:5])
+
+def test_should_use_a_custom_position():
+    items = [("a", 0.0, 0.0), ("b", 0.0, 1.0), ("c", 50.0, 50.0)]
+    index = SpatialIndex(items, position=lambda item: item[1:])
+
+    assert [item[0] for _, item in index.nearest(0.1, 0.9, k=2)] == ["b", "a"]
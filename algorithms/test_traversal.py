@@ -0,0 +1,78 @@
+import networkx as nx
+
+from compact_graph import CompactGraph
+from graphs import (
+    breadth_first_traverse, breadth_first_levels, breadth_first_search, shortest_path, is_connected, by_latitude,
+)
+
+def test_should_find_the_same_levels_as_networkx(random_graphs):
+    for graph in random_graphs(seed=6):
+        for source in graph.nodes:
+            expected = nx.single_source_shortest_path_length(graph, source)
+            levels = list(breadth_first_levels(graph, source))
+
+            assert all(levels)
+            assert {node: hops for hops, level in enumerate(levels) for node in level} == expected
+            assert sum(map(len, levels)) == len(expected) # no node twice
+
+def test_should_traverse_level_by_level(random_graphs):
+    for graph in random_graphs(seed=7):
+        for source in graph.nodes:
+            order = list(breadth_first_traverse(graph, source))
+            expected = nx.single_source_shortest_path_length(graph, source)
+
+            assert order[0] == source and sorted(order) == sorted(expected)
+            assert [expected[node] for node in order] == sorted(expected[node] for node in order)
+            assert order == [node for level in breadth_first_levels(graph, source) for node in level]
+            assert order == [source, *(node for _, node in nx.bfs_edges(graph, source))]
+
+def reference_levels(graph, source, order_by):
+    levels, visited = [[source]], {source}
+    while levels[-1]:
+        levels.append([])
+        for node in levels[-2]:
+            for neighbor in sorted(graph.neighbors(node), key=order_by):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    levels[-1].append(neighbor)
+    return levels[:-1]
+
+def test_should_visit_neighbors_in_order(roadmap):
+    nodes, graph = roadmap
+    expected = reference_levels(graph, nodes["edinburgh"], by_latitude)
+
+    assert list(breadth_first_levels(graph, nodes["edinburgh"], order_by=by_latitude)) == expected
+    assert list(breadth_first_traverse(graph, nodes["edinburgh"], order_by=by_latitude)) \
+        == [city for level in expected for city in level]
+
+def test_should_match_on_a_compact_graph(random_graphs):
+    for graph in random_graphs(seed=8):
+        compact = CompactGraph.from_networkx(graph)
+        for node in compact.nodes:
+            assert [[compact.cities[other] for other in level] for level in breadth_first_levels(compact, node)] \
+                == list(breadth_first_levels(graph, compact.cities[node]))
+
+def test_should_find_shortest_paths_in_hops(random_graphs):
+    for graph in random_graphs(seed=9):
+        for source in list(graph.nodes)[:5]:
+            expected = nx.single_source_shortest_path_length(graph, source)
+            for destination in graph.nodes:
+                if destination == source:
+                    continue
+                path = shortest_path(graph, source, destination)
+                assert is_connected(graph, source, destination) == (destination in expected)
+                if destination in expected:
+                    assert path[0] == source and path[-1] == destination
+                    assert len(path) - 1 == expected[destination]
+                    assert all(graph.has_edge(node1, node2) for node1, node2 in zip(path, path[1:]))
+                else:
+                    assert path is None
+
+def test_should_search_breadth_first(roadmap):
+    nodes, graph = roadmap
+    found = breadth_first_search(graph, nodes["edinburgh"], lambda city: city.country == "England")
+    hops = nx.single_source_shortest_path_length(graph, nodes["edinburgh"])
+
+    assert found.country == "England"
+    assert hops[found] == min(hops[city] for city in hops if city.country == "England")
+    assert breadth_first_search(graph, nodes["edinburgh"], lambda city: city.country == "Atlantis") is None
@@ -0,0 +1,113 @@
+from array import array
+
+NIL = -1 # link to no element
+
+class ArrayLinkedList():
+    """
+    Doubly linked list whose links are integer indices into arrays rather than references between node objects:
+    the element in slot i is values[i] and its neighbours are in slots next[i] and prev[i].
+    * 24 bytes per element (one reference and two 8-byte links) and no object per element
+    * slots emptied by unlink are chained through next into a free list and reused before the arrays grow
+    * the slot an element was added to is its handle for insert_before, insert_after, unlink and value,
+      valid until that element is unlinked
+    """
+    def __init__(self, items=None):
+        self.values = []
+        self.next = array("q")
+        self.prev = array("q")
+        self.head = NIL
+        self.tail = NIL
+        self.size = 0
+        self._free = NIL # first slot of the free list
+
+        for item in items or ():
+            self.add_last(item)
+
+    def __iter__(self):
+        values, next_slots = self.values, self.next
+        slot = self.head
+        while slot != NIL:
+            yield values[slot]
+            slot = next_slots[slot]
+
+    def __repr__(self):
+        return " <-> ".join([*map(str, self), "None"])
+
+    def __len__(self):
+        return self.size
+
+    def handles(self):
+        """Slots of the elements from first to last"""
+        slot = self.head
+        while slot != NIL:
+            yield slot
+            slot = self.next[slot]
+
+    def value(self, handle):
+        return self.values[handle]
+
+    def add_first(self, data):
+        return self._link(data, NIL, self.head)
+
+    def add_last(self, data):
+        return self._link(data, self.tail, NIL)
+
+    def insert_before(self, handle, data):
+        return self._link(data, self.prev[handle], handle)
+
+    def insert_after(self, handle, data):
+        return self._link(data, handle, self.next[handle])
+
+    def unlink(self, handle):
+        """Take the element out of the list and return it, its slot goes to the free list"""
+        prev_slot, next_slot = self.prev[handle], self.next[handle]
+        if prev_slot == NIL:
+            self.head = next_slot
+        else:
+            self.next[prev_slot] = next_slot
+        if next_slot == NIL:
+            self.tail = prev_slot
+        else:
+            self.prev[next_slot] = prev_slot
+
+        data = self.values[handle]
+        self.values[handle] = None # don't keep the element alive
+        self.next[handle] = self._free
+        self._free = handle
+        self.size -= 1
+        return data
+
+    def pop_first(self):
+        if self.head == NIL:
+            raise Exception("Cannot pop from an empty list")
+        return self.unlink(self.head)
+
+    def pop_last(self):
+        if self.tail == NIL:
+            raise Exception("Cannot pop from an empty list")
+        return self.unlink(self.tail)
+
+    def _link(self, data, prev_slot, next_slot):
+        """Put data between two adjacent slots of the list, NIL standing for either end, and return its slot"""
+        slot = self._free
+        if slot == NIL:
+            slot = len(self.values)
+            self.values.append(data)
+            self.next.append(next_slot)
+            self.prev.append(prev_slot)
+        else:
+            self._free = self.next[slot]
+            self.values[slot] = data
+            self.next[slot] = next_slot
+            self.prev[slot] = prev_slot
+
+        if prev_slot == NIL:
+            self.head = slot
+        else:
+            self.next[prev_slot] = slot
+        if next_slot == NIL:
+            self.tail = slot
+        else:
+            self.prev[next_slot] = slot
+        self.size += 1
+        return slot
@@ -0,0 +1,190 @@
+"""
+Benchmarks for MyHashTable and its variants.
+Run from the repository root: python -m data_structures.benchmark_hashtable
+"""
+
+from string import printable
+from time import perf_counter
+from statistics import mean
+from random import Random
+from threading import Thread, Lock
+import tracemalloc
+
+from .hashtable import (
+    MyHashTable, RobinHoodHashTable, CompactHashTable,
+    linear_probing, quadratic_probing, double_hashing,
+)
+from .concurrent_hashtable import ConcurrentHashTable
+from .hash_distribution import distribute
+
+STRATEGIES = {
+    "linear": lambda: MyHashTable(probing=linear_probing),
+    "quadratic": lambda: MyHashTable(probing=quadratic_probing),
+    "double hashing": lambda: MyHashTable(probing=double_hashing),
+    "robin hood": lambda: RobinHoodHashTable(),
+    "compact": lambda: CompactHashTable(),
+}
+
+STORAGE = {
+    "MyHashTable": MyHashTable,
+    "CompactHashTable": CompactHashTable,
+    "dict": dict,
+}
+
+def key_distributions(size):
+    return {
+        "printable characters": list(printable),
+        "sequential integers": list(range(size)),
+        "strided integers": [i * 64 for i in range(size)],
+        "shared-prefix strings": [f"customer:{i:08}" for i in range(size)],
+    }
+
+def probe_lengths(table, keys):
+    """Number of slots visited to find each key"""
+    lengths = []
+    for key in keys:
+        for probes, (_, pair) in enumerate(table._probe(key), start=1):
+            if pair is not None and pair.key == key:
+                lengths.append(probes)
+                break
+    return lengths
+
+def bucket_spread(keys, capacity):
+    """Largest number of keys sharing a home slot, as modelled by hash_distribution.distribute"""
+    return max(distribute(keys, num_containers=capacity).values())
+
+def benchmark_probing(size=50_000):
+    print(f"{'keys':22} {'strategy':15} {'mean probe':>10} {'max probe':>10} {'max bucket':>11} {'inserts/s':>12} {'lookups/s':>12}")
+    for distribution, keys in key_distributions(size).items():
+        for strategy, factory in STRATEGIES.items():
+            table = factory()
+
+            start = perf_counter()
+            for key in keys:
+                table[key] = key
+            insert_time = perf_counter() - start
+
+            start = perf_counter()
+            for key in keys:
+                table[key]
+            lookup_time = perf_counter() - start
+
+            lengths = probe_lengths(table, keys)
+            print(
+                f"{distribution:22} {strategy:15} {mean(lengths):10.2f} {max(lengths):10} "
+                f"{bucket_spread(keys, table.capacity):11} "
+                f"{len(keys) / insert_time:12,.0f} {len(keys) / lookup_time:12,.0f}"
+            )
+        print()
+
+def memory_report(size=100_000):
+    """
+    Bytes allocated per entry by each storage layout, not counting the keys and values themselves
+    which are created before tracing starts and shared by every table.
+    """
+    keys = [f"customer:{i:08}" for i in range(size)]
+    print(f"{'storage':18} {'bytes/entry':>12}")
+    for name, factory in STORAGE.items():
+        tracemalloc.start()
+        table = factory()
+        for key in keys:
+            table[key] = key
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:18} {allocated / size:12.1f}")
+        del table
+
+def benchmark_bulk(size=1_000_000):
+    """Loading and reading back size pairs one key at a time versus through the batched APIs"""
+    pairs = [(f"customer:{i:08}", i) for i in range(size)]
+    keys = [key for key, _ in pairs]
+
+    def per_key():
+        table = MyHashTable()
+        for key, value in pairs:
+            table[key] = value
+        return table
+
+    def set_many():
+        table = MyHashTable()
+        table.set_many(pairs)
+        return table
+
+    loaders = {
+        "MyHashTable per key": per_key,
+        "MyHashTable.set_many": set_many,
+        "MyHashTable.from_items": lambda: MyHashTable.from_items(pairs),
+        "dict": lambda: dict(pairs),
+    }
+    table = MyHashTable.from_items(pairs)
+    builtin = dict(pairs)
+    readers = {
+        "MyHashTable per key": lambda: [table.get(key) for key in keys],
+        "MyHashTable.get_many": lambda: table.get_many(keys),
+        "dict": lambda: [builtin.get(key) for key in keys],
+    }
+
+    print(f"{'load':24} {'pairs/s':>12}")
+    for name, load in loaders.items():
+        start = perf_counter()
+        load()
+        print(f"{name:24} {size / (perf_counter() - start):12,.0f}")
+
+    print(f"{'read':24} {'lookups/s':>12}")
+    for name, read in readers.items():
+        start = perf_counter()
+        read()
+        print(f"{name:24} {size / (perf_counter() - start):12,.0f}")
+
+class SingleLockHashTable:
+    """Baseline for benchmark_concurrency: one MyHashTable behind one lock for reads and writes alike"""
+    def __init__(self):
+        self._table = MyHashTable(capacity=64)
+        self._lock = Lock()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._table[key] = value
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._table.get(key, default)
+
+def benchmark_concurrency(operations_per_thread=50_000, key_space=100_000):
+    """
+    Throughput of threads sharing one table while varying the thread count and the share of reads.
+    Note that CPython's GIL serializes the bytecode itself, so this mostly measures lock overhead and contention.
+    """
+    tables = {"single lock": SingleLockHashTable, "striped": ConcurrentHashTable}
+
+    def work(table, seed, read_ratio):
+        random = Random(seed)
+        for _ in range(operations_per_thread):
+            key = random.randrange(key_space)
+            if random.random() < read_ratio:
+                table.get(key)
+            else:
+                table[key] = key
+
+    print(f"{'table':12} {'threads':>7} {'reads':>6} {'ops/s':>12}")
+    for name, factory in tables.items():
+        for thread_count in (1, 2, 4, 8):
+            for read_ratio in (0.5, 0.9, 0.99):
+                table = factory()
+                threads = [Thread(target=work, args=(table, seed, read_ratio)) for seed in range(thread_count)]
+                start = perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = perf_counter() - start
+                print(f"{name:12} {thread_count:7} {read_ratio:6.0%} {thread_count * operations_per_thread / elapsed:12,.0f}")
+
+def main():
+    benchmark_probing()
+    memory_report()
+    benchmark_bulk()
+    benchmark_concurrency()
+
+if __name__ == "__main__":
+    main()
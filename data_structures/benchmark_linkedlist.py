@@ -0,0 +1,104 @@
+"""
+Memory footprint and throughput of the linked lists next to collections.deque and list, used as FIFO queues.
+Run from the repository root: python -m data_structures.benchmark_linkedlist [number of elements, 10**7 by default]
+"""
+
+from collections import deque
+from time import perf_counter
+import gc
+import sys
+import tracemalloc
+
+from .linkedlist import MyLinkedList, Node, NodePool
+from .doubly_linkedlist import MyDoublyLinkedList, Node as DoublyNode
+from .array_linkedlist import ArrayLinkedList
+from .unrolled_linkedlist import UnrolledLinkedList
+
+class DictNode():
+    """Doubly linked node as it was before __slots__, with a __dict__ per instance"""
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+        self.prev = None
+
+def queues():
+    """Name -> (new empty queue, push at the back, pop from the front)"""
+    pool = NodePool(DoublyNode, max_size=sys.maxsize)
+    return {
+        # list pops from the back: pop(0) moves every element and would never finish at this size
+        "list (as a stack)": (list, list.append, list.pop),
+        "deque": (deque, deque.append, deque.popleft),
+        "MyLinkedList": (MyLinkedList, lambda queue, item: queue.add_last(Node(item)), MyLinkedList.pop_first),
+        "MyDoublyLinkedList, dict nodes": (
+            MyDoublyLinkedList, lambda queue, item: queue.add_last(DictNode(item)), MyDoublyLinkedList.pop_first,
+        ),
+        "MyDoublyLinkedList": (
+            MyDoublyLinkedList, lambda queue, item: queue.add_last(DoublyNode(item)), MyDoublyLinkedList.pop_first,
+        ),
+        "MyDoublyLinkedList + NodePool": (
+            MyDoublyLinkedList,
+            lambda queue, item: queue.add_last(pool.acquire(item)),
+            lambda queue: pool.release(queue.pop_first()),
+        ),
+        "ArrayLinkedList": (ArrayLinkedList, ArrayLinkedList.add_last, ArrayLinkedList.pop_first),
+        "UnrolledLinkedList": (UnrolledLinkedList, UnrolledLinkedList.append, lambda queue: queue.pop(0)),
+    }
+
+def memory_report(size):
+    """Bytes allocated per element by each structure, not counting the element itself which they all share"""
+    item = object()
+    print(f"{'structure':32} {'bytes/element':>14}")
+    for name, (new, push, _) in queues().items():
+        gc.collect()
+        tracemalloc.start()
+        queue = new()
+        for _ in range(size):
+            push(queue, item)
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:32} {allocated / size:14.1f}")
+        del queue
+
+def benchmark_throughput(size):
+    """
+    Operations per second to fill a queue with size elements, cycle them all through it once
+    (pop from the front and push at the back, where a NodePool hands the popped nodes out again),
+    iterate over it and drain it.
+    """
+    print(f"{'structure':32} {'push/s':>12} {'cycle/s':>12} {'iterate/s':>12} {'pop/s':>12}")
+    for name, (new, push, pop) in queues().items():
+        gc.collect()
+        gc.disable() # nodes hold no cycles, don't time the collector walking millions of them
+        queue = new()
+
+        start = perf_counter()
+        for item in range(size):
+            push(queue, item)
+        fill = perf_counter() - start
+
+        start = perf_counter()
+        for item in range(size):
+            pop(queue)
+            push(queue, item)
+        cycle = perf_counter() - start
+
+        start = perf_counter()
+        for _ in queue:
+            pass
+        iterate = perf_counter() - start
+
+        start = perf_counter()
+        for _ in range(size):
+            pop(queue)
+        drain = perf_counter() - start
+
+        gc.enable()
+        print(f"{name:32} {size / fill:12,.0f} {size / cycle:12,.0f} {size / iterate:12,.0f} {size / drain:12,.0f}")
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10**7
+    memory_report(size)
+    benchmark_throughput(size)
+
+if __name__ == "__main__":
+    main()
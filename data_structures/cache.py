@@ -0,0 +1,273 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+from functools import wraps
+from time import monotonic
+import sys
+
+from .hashtable import MyHashTable
+from .doubly_linkedlist import MyDoublyLinkedList, Node
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int # entries dropped to make room
+    expirations: int # entries dropped because they outlived their time to live
+    entries: int
+    bytes: int
+
+class _Entry(Node):
+    """Node of a cache's eviction order, its data is the key"""
+    __slots__ = ("value", "size", "frequency", "expires")
+
+    def __init__(self, key, value, size):
+        super().__init__(key)
+        self.value = value
+        self.size = size
+        self.frequency = None # LFUCache: the _Frequency node holding this entry
+        self.expires = None # TTLCache: clock reading after which the entry is stale
+
+class Cache(ABC):
+    """
+    Mapping of a bounded size that drops entries by some eviction policy once it is full.
+    Keys are looked up in a MyHashTable of nodes that also belong to the policy's linked lists,
+    so lookups, insertions and evictions are all O(1).
+    * bounded by number of entries (max_entries) and/or total size (max_bytes), None meaning unbounded
+    * sizes are measured by sizeof(value), sys.getsizeof by default, which doesn't count what the value refers to
+    * values larger than max_bytes on their own are never stored
+    * hits, misses, evictions and expirations are counted, see info()
+    Subclasses decide the eviction order through the _added, _touched, _removed and _victim hooks.
+    """
+    def __init__(self, max_entries=128, max_bytes=None, sizeof=sys.getsizeof):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("Cache size must be a positive integer value")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("Cache byte size must be a positive integer value")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = MyHashTable()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Whether key is cached, without counting a hit or a miss nor refreshing the entry"""
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def __getitem__(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry):
+            self._discard(entry)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        self._touched(entry)
+        return entry.value
+
+    def __setitem__(self, key, value):
+        """Store value under key, evicting as many entries as needed to stay within bounds"""
+        old_entry = self._entries.get(key)
+        if old_entry is not None:
+            self._discard(old_entry) # the entry starts afresh
+
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self.expire()
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) >= self.max_entries)
+            or (self.max_bytes is not None and self.bytes + size > self.max_bytes)
+        ):
+            self._discard(self._victim())
+            self.evictions += 1
+
+        entry = _Entry(key, value, size)
+        self._entries[key] = entry
+        self.bytes += size
+        self._added(entry)
+
+    def __delitem__(self, key):
+        self._discard(self._entries[key])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self):
+        """Drop every entry, the counters keep running"""
+        while self._entries:
+            self._discard(self._victim())
+
+    def expire(self):
+        """Drop the entries that outlived their time to live, if the policy has one"""
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.expirations, len(self._entries), self.bytes)
+
+    def _discard(self, entry):
+        del self._entries[entry.data]
+        self.bytes -= entry.size
+        self._removed(entry)
+
+    def _expired(self, entry):
+        return False
+
+    @abstractmethod
+    def _added(self, entry):
+        pass
+
+    @abstractmethod
+    def _touched(self, entry):
+        pass
+
+    @abstractmethod
+    def _removed(self, entry):
+        pass
+
+    @abstractmethod
+    def _victim(self):
+        pass
+
+class LRUCache(Cache):
+    """Evicts the least recently used entry, entries are kept in a list from least to most recently used"""
+    def __init__(self, max_entries=128, max_bytes=None, sizeof=sys.getsizeof):
+        super().__init__(max_entries, max_bytes, sizeof)
+        self._order = MyDoublyLinkedList()
+
+    def _added(self, entry):
+        self._order.add_last(entry)
+
+    def _touched(self, entry):
+        self._order.move_to_end(entry)
+
+    def _removed(self, entry):
+        self._order.unlink(entry)
+
+    def _victim(self):
+        return self._order.head
+
+class _Frequency(Node):
+    """Node of LFUCache's list of use counts, its data is the count"""
+    __slots__ = ("entries",)
+
+    def __init__(self, count):
+        super().__init__(count)
+        self.entries = MyDoublyLinkedList() # from least to most recently used
+
+class LFUCache(Cache):
+    """
+    Evicts the least frequently used entry, the least recently used one among those used as often.
+    Every use count in the cache has a node in a list of increasing counts, each holding the list of its entries,
+    so that a hit only moves its entry to the next count's list and eviction takes from the first list: O(1).
+    """
+    def __init__(self, max_entries=128, max_bytes=None, sizeof=sys.getsizeof):
+        super().__init__(max_entries, max_bytes, sizeof)
+        self._frequencies = MyDoublyLinkedList()
+
+    def frequency(self, key):
+        """Number of times key was stored or found since it was stored"""
+        return self._entries[key].frequency.data
+
+    def _added(self, entry):
+        first = self._frequencies.head
+        if first is None or first.data != 1:
+            first = _Frequency(1)
+            self._frequencies.add_first(first)
+        first.entries.add_last(entry)
+        entry.frequency = first
+
+    def _touched(self, entry):
+        current = entry.frequency
+        following = current.next
+        if following is None or following.data != current.data + 1:
+            following = _Frequency(current.data + 1)
+            self._frequencies.insert_after(current, following)
+        self._removed(entry)
+        following.entries.add_last(entry)
+        entry.frequency = following
+
+    def _removed(self, entry):
+        current = entry.frequency
+        current.entries.unlink(entry)
+        if not current.entries:
+            self._frequencies.unlink(current)
+
+    def _victim(self):
+        return self._frequencies.head.entries.head
+
+class TTLCache(Cache):
+    """
+    Entries go stale ttl seconds after they were stored and are never returned after that.
+    Entries are kept in the order they expire, so stale ones are dropped from the front of the list
+    whenever something is stored, and when the cache is full the entry closest to expiring gets evicted.
+    clock returns the current time in seconds, time.monotonic by default.
+    """
+    def __init__(self, ttl, max_entries=128, max_bytes=None, sizeof=sys.getsizeof, clock=monotonic):
+        if ttl <= 0:
+            raise ValueError("Time to live must be a positive number of seconds")
+        super().__init__(max_entries, max_bytes, sizeof)
+        self.ttl = ttl
+        self._clock = clock
+        self._order = MyDoublyLinkedList()
+
+    def expire(self):
+        now = self._clock()
+        while self._order.head is not None and self._order.head.expires <= now:
+            self._discard(self._order.head)
+            self.expirations += 1
+
+    def _expired(self, entry):
+        return entry.expires <= self._clock()
+
+    def _added(self, entry):
+        entry.expires = self._clock() + self.ttl
+        self._order.add_last(entry)
+
+    def _touched(self, entry):
+        pass # a hit doesn't extend the entry's life
+
+    def _removed(self, entry):
+        self._order.unlink(entry)
+
+    def _victim(self):
+        return self._order.head
+
+def memoize(cache, key=None):
+    """
+    Decorator caching a function's results in cache, e.g. to answer repeated route queries:
+
+        dijkstra = memoize(LRUCache(1024))(dijkstra)
+        shortest_path = memoize(TTLCache(ttl=60))(shortest_path)
+
+    Results are cached by the function's arguments, which must be hashable, or by key(*args, **kwargs) when given.
+    Graphs are hashed by identity, so call the wrapper's cache_clear() after changing one.
+    The wrapper also exposes cache and cache_info().
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key is not None else (args, tuple(sorted(kwargs.items())))
+            try:
+                return cache[cache_key]
+            except KeyError:
+                pass
+            result = function(*args, **kwargs)
+            cache[cache_key] = result
+            return result
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
@@ -0,0 +1,114 @@
+import threading
+
+from .hashtable import (
+    MyHashTable, DELETED, KeysTableView, ValuesTableView, PairsTableView,
+)
+
+class ConcurrentHashTable:
+    """
+    Hash table that can be shared between threads, split into segments of MyHashTable (lock striping):
+    * writers only lock the segment their key belongs to, so writers on different segments never wait on each other
+    * readers take no lock at all and probe a snapshot of the segment's slots
+    * every segment resizes on its own and publishes its new slots with a single assignment,
+      so a resize only holds up the writers of one segment and never the readers
+    """
+    def __init__(self, capacity=64, concurrency_level=16, load_factor_threshold=0.6):
+        if concurrency_level < 1:
+            raise ValueError("Concurrency level must be a positive integer value")
+        self._segment_bits = (concurrency_level - 1).bit_length() # round up to a power of two
+        segment_count = 1 << self._segment_bits
+        self._segments = [
+            MyHashTable(max(capacity // segment_count, 1), load_factor_threshold)
+            for _ in range(segment_count)
+        ]
+        self._locks = [threading.Lock() for _ in range(segment_count)]
+
+    def __len__(self):
+        return sum(len(segment) for segment in self._segments)
+
+    def __str__(self):
+        return "{" + ", ".join(f"{key!r}: {value!r}" for key, value in self._iter_pairs()) + "}"
+
+    def __contains__(self, key):
+        return self._lookup(key) is not None
+
+    def __iter__(self):
+        for pair in self._iter_pairs():
+            yield pair.key
+
+    def __setitem__(self, key, value):
+        segment = self._segment_index(hash(key))
+        with self._locks[segment]:
+            self._segments[segment][key] = value
+
+    def __getitem__(self, key):
+        pair = self._lookup(key)
+        if pair is None:
+            raise KeyError(key)
+        return pair.value
+
+    def __delitem__(self, key):
+        segment = self._segment_index(hash(key))
+        with self._locks[segment]:
+            del self._segments[segment][key]
+
+    def get(self, key, default=None):
+        pair = self._lookup(key)
+        return default if pair is None else pair.value
+
+    def set(self, key, value):
+        self[key] = value
+
+    def setdefault(self, key, default=None):
+        """Return the value for key, inserting default first if it's missing, as a single atomic step"""
+        segment = self._segment_index(hash(key))
+        with self._locks[segment]:
+            table = self._segments[segment]
+            try:
+                return table[key]
+            except KeyError:
+                table[key] = default
+                return default
+
+    @property
+    def pairs(self):
+        return PairsTableView(self)
+
+    @property
+    def keys(self):
+        return KeysTableView(self)
+
+    @property
+    def values(self):
+        return ValuesTableView(self)
+
+    def _segment_index(self, hash_code):
+        """
+        Pick the segment from the top bits of a Fibonacci hash so that it doesn't correlate
+        with the slot each segment picks from the low bits of the same hash code
+        """
+        return ((hash_code * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self._segment_bits) \
+            if self._segment_bits else 0
+
+    def _lookup(self, key):
+        """
+        Lock-free read of the pair stored under key, or None.
+        Writers only ever swap a single slot reference, and resizes publish a fully built list of slots,
+        so probing a snapshot of the slots always sees a consistent table.
+        """
+        hash_code = hash(key)
+        segment = self._segments[self._segment_index(hash_code)]
+        slots = segment._slots
+        for index in segment._probing(hash_code, len(slots)):
+            pair = slots[index]
+            if pair is None:
+                return None
+            if pair is not DELETED and pair.key == key:
+                return pair
+        return None
+
+    def _iter_pairs(self):
+        for segment in self._segments:
+            for pair in segment._slots:
+                if pair is not None and pair is not DELETED:
+                    yield pair
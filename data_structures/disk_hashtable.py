@@ -0,0 +1,246 @@
+import mmap
+import os
+import pickle
+from hashlib import blake2b
+from struct import Struct
+
+from .hashtable import Pair, KeysTableView, ValuesTableView, PairsTableView, linear_probing
+
+MAGIC = b"MYHTBL01"
+HEADER = Struct("<8sQQQ") # magic, capacity, length, tombstones
+SLOT = Struct("<QQ") # hash of the key, offset of its record in the heap file + 1
+RECORD = Struct("<II") # length of the key, length of the value
+
+# markers stored in place of a record offset
+FREE = 0
+DELETED = 2 ** 64 - 1
+
+class DiskHashTable:
+    """
+    Hash table stored on disk that can grow bigger than the available memory:
+    * fixed-width slots live in a memory-mapped file and are probed the same way as MyHashTable's slots
+    * keys and pickled values are appended to a separate heap file, next to the slots file
+    * reopening an existing table only maps the slots file, nothing gets rehashed
+    * a lookup touches the pages of the slots it probes and reads a single record from the heap
+    Keys must be str or bytes because they're hashed with a hash function that's stable across processes.
+    """
+    def __init__(self, path, capacity=1024, load_factor_threshold=0.6, probing=linear_probing):
+        if capacity < 1:
+            raise ValueError("Hash table capacity must be a positive integer value")
+        if not (0 < load_factor_threshold < 1):
+            raise ValueError("Load factor threshold must be a number between 0 and 1")
+        self._path = os.fspath(path)
+        self._load_factor_threshold = load_factor_threshold
+        self._probing = probing
+
+        if not os.path.exists(self._path):
+            _create_slots_file(self._path, capacity)
+        self._slots_file = open(self._path, "r+b")
+        try:
+            # an empty file can't be mapped and a short one has no header to read
+            if os.fstat(self._slots_file.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{self._path} is not a hash table file")
+            self._slots = mmap.mmap(self._slots_file.fileno(), 0)
+            magic, self._capacity, self._length, self._tombstones = HEADER.unpack_from(self._slots)
+            # a truncated or extended table would send probes past the end of the map
+            if magic != MAGIC or len(self._slots) != HEADER.size + self._capacity * SLOT.size:
+                self._slots.close()
+                raise ValueError(f"{self._path} is not a hash table file")
+        except Exception:
+            self._slots_file.close()
+            raise
+
+        heap_path = self._path + ".heap"
+        if not os.path.exists(heap_path):
+            open(heap_path, "wb").close()
+        self._heap = open(heap_path, "r+b")
+        self._heap_size = self._heap.seek(0, os.SEEK_END)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        return "{" + ", ".join(f"{key!r}: {value!r}" for key, value in self._iter_pairs()) + "}"
+
+    def __contains__(self, key):
+        return self._find(_encode(key))[1] is not None
+
+    def __iter__(self):
+        for pair in self._iter_pairs():
+            yield pair.key
+
+    def __setitem__(self, key, value):
+        encoded_key = _encode(key)
+        hash_code = _stable_hash(encoded_key)
+        index, offset = self._find(encoded_key)
+        if offset is not None: # overwriting never needs a new slot, the old record stays behind in the heap file
+            SLOT.pack_into(self._slots, _position(index), hash_code, self._append(encoded_key, value))
+            return
+        if (self._length + self._tombstones + 1) / self._capacity > self._load_factor_threshold:
+            self._resize_and_rehash(self._capacity * 2)
+
+        first_tombstone = None
+        for index in self._probing(hash_code, self._capacity):
+            _, offset = SLOT.unpack_from(self._slots, _position(index))
+            if offset == DELETED:
+                if first_tombstone is None:
+                    first_tombstone = index
+                continue
+            if offset == FREE:
+                if first_tombstone is not None:
+                    index = first_tombstone
+                    self._tombstones -= 1
+                self._length += 1
+                break
+        else:
+            raise MemoryError("Not enough capacity")
+
+        SLOT.pack_into(self._slots, _position(index), hash_code, self._append(encoded_key, value))
+        self._write_header()
+
+    def __getitem__(self, key):
+        _, offset = self._find(_encode(key))
+        if offset is None:
+            raise KeyError(key)
+        return self._read_record(offset).value
+
+    def __delitem__(self, key):
+        index, offset = self._find(_encode(key))
+        if offset is None:
+            raise KeyError(key)
+        SLOT.pack_into(self._slots, _position(index), 0, DELETED)
+        self._length -= 1
+        self._tombstones += 1
+        self._write_header()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def set(self, key, value):
+        self[key] = value
+
+    @property
+    def pairs(self):
+        return PairsTableView(self)
+
+    @property
+    def keys(self):
+        return KeysTableView(self)
+
+    @property
+    def values(self):
+        return ValuesTableView(self)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def flush(self):
+        self._heap.flush()
+        self._slots.flush()
+
+    def close(self):
+        if hasattr(self, "_heap"):
+            self._heap.close()
+        if not self._slots.closed:
+            self._slots.flush()
+            self._slots.close()
+        self._slots_file.close()
+
+    def _find(self, encoded_key):
+        """Slot index and record offset of the key, or (None, None) when it's missing"""
+        hash_code = _stable_hash(encoded_key)
+        for index in self._probing(hash_code, self._capacity):
+            slot_hash, offset = SLOT.unpack_from(self._slots, _position(index))
+            if offset == FREE:
+                break
+            if offset != DELETED and slot_hash == hash_code and self._read_key(offset) == encoded_key:
+                return index, offset
+        return None, None
+
+    def _iter_pairs(self):
+        for index in range(self._capacity):
+            _, offset = SLOT.unpack_from(self._slots, _position(index))
+            if offset != FREE and offset != DELETED:
+                yield self._read_record(offset)
+
+    def _append(self, encoded_key, value):
+        """Append a record to the heap file and return its offset + 1"""
+        encoded_value = pickle.dumps(value)
+        offset = self._heap_size
+        self._heap.seek(offset)
+        self._heap.write(RECORD.pack(len(encoded_key), len(encoded_value)) + encoded_key + encoded_value)
+        self._heap_size += RECORD.size + len(encoded_key) + len(encoded_value)
+        return offset + 1
+
+    def _read_key(self, offset):
+        self._heap.seek(offset - 1)
+        key_length, _ = RECORD.unpack(self._heap.read(RECORD.size))
+        return self._heap.read(key_length)
+
+    def _read_record(self, offset):
+        self._heap.seek(offset - 1)
+        key_length, value_length = RECORD.unpack(self._heap.read(RECORD.size))
+        return Pair(_decode(self._heap.read(key_length)), pickle.loads(self._heap.read(value_length)))
+
+    def _write_header(self):
+        HEADER.pack_into(self._slots, 0, MAGIC, self._capacity, self._length, self._tombstones)
+
+    def _resize_and_rehash(self, capacity):
+        """
+        Write the live slots into a new slots file and swap it in place of the old one.
+        Slots carry the hash of their key, so the heap file is never read while rehashing.
+        """
+        temporary_path = self._path + ".resize"
+        _create_slots_file(temporary_path, capacity)
+        with open(temporary_path, "r+b") as file, mmap.mmap(file.fileno(), 0) as slots:
+            for old_index in range(self._capacity):
+                hash_code, offset = SLOT.unpack_from(self._slots, _position(old_index))
+                if offset == FREE or offset == DELETED:
+                    continue
+                for index in self._probing(hash_code, capacity):
+                    if SLOT.unpack_from(slots, _position(index))[1] == FREE:
+                        SLOT.pack_into(slots, _position(index), hash_code, offset)
+                        break
+            HEADER.pack_into(slots, 0, MAGIC, capacity, self._length, 0)
+
+        self._slots.close()
+        self._slots_file.close()
+        os.replace(temporary_path, self._path)
+        self._slots_file = open(self._path, "r+b")
+        self._slots = mmap.mmap(self._slots_file.fileno(), 0)
+        self._capacity = capacity
+        self._tombstones = 0
+
+def _create_slots_file(path, capacity):
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, capacity, 0, 0))
+        file.truncate(HEADER.size + capacity * SLOT.size) # zero bytes read as FREE slots
+
+def _position(index):
+    return HEADER.size + index * SLOT.size
+
+def _encode(key):
+    if isinstance(key, str):
+        return b"s" + key.encode("utf-8")
+    if isinstance(key, bytes):
+        return b"b" + key
+    raise TypeError(f"DiskHashTable keys must be str or bytes, not {type(key).__name__}")
+
+def _decode(encoded_key):
+    if encoded_key[:1] == b"s":
+        return encoded_key[1:].decode("utf-8")
+    return encoded_key[1:]
+
+def _stable_hash(encoded_key):
+    """Unlike hash(), gives the same value in every process, which the slots file relies on"""
+    return int.from_bytes(blake2b(encoded_key, digest_size=8).digest(), "little")
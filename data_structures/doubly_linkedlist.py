@@ -1,4 +1,6 @@
 class Node():
+    __slots__ = ("data", "next", "prev") # no per-node __dict__
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -7,19 +9,27 @@ class Node():
     def __repr__(self):
         return self.data
 
+
 class MyDoublyLinkedList():
-    def __init__(self, nodes=None):
+    """
+    Doubly linked list keeping track of its last node and its length,
+    so that adding and popping at either end and len are O(1).
+    Nodes are handles: insert_before, insert_after, unlink, move_to_front and move_to_end
+    take a node of the list and are O(1) too. Passing a node of another list corrupts both.
+    With indexed=True the list also keeps a dictionary of its nodes by data, which makes
+    find and the add_before, add_after and remove methods O(1), but then data must be unique and hashable.
+    With a NodePool (see linkedlist.py), the nodes built from the initial items come from the pool
+    and remove() gives nodes back to it.
+    """
+    def __init__(self, nodes=None, indexed=False, pool=None):
         self.head = None
         self.tail = None
+        self.size = 0
+        self.index = {} if indexed else None
+        self.pool = pool
 
-        if nodes is not None:
-            node = Node(data=nodes.pop(0))
-            self.head = node
-
-            for item in nodes:
-                node.next = Node(data=item)
-                node.next.prev = node
-                node = node.next
+        for item in nodes or ():
+            self.add_last(pool.acquire(item) if pool else Node(data=item))
     
     def __iter__(self):
         node = self.head
@@ -38,70 +48,108 @@ class MyDoublyLinkedList():
         return " <-> ".join(nodes) 
     
     def __len__(self):
-        node_count = 0
-        for node in self:
-            node_count += 1
-        return node_count
+        return self.size
+
+    def __contains__(self, target_node_data):
+        return self.find(target_node_data) is not None
+
+    def find(self, target_node_data):
+        """First node holding target_node_data, None if there is none"""
+        if self.index is not None:
+            return self.index.get(target_node_data)
+        for curr_node in self:
+            if curr_node.data == target_node_data:
+                return curr_node
+        return None
 
     def add_first(self, node):
-        node.next = self.head
-        self.head = node
+        self._link(node, None, self.head)
 
     def add_last(self, node):
+        self._link(node, self.tail, None)
+
+    def insert_before(self, node, new_node):
+        self._link(new_node, node.prev, node)
+
+    def insert_after(self, node, new_node):
+        self._link(new_node, node, node.next)
+
+    def unlink(self, node):
+        """Take node out of the list and return it"""
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+        if self.index is not None:
+            del self.index[node.data]
+        self.size -= 1
+        return node
+
+    def move_to_front(self, node):
+        if node is not self.head:
+            self.add_first(self.unlink(node))
+
+    def move_to_end(self, node):
+        if node is not self.tail:
+            self.add_last(self.unlink(node))
+
+    def pop_first(self):
         if self.head is None:
-            self.head = node
-            return
-        for current_node in self:
-            pass
-        current_node.next = node
-        node.prev = current_node
+            raise Exception("Cannot pop from an empty list")
+        return self.unlink(self.head)
+
+    def pop_last(self):
+        if self.tail is None:
+            raise Exception("Cannot pop from an empty list")
+        return self.unlink(self.tail)
 
     def add_before(self, target_node_data, new_node):
         if self.head == None:
             raise Exception("Cannot add to an empty list")
         
-        if self.head.data == target_node_data:
-            return self.add_first(new_node)
-        
-        prev_node = self.head
-        for curr_node in self:
-            if curr_node.data == target_node_data:
-                prev_node.next = new_node
-                new_node.prev = prev_node
-                new_node.next = curr_node
-                curr_node.prev = new_node
-                return
-            prev_node = curr_node
-            
-        raise Exception("Node with '%s' was not found" % target_node_data)
+        curr_node = self.find(target_node_data)
+        if curr_node is None:
+            raise Exception("Node with '%s' was not found" % target_node_data)
+        self.insert_before(curr_node, new_node)
 
     def add_after(self, target_node_data, new_node):
         if self.head == None:
             raise Exception("Cannot add to an empty list")
         
-        for curr_node in self:
-            if curr_node.data == target_node_data:
-                new_node.next = curr_node.next
-                new_node.prev = curr_node
-                curr_node.next = new_node
-                return
-            
-        raise Exception("Node with data '%s' was not found" % target_node_data)
+        curr_node = self.find(target_node_data)
+        if curr_node is None:
+            raise Exception("Node with data '%s' was not found" % target_node_data)
+        self.insert_after(curr_node, new_node)
     
     def remove(self, target_node_data):
         if self.head == None:
             raise Exception("Cannot delete from an empty list")
         
-        if self.head.data == target_node_data:
-            self.head = self.head.next
-            return
-        
-        prev_node = self.head
-        for curr_node in self:
-            if curr_node.data == target_node_data:
-                prev_node.next = curr_node.next
-                curr_node.next.prev = prev_node
-                return
-            prev_node = curr_node
+        curr_node = self.find(target_node_data)
+        if curr_node is None:
+            raise Exception("Node with data '%s' was not found" % target_node_data)
+        self.unlink(curr_node)
+        if self.pool is not None:
+            self.pool.release(curr_node)
 
-        raise Exception("Node with data '%s' was not found" % target_node_data)
\ No newline at end of file
+    def _link(self, node, prev_node, next_node):
+        """Put node between two adjacent nodes of the list, None standing for either end"""
+        if self.index is not None:
+            if node.data in self.index:
+                raise Exception("Node with data '%s' is already in the list" % node.data)
+            self.index[node.data] = node
+        node.prev, node.next = prev_node, next_node
+        if prev_node is None:
+            self.head = node
+        else:
+            prev_node.next = node
+        if next_node is None:
+            self.tail = node
+        else:
+            next_node.prev = node
+        self.size += 1
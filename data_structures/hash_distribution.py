@@ -1,17 +1,215 @@
 from collections import Counter
+from math import sqrt, erfc
 from string import printable
+from struct import iter_unpack
+from typing import NamedTuple
+
+MASK_32 = 0xFFFFFFFF
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# hash functions
+# like the built-in hash(), each one takes an item and returns an integer, but gives the same value in every process
+def fnv1a(item):
+    """64-bit FNV-1a"""
+    hash_code = 0xCBF29CE484222325
+    for byte in _to_bytes(item):
+        hash_code = ((hash_code ^ byte) * 0x100000001B3) & MASK_64
+    return hash_code
+
+def murmur3(item, seed=0):
+    """32-bit MurmurHash3 (x86 variant)"""
+    data = _to_bytes(item)
+    c1, c2 = 0xCC9E2D51, 0x1B873593
+    hash_code = seed & MASK_32
+    body = len(data) & ~3
+
+    for (block,) in iter_unpack("<I", data[:body]):
+        block = (_rotate_left_32((block * c1) & MASK_32, 15) * c2) & MASK_32
+        hash_code = (_rotate_left_32(hash_code ^ block, 13) * 5 + 0xE6546B64) & MASK_32
+
+    if len(data) > body:
+        tail = int.from_bytes(data[body:], "little")
+        hash_code ^= (_rotate_left_32((tail * c1) & MASK_32, 15) * c2) & MASK_32
+
+    hash_code ^= len(data)
+    hash_code ^= hash_code >> 16
+    hash_code = (hash_code * 0x85EBCA6B) & MASK_32
+    hash_code ^= hash_code >> 13
+    hash_code = (hash_code * 0xC2B2AE35) & MASK_32
+    return hash_code ^ (hash_code >> 16)
+
+def xxhash32(item, seed=0):
+    """32-bit xxHash"""
+    p1, p2, p3, p4, p5 = 2654435761, 2246822519, 3266489917, 668265263, 374761393
+    data = _to_bytes(item)
+    stripes = len(data) & ~15
+
+    if stripes:
+        lanes = [(seed + p1 + p2) & MASK_32, (seed + p2) & MASK_32, seed & MASK_32, (seed - p1) & MASK_32]
+        for stripe in iter_unpack("<4I", data[:stripes]):
+            for i, value in enumerate(stripe):
+                lanes[i] = (_rotate_left_32((lanes[i] + value * p2) & MASK_32, 13) * p1) & MASK_32
+        hash_code = sum(_rotate_left_32(lane, bits) for lane, bits in zip(lanes, (1, 7, 12, 18))) & MASK_32
+    else:
+        hash_code = (seed + p5) & MASK_32
+
+    hash_code = (hash_code + len(data)) & MASK_32
+    words = stripes + (len(data) - stripes) // 4 * 4
+    for (word,) in iter_unpack("<I", data[stripes:words]):
+        hash_code = (_rotate_left_32((hash_code + word * p3) & MASK_32, 17) * p4) & MASK_32
+    for byte in data[words:]:
+        hash_code = (_rotate_left_32((hash_code + byte * p5) & MASK_32, 11) * p1) & MASK_32
+
+    hash_code ^= hash_code >> 15
+    hash_code = (hash_code * p2) & MASK_32
+    hash_code ^= hash_code >> 13
+    hash_code = (hash_code * p3) & MASK_32
+    return hash_code ^ (hash_code >> 16)
+
+HASH_FUNCTIONS = {
+    "hash": hash,
+    "fnv1a": fnv1a,
+    "murmur3": murmur3,
+    "xxhash32": xxhash32,
+}
+
+class HashReport(NamedTuple):
+    keys: int
+    containers: int
+    chi_square: float # close to containers - 1 when keys spread uniformly
+    p_value: float # probability of a chi-square at least this large if the hash were uniform
+    variance: float # variance of the number of keys per container
+    max_load: int
+    expected_probes: float | None # mean slots visited to find a key in a linearly probed table of that capacity
+    expected_miss_probes: float | None # mean slots visited before giving up on a missing key
 
 def distribute(items, num_containers, hash_function=hash):
-    return Counter([hash_function(item) % num_containers for item in items])
+    return Counter(hash_function(item) % num_containers for item in items)
+
+def analyze(items, num_containers, hash_function=hash):
+    """
+    Measure how evenly hash_function spreads items across num_containers buckets.
+    Items are consumed as a stream, memory only grows with the number of non-empty buckets.
+    When the items fit, the probe counts are those of a MyHashTable with linear probing and capacity num_containers.
+    """
+    histogram = distribute(items, num_containers, hash_function)
+    keys = sum(histogram.values())
+    mean = keys / num_containers
+    sum_of_squares = sum(count * count for count in histogram.values())
+    variance = sum_of_squares / num_containers - mean * mean
+    chi_square = variance * num_containers / mean if keys else 0.0
+    expected_probes, expected_miss_probes = (
+        linear_probe_lengths(histogram, num_containers) if keys < num_containers else (None, None)
+    )
+    return HashReport(
+        keys=keys,
+        containers=num_containers,
+        chi_square=chi_square,
+        p_value=_chi_square_p_value(chi_square, num_containers - 1),
+        variance=variance,
+        max_load=max(histogram.values(), default=0),
+        expected_probes=expected_probes,
+        expected_miss_probes=expected_miss_probes,
+    )
+
+def linear_probe_lengths(histogram, capacity):
+    """
+    Mean probe length of successful and unsuccessful lookups in a linearly probed table
+    whose home slots are counted by histogram, without building the table.
+    The total displacement under linear probing doesn't depend on insertion order,
+    so one sweep carrying the overflow of each slot into the next one is enough.
+    """
+    keys = sum(histogram.values())
+    if keys >= capacity:
+        raise ValueError("A linearly probed table needs more slots than keys")
+
+    # start right after a slot that ends up empty so that nothing wraps around into the sweep,
+    # the first lap settles how much overflow wraps around from the end of the table
+    carry = 0
+    for slot in range(2 * capacity):
+        incoming = carry + histogram.get(slot % capacity, 0)
+        if incoming == 0 and slot >= capacity:
+            start = slot + 1
+            break
+        carry = max(incoming - 1, 0)
+
+    displacement = carry = 0
+    occupied = bytearray(capacity)
+    for offset in range(capacity):
+        slot = (start + offset) % capacity
+        carry += histogram.get(slot, 0)
+        if carry:
+            occupied[slot] = 1
+            carry -= 1
+        displacement += carry
+
+    # a missing key probes from its home slot up to and including the next empty slot
+    miss_probes = run = 0
+    for offset in range(capacity, 0, -1):
+        slot = (start + offset - 1) % capacity
+        run = run + 1 if occupied[slot] else 0
+        miss_probes += run + 1
+
+    return 1 + displacement / keys if keys else 0.0, miss_probes / capacity
+
+def compare(make_items, num_containers, hash_functions=HASH_FUNCTIONS):
+    """
+    Analyze each hash function on a fresh stream of items from make_items().
+    Best first: fewest probes per hit and miss when the items fit in the table, otherwise the most uniform spread.
+    Too uniform a spread isn't a good sign on its own, sequential integers under hash() fill one long cluster.
+    """
+    reports = {
+        name: analyze(make_items(), num_containers, hash_function)
+        for name, hash_function in hash_functions.items()
+    }
+
+    def cost(item):
+        report = item[1]
+        if report.expected_probes is None:
+            return (0, report.chi_square)
+        return (report.expected_probes + report.expected_miss_probes, report.chi_square)
+    return dict(sorted(reports.items(), key=cost))
 
 def plot(histogram):
+    max_count = max(histogram.values())
     for key in sorted(histogram):
         count = histogram[key]
-        padding = (max(histogram.values()) - count) * " "
+        padding = (max_count - count) * " "
         print(f"{key:3} {'■' * count}{padding} ({count})")
 
+def _to_bytes(item):
+    if isinstance(item, bytes):
+        return item
+    if isinstance(item, str):
+        return item.encode("utf-8")
+    return repr(item).encode("utf-8")
+
+def _rotate_left_32(value, bits):
+    return ((value << bits) | (value >> (32 - bits))) & MASK_32
+
+def _chi_square_p_value(chi_square, degrees_of_freedom):
+    """Upper tail of the chi-square distribution using the Wilson-Hilferty normal approximation"""
+    if degrees_of_freedom < 1:
+        return 1.0
+    k = degrees_of_freedom
+    z = ((chi_square / k) ** (1 / 3) - (1 - 2 / (9 * k))) / sqrt(2 / (9 * k))
+    return erfc(z / sqrt(2)) / 2
+
 def main():
     plot(distribute(printable, num_containers=5, hash_function=hash))
 
+    print(f"\n{'keys':22} {'hash':9} {'chi-square':>11} {'p-value':>8} {'variance':>9} {'max':>4} {'probes':>7} {'misses':>7}")
+    samples = {
+        "sequential integers": lambda: range(100_000),
+        "strided integers": lambda: (i * 1024 for i in range(100_000)),
+        "shared-prefix strings": lambda: (f"customer:{i:08}" for i in range(100_000)),
+    }
+    for sample, make_items in samples.items():
+        for name, report in compare(make_items, num_containers=2 ** 18).items():
+            print(
+                f"{sample:22} {name:9} {report.chi_square:11.0f} {report.p_value:8.3f} {report.variance:9.3f} "
+                f"{report.max_load:4} {report.expected_probes:7.2f} {report.expected_miss_probes:7.2f}"
+            )
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,11 +1,76 @@
 from typing import NamedTuple, Any
+from array import array
+from collections.abc import KeysView, ValuesView, ItemsView, Mapping
+from copy import copy
+from math import gcd, ceil
 
 DELETED = object()
 
+# markers for the index array of CompactHashTable
+FREE = -1
+DUMMY = -2
+
 class Pair(NamedTuple):
     key: Any
     value: Any
 
+# probing strategies
+# each one yields the slot indices to visit for a given hash code, covering every slot of the table at least once
+def linear_probing(hash_code, capacity):
+    index = hash_code % capacity
+    for _ in range(capacity):
+        yield index
+        index = (index + 1) % capacity
+
+def quadratic_probing(hash_code, capacity):
+    """
+    Visits offsets 0, 1, 3, 6, 10, ... (triangular numbers) from the home slot.
+    That sequence covers the whole table when the capacity is a power of two, otherwise it is followed by a linear sweep.
+    """
+    index = hash_code % capacity
+    for offset in range(capacity):
+        yield index
+        index = (index + offset + 1) % capacity
+    if capacity & (capacity - 1):
+        yield from linear_probing(hash_code, capacity)
+
+def double_hashing(hash_code, capacity):
+    """
+    Steps through the table by an amount derived from the high bits of the hash code.
+    The step is bumped until it is coprime with the capacity so that every slot gets visited.
+    """
+    index = hash_code % capacity
+    step = 1 + (hash_code // capacity) % max(capacity - 1, 1)
+    while gcd(step, capacity) != 1:
+        step += 1
+    for _ in range(capacity):
+        yield index
+        index = (index + step) % capacity
+
+class KeysTableView(KeysView):
+    """Set-like view over the keys of a MyHashTable that reads the slots lazily"""
+    def __iter__(self):
+        for pair in self._mapping._iter_pairs():
+            yield pair.key
+
+class ValuesTableView(ValuesView):
+    """View over the values of a MyHashTable that reads the slots lazily"""
+    def __iter__(self):
+        for pair in self._mapping._iter_pairs():
+            yield pair.value
+
+class PairsTableView(ItemsView):
+    """Set-like view over the key-value pairs of a MyHashTable that reads the slots lazily"""
+    def __iter__(self):
+        return self._mapping._iter_pairs()
+
+    def __contains__(self, item):
+        try:
+            key, value = item
+        except (TypeError, ValueError):
+            return False
+        return super().__contains__((key, value))
+
 class MyHashTable:
     """
     Core features:
@@ -15,20 +80,30 @@ class MyHashTable:
     * Find a value by key
     * Update the value associate with an existing key
     * Check if the hash table has a given key
+    * Grow (and optionally shrink) automatically based on the load factor
+    * Pluggable probing strategy: linear_probing, quadratic_probing or double_hashing
+    * Bulk operations: from_items(), update(), set_many() and get_many()
     """
-    def __init__(self, capacity):
+    def __init__(self, capacity=8, load_factor_threshold=0.6, shrink_threshold=None, probing=linear_probing):
         if capacity < 1:
             raise ValueError("Hash table capacity must be a positive integer value")
+        if not (0 < load_factor_threshold < 1):
+            raise ValueError("Load factor threshold must be a number between 0 and 1")
+        if shrink_threshold is not None and not (0 < shrink_threshold < load_factor_threshold / 2):
+            raise ValueError("Shrink threshold must be a number between 0 and half the load factor threshold")
         self._slots = capacity * [None]
+        self._min_capacity = capacity
+        self._load_factor_threshold = load_factor_threshold
+        self._shrink_threshold = shrink_threshold
+        self._probing = probing
+        self._length = 0 # number of live key-value pairs
+        self._tombstones = 0 # number of slots marked as DELETED
     
     def __len__(self):
-        return len(self.pairs)
+        return self._length
 
     def __str__(self):
-        pairs = []
-        for key, value in self.pairs:
-            pairs.append(f"{key!r}: {value!r}")
-        return "{" + ", ".join(pairs) + "}"
+        return "{" + ", ".join(f"{key!r}: {value!r}" for key, value in self._iter_pairs()) + "}"
     
     def __contains__(self, key):
         try:
@@ -39,20 +114,41 @@ class MyHashTable:
             return True
         
     def __iter__(self):
-        yield from self.keys
+        for pair in self._iter_pairs():
+            yield pair.key
     
     def __setitem__(self, key, value):
         """
         Magic method in Python that allows class instances to use the indexer operators i.e. self[key]
-        Uses linear probing to resolve hash collisions
+        Uses the probing strategy (linear probing by default) to resolve hash collisions
+        Resizes the table first whenever inserting a new key would push the load factor over the threshold,
+        overwriting the value of an existing key never resizes
         """
+        first_tombstone = None
         for index, pair in self._probe(key):
-            if pair is DELETED: continue
-            if pair is None or pair.key == key:
-                self._slots[index] = Pair(key, value)
+            if pair is DELETED:
+                if first_tombstone is None:
+                    first_tombstone = index # reuse the first DELETED slot if the key turns out to be new
+                continue
+            if pair is None:
                 break
+            if pair.key == key:
+                self._slots[index] = Pair(key, value)
+                return
         else:
+            index = None # no free slot on the probe sequence
+
+        # the key is new
+        if self._grow_if_needed():
+            self[key] = value # probe the resized table again
+            return
+        if first_tombstone is not None:
+            index = first_tombstone
+            self._tombstones -= 1
+        if index is None:
             raise MemoryError("Not enough capacity")
+        self._slots[index] = Pair(key, value)
+        self._length += 1
 
     def __getitem__(self, key):
         """"
@@ -75,9 +171,12 @@ class MyHashTable:
                 continue
             if pair.key == key:
                 self._slots[index] = DELETED
+                self._length -= 1
+                self._tombstones += 1
                 break
-            else:
-                raise KeyError(key)
+        else:
+            raise KeyError(key)
+        self._shrink_if_needed()
         
     def get(self, key, default=None):
         try:
@@ -88,30 +187,362 @@ class MyHashTable:
     def set(self, key, value):
         self[key] = value
 
+    @classmethod
+    def from_items(cls, items, load_factor_threshold=0.6, **kwargs):
+        """
+        Build a table from a mapping or an iterable of key-value pairs.
+        The capacity is chosen up front so that no resizing happens while loading.
+        """
+        pairs = _as_pairs(items)
+        capacity = max(ceil(len(pairs) / load_factor_threshold) + 1, 8)
+        table = cls(capacity, load_factor_threshold, **kwargs)
+        table._insert_pairs(pairs)
+        return table
+
+    def update(self, other=(), **kwargs):
+        self.set_many(other)
+        if kwargs:
+            self.set_many(kwargs)
+
+    def set_many(self, items):
+        """Insert a mapping or an iterable of key-value pairs, resizing at most once beforehand"""
+        pairs = _as_pairs(items)
+        self._reserve(len(self) + len(pairs))
+        self._insert_pairs(pairs)
+
+    def get_many(self, keys, default=None):
+        """List of the values found for each key, or default for the missing ones"""
+        if self._probing is not linear_probing:
+            return [self.get(key, default) for key in keys]
+
+        # same lookup as __getitem__ with linear probing inlined into one loop
+        slots = self._slots
+        capacity = len(slots)
+        values = []
+        for key in keys:
+            index = hash(key) % capacity
+            for _ in range(capacity):
+                pair = slots[index]
+                if pair is None:
+                    values.append(default)
+                    break
+                if pair is not DELETED and pair.key == key:
+                    values.append(pair.value)
+                    break
+                index = (index + 1) % capacity
+            else:
+                values.append(default)
+        return values
+
     @property
     def pairs(self):
-        return {
-            pair for pair in self._slots
-            if pair not in (None, DELETED)
-        }
+        return PairsTableView(self)
     
     @property
     def keys(self):
-        return {pair.key for pair in self.pairs}
+        return KeysTableView(self)
 
     @property
     def values(self):
-        return [pair.value for pair in self.pairs]
+        return ValuesTableView(self)
     
     @property
     def capacity(self):
         return len(self._slots)
+
+    @property
+    def load_factor(self):
+        """Fraction of slots that are occupied, counting DELETED markers since they lengthen probes too"""
+        return (self._length + self._tombstones) / self.capacity
     
+    def _iter_pairs(self):
+        for pair in self._slots:
+            if pair is not None and pair is not DELETED:
+                yield pair
+
     def _index(self, key):
         return hash(key) % len(self._slots)
     
     def _probe(self, key):
-        index = self._index(key)
-        for _ in range(self.capacity):
+        for index in self._probing(hash(key), self.capacity):
             yield index, self._slots[index]
-            index = (index + 1) % self.capacity
\ No newline at end of file
+
+    def _reserve(self, length):
+        """Resize once so that the table can hold length pairs without crossing the load factor threshold"""
+        if (length + self._tombstones) / self.capacity > self._load_factor_threshold:
+            self._resize_and_rehash(max(ceil(length / self._load_factor_threshold) + 1, self.capacity))
+
+    def _insert_pairs(self, pairs):
+        """Insert pairs into a table that already has room for all of them"""
+        if self._probing is not linear_probing:
+            for key, value in pairs:
+                self[key] = value
+            return
+
+        # same insertion as __setitem__ with linear probing inlined into one loop
+        slots = self._slots
+        capacity = len(slots)
+        for key, value in pairs:
+            index = hash(key) % capacity
+            first_tombstone = None
+            while True:
+                pair = slots[index]
+                if pair is None:
+                    if first_tombstone is not None:
+                        index = first_tombstone
+                        self._tombstones -= 1
+                    slots[index] = Pair(key, value)
+                    self._length += 1
+                    break
+                if pair is DELETED:
+                    if first_tombstone is None:
+                        first_tombstone = index
+                elif pair.key == key:
+                    slots[index] = Pair(key, value)
+                    break
+                index = (index + 1) % capacity
+
+    def _grow_if_needed(self):
+        """Make room for one more key if needed, returns whether the table was resized"""
+        if (self._length + self._tombstones + 1) / self.capacity > self._load_factor_threshold:
+            self._resize_and_rehash(self._grown_capacity())
+            return True
+        return False
+
+    def _shrink_if_needed(self):
+        if self._shrink_threshold is not None and self.capacity > self._min_capacity \
+                and self._length / self.capacity < self._shrink_threshold:
+            self._resize_and_rehash(max(self.capacity // 2, self._min_capacity))
+
+    def _grown_capacity(self):
+        """
+        Pick the capacity to rehash into once the load factor threshold is reached.
+        When most of the used slots are DELETED markers, rehashing at the same capacity is enough to clean them up.
+        """
+        if (self._length + 1) / self.capacity > self._load_factor_threshold / 2:
+            return self.capacity * 2
+        return self.capacity
+
+    def _resize_and_rehash(self, capacity):
+        """
+        Reinsert the live pairs into a fresh list of slots, which drops every DELETED marker.
+        The new slots are only published once they are fully built.
+        """
+        table = copy(self)
+        table._slots = capacity * [None]
+        table._length = 0
+        table._tombstones = 0
+        for key, value in self._iter_pairs():
+            table[key] = value
+        self._slots = table._slots
+        self._length = table._length
+        self._tombstones = 0
+
+class RobinHoodHashTable(MyHashTable):
+    """
+    Open addressing with linear probing where an insertion takes the slot of any pair that sits closer to its home slot.
+    That keeps probe lengths even across keys and lets lookups stop early.
+    Deletion shifts the following pairs one slot back instead of leaving DELETED markers behind.
+    """
+    def __init__(self, capacity=8, load_factor_threshold=0.6, shrink_threshold=None):
+        super().__init__(capacity, load_factor_threshold, shrink_threshold, probing=linear_probing)
+
+    def __setitem__(self, key, value):
+        index = self._find(key)
+        if index is not None:
+            self._slots[index] = Pair(key, value) # overwriting never needs a new slot
+            return
+        self._grow_if_needed()
+
+        capacity = self.capacity
+        index = self._index(key)
+        incoming = Pair(key, value)
+        distance = 0 # how far the incoming pair is from its home slot
+        while True:
+            pair = self._slots[index]
+            if pair is None:
+                self._slots[index] = incoming
+                self._length += 1
+                return
+            pair_distance = self._distance(index, pair.key)
+            if pair_distance < distance:
+                # take from the rich, give to the poor
+                self._slots[index], incoming = incoming, pair
+                distance = pair_distance
+            index = (index + 1) % capacity
+            distance += 1
+
+    def __getitem__(self, key):
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+        return self._slots[index].value
+
+    def __delitem__(self, key):
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+
+        # backward shift deletion
+        capacity = self.capacity
+        next_index = (index + 1) % capacity
+        while (pair := self._slots[next_index]) is not None and self._distance(next_index, pair.key) > 0:
+            self._slots[index] = pair
+            index, next_index = next_index, (next_index + 1) % capacity
+        self._slots[index] = None
+        self._length -= 1
+        self._shrink_if_needed()
+
+    def _insert_pairs(self, pairs):
+        for key, value in pairs:
+            self[key] = value
+
+    def _find(self, key):
+        capacity = self.capacity
+        index = self._index(key)
+        for distance in range(capacity):
+            pair = self._slots[index]
+            if pair is None or self._distance(index, pair.key) < distance:
+                return None # the key would have displaced this pair had it been inserted
+            if pair.key == key:
+                return index
+            index = (index + 1) % capacity
+        return None
+
+    def _distance(self, index, key):
+        return (index - hash(key)) % self.capacity
+
+class CompactHashTable(MyHashTable):
+    """
+    Storage laid out like CPython's dict:
+    * a sparse index array (the slots) holding positions into the dense arrays, FREE or DUMMY
+    * dense arrays of cached hashes, keys and values kept in insertion order
+    The index array uses the narrowest integer type that fits, and lookups compare the cached hash before calling __eq__.
+    """
+    def __init__(self, capacity=8, load_factor_threshold=0.6, shrink_threshold=None, probing=linear_probing):
+        super().__init__(capacity, load_factor_threshold, shrink_threshold, probing)
+        self._slots = _index_array(capacity)
+        self._hashes = array("q")
+        self._keys = []
+        self._values = []
+
+    def __setitem__(self, key, value):
+        hash_code = hash(key)
+        entry = self._lookup(key, hash_code)
+        if entry is not None:
+            self._values[entry] = value
+            return
+
+        # DUMMY slots are never reused so that the dense arrays stay shorter than the index array
+        self._grow_if_needed()
+        for index in self._probing(hash_code, self.capacity):
+            if self._slots[index] == FREE:
+                self._slots[index] = len(self._keys)
+                self._hashes.append(hash_code)
+                self._keys.append(key)
+                self._values.append(value)
+                self._length += 1
+                return
+        raise MemoryError("Not enough capacity")
+
+    def __getitem__(self, key):
+        entry = self._lookup(key, hash(key))
+        if entry is None:
+            raise KeyError(key)
+        return self._values[entry]
+
+    def __delitem__(self, key):
+        hash_code = hash(key)
+        for index in self._probing(hash_code, self.capacity):
+            entry = self._slots[index]
+            if entry == FREE:
+                raise KeyError(key)
+            if entry != DUMMY and self._hashes[entry] == hash_code and (self._keys[entry] is key or self._keys[entry] == key):
+                self._slots[index] = DUMMY
+                self._keys[entry] = DELETED
+                self._values[entry] = None
+                self._length -= 1
+                self._tombstones += 1
+                break
+        else:
+            raise KeyError(key)
+        self._shrink_if_needed()
+
+    def get_many(self, keys, default=None):
+        values = self._values
+        return [
+            default if (entry := self._lookup(key, hash(key))) is None else values[entry]
+            for key in keys
+        ]
+
+    def _insert_pairs(self, pairs):
+        for key, value in pairs:
+            self[key] = value
+
+    def _lookup(self, key, hash_code):
+        """Position of the key in the dense arrays or None"""
+        for index in self._probing(hash_code, self.capacity):
+            entry = self._slots[index]
+            if entry == FREE:
+                return None
+            if entry != DUMMY and self._hashes[entry] == hash_code:
+                candidate = self._keys[entry]
+                if candidate is key or candidate == key:
+                    return entry
+        return None
+
+    def _iter_pairs(self):
+        for key, value in zip(self._keys, self._values):
+            if key is not DELETED:
+                yield Pair(key, value)
+
+    def _probe(self, key):
+        for index in self._probing(hash(key), self.capacity):
+            entry = self._slots[index]
+            if entry == FREE:
+                yield index, None
+            elif entry == DUMMY:
+                yield index, DELETED
+            else:
+                yield index, Pair(self._keys[entry], self._values[entry])
+
+    def _grow_if_needed(self):
+        # every entry in the dense arrays, live or deleted, occupies one slot of the index array
+        if (len(self._keys) + 1) / self.capacity > self._load_factor_threshold:
+            self._resize_and_rehash(self._grown_capacity())
+            return True
+        return False
+
+    def _resize_and_rehash(self, capacity):
+        """Compact the dense arrays, dropping deleted entries, then rebuild the index array"""
+        hashes, keys, values = array("q"), [], []
+        for hash_code, key, value in zip(self._hashes, self._keys, self._values):
+            if key is not DELETED:
+                hashes.append(hash_code)
+                keys.append(key)
+                values.append(value)
+
+        slots = _index_array(capacity)
+        for entry, hash_code in enumerate(hashes):
+            for index in self._probing(hash_code, capacity):
+                if slots[index] == FREE:
+                    slots[index] = entry
+                    break
+
+        self._slots, self._hashes, self._keys, self._values = slots, hashes, keys, values
+        self._length = len(keys)
+        self._tombstones = 0
+
+def _as_pairs(items):
+    """List of key-value pairs from a mapping, a hash table or an iterable of pairs"""
+    if isinstance(items, MyHashTable):
+        return list(items.pairs)
+    if isinstance(items, Mapping):
+        return list(items.items())
+    return list(items)
+
+def _index_array(capacity):
+    """Array of FREE markers using the narrowest signed integer type able to address the dense arrays"""
+    for typecode in "bhiq":
+        if capacity <= 2 ** (8 * array(typecode).itemsize - 1) - 1:
+            return array(typecode, [FREE]) * capacity
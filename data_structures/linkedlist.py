@@ -1,4 +1,6 @@
 class Node():
+    __slots__ = ("data", "next") # no per-node __dict__
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -6,16 +8,58 @@ class Node():
     def __repr__(self):
         return self.data
 
+class NodePool():
+    """
+    Free list of unlinked nodes, handed out again instead of allocating new ones.
+    Spare nodes are chained through their next link, at most max_size of them are kept.
+    Works with the Node of linkedlist.py or doubly_linkedlist.py, whichever node_class is.
+    """
+    def __init__(self, node_class=Node, max_size=1024):
+        self.node_class = node_class
+        self.max_size = max_size
+        self.size = 0
+        self._free = None
+        self._doubly = hasattr(node_class, "prev") # also true of subclasses adding slots of their own
+
+    def __len__(self):
+        return self.size
+
+    def acquire(self, data):
+        node = self._free
+        if node is None:
+            return self.node_class(data)
+        self._free = node.next
+        node.data = data
+        node.next = None
+        self.size -= 1
+        return node
+
+    def release(self, node):
+        """Take back a node no list refers to anymore"""
+        if self.size >= self.max_size:
+            return
+        node.data = None # don't keep the data or the old neighbours alive
+        if self._doubly:
+            node.prev = None
+        node.next = self._free
+        self._free = node
+        self.size += 1
+
 class MyLinkedList():
-    def __init__(self, nodes=None):
+    """
+    Singly linked list keeping track of its last node and its length,
+    so that add_first, add_last, pop_first and len are O(1).
+    pop_last still walks the list to find the node before the last one.
+    With a NodePool, the nodes built from the initial items come from the pool and remove() gives nodes back to it.
+    """
+    def __init__(self, nodes=None, pool=None):
         self.head = None
+        self.tail = None
+        self.size = 0
+        self.pool = pool
 
-        if nodes is not None:
-            node = Node(data=nodes.pop(0))
-            self.head = node
-            for item in nodes:
-                node.next = Node(data=item)
-                node = node.next
+        for item in nodes or ():
+            self.add_last(pool.acquire(item) if pool else Node(data=item))
     
     def __iter__(self):
         node = self.head
@@ -34,22 +78,50 @@ class MyLinkedList():
         return " -> ".join(nodes) 
     
     def __len__(self):
-        node_count = 0
-        for node in self:
-            node_count += 1
-        return node_count
+        return self.size
 
     def add_first(self, node):
         node.next = self.head
         self.head = node
+        if self.tail is None:
+            self.tail = node
+        self.size += 1
 
     def add_last(self, node):
-        if self.head is None:
+        node.next = None
+        if self.tail is None:
             self.head = node
-            return
-        for current_node in self:
-            pass
-        current_node.next = node
+        else:
+            self.tail.next = node
+        self.tail = node
+        self.size += 1
+
+    def pop_first(self):
+        if self.head is None:
+            raise Exception("Cannot pop from an empty list")
+
+        node = self.head
+        self.head = node.next
+        if self.head is None:
+            self.tail = None
+        node.next = None
+        self.size -= 1
+        return node
+
+    def pop_last(self):
+        if self.head is None:
+            raise Exception("Cannot pop from an empty list")
+        if self.head is self.tail:
+            return self.pop_first()
+
+        prev_node = self.head
+        while prev_node.next is not self.tail:
+            prev_node = prev_node.next
+        node = self.tail
+        prev_node.next = None
+        self.tail = prev_node
+        self.size -= 1
+        return node
 
     def add_before(self, target_node_data, new_node):
         if self.head == None:
@@ -63,6 +135,7 @@ class MyLinkedList():
             if curr_node.data == target_node_data:
                 prev_node.next = new_node
                 new_node.next = curr_node
+                self.size += 1
                 return
             prev_node = curr_node
             
@@ -76,6 +149,9 @@ class MyLinkedList():
             if curr_node.data == target_node_data:
                 new_node.next = curr_node.next
                 curr_node.next = new_node
+                if curr_node is self.tail:
+                    self.tail = new_node
+                self.size += 1
                 return
             
         raise Exception("Node with data '%s' was not found" % target_node_data)
@@ -85,14 +161,22 @@ class MyLinkedList():
             raise Exception("Cannot delete from an empty list")
         
         if self.head.data == target_node_data:
-            self.head = self.head.next
+            self._release(self.pop_first())
             return
         
         prev_node = self.head
         for curr_node in self:
             if curr_node.data == target_node_data:
                 prev_node.next = curr_node.next
+                if curr_node is self.tail:
+                    self.tail = prev_node
+                self.size -= 1
+                self._release(curr_node)
                 return
             prev_node = curr_node
 
-        raise Exception("Node with data '%s' was not found" % target_node_data)
\ No newline at end of file
+        raise Exception("Node with data '%s' was not found" % target_node_data)
+
+    def _release(self, node):
+        if self.pool is not None:
+            self.pool.release(node)
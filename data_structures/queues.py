@@ -50,6 +50,90 @@ class MyPriorityQueue(AbstractIterableMixin):
     def dequeue(self):
         return heappop(self._items)[-1]
 
+class IndexedPriorityQueue(AbstractIterableMixin):
+    """
+    Binary min-heap that keeps track of where each value sits, so that:
+    * every value is stored at most once
+    * the priority of a queued value can be lowered in place with decrease_key() in O(log n)
+    * membership tests and priority lookups are O(1)
+    Values must be hashable. Ties are broken by insertion order.
+    """
+    def __init__(self):
+        self._items = [] # heap of [priority, insertion order, value]
+        self._positions = {} # value -> index of its item in the heap
+        self._counter = count()
+
+    def __contains__(self, value):
+        return value in self._positions
+
+    def enqueue(self, priority, value):
+        """Add a value, or lower its priority if it's already queued with a higher one"""
+        if value in self._positions:
+            if priority < self.priority(value):
+                self.decrease_key(value, priority)
+            return
+        self._items.append([priority, next(self._counter), value])
+        self._positions[value] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def dequeue(self):
+        return self.dequeue_with_priority()[1]
+
+    def dequeue_with_priority(self):
+        """Remove the value with the lowest priority and return (priority, value)"""
+        items = self._items
+        last = items.pop()
+        if items:
+            top, items[0] = items[0], last
+            self._positions[last[2]] = 0
+            self._sift_down(0)
+        else:
+            top = last
+        del self._positions[top[2]]
+        return top[0], top[2]
+
+    def peek(self):
+        priority, _, value = self._items[0]
+        return priority, value
+
+    def priority(self, value):
+        return self._items[self._positions[value]][0]
+
+    def decrease_key(self, value, priority):
+        index = self._positions[value]
+        if priority > self._items[index][0]:
+            raise ValueError("decrease_key() cannot raise the priority of a value")
+        self._items[index][0] = priority
+        self._sift_up(index)
+
+    def _sift_up(self, index):
+        items, positions = self._items, self._positions
+        item = items[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if items[parent] <= item: # lists compare by priority then insertion order
+                break
+            items[index] = items[parent]
+            positions[items[index][2]] = index
+            index = parent
+        items[index] = item
+        positions[item[2]] = index
+
+    def _sift_down(self, index):
+        items, positions = self._items, self._positions
+        size = len(items)
+        item = items[index]
+        while (child := 2 * index + 1) < size:
+            if child + 1 < size and items[child + 1] < items[child]:
+                child += 1
+            if item <= items[child]:
+                break
+            items[index] = items[child]
+            positions[items[index][2]] = index
+            index = child
+        items[index] = item
+        positions[item[2]] = index
+
 @dataclass
 class Message:
     event: str
@@ -61,19 +145,23 @@ class Priority(IntEnum):
     IMPORTANT = 2
     NEUTRAL = 3
 
-# testing priority queues
-wipers = Message("Windshield wipers turned on")
-hazard_lights = Message("Hazard lights turned on")
-ABS = Message("ABS engaged")
-brakes = Message("Brake pedal depressed")
-radio = Message("Radio station tuned in")
-
-messages = MyPriorityQueue()
-messages.enqueue(Priority.IMPORTANT, hazard_lights)
-messages.enqueue(Priority.NEUTRAL, wipers)
-messages.enqueue(Priority.CRITICAL, ABS)
-messages.enqueue(Priority.CRITICAL, brakes)
-messages.enqueue(Priority.NEUTRAL, radio)
-
-for message in messages:
-    print(message)
\ No newline at end of file
+def main():
+    # testing priority queues
+    wipers = Message("Windshield wipers turned on")
+    hazard_lights = Message("Hazard lights turned on")
+    ABS = Message("ABS engaged")
+    brakes = Message("Brake pedal depressed")
+    radio = Message("Radio station tuned in")
+
+    messages = MyPriorityQueue()
+    messages.enqueue(Priority.IMPORTANT, hazard_lights)
+    messages.enqueue(Priority.NEUTRAL, wipers)
+    messages.enqueue(Priority.CRITICAL, ABS)
+    messages.enqueue(Priority.CRITICAL, brakes)
+    messages.enqueue(Priority.NEUTRAL, radio)
+
+    for message in messages:
+        print(message)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from .array_linkedlist import ArrayLinkedList, NIL
+from collections import deque
+from random import Random
+import pytest
+
+def test_should_add_and_pop_at_both_ends():
+    linked_list = ArrayLinkedList(["b"])
+    linked_list.add_first("a")
+    linked_list.add_last("c")
+
+    assert list(linked_list) == ["a", "b", "c"]
+    assert repr(linked_list) == "a <-> b <-> c <-> None"
+    assert linked_list.pop_first() == "a"
+    assert linked_list.pop_last() == "c"
+    assert linked_list.pop_last() == "b"
+    assert len(linked_list) == 0
+    assert linked_list.head == linked_list.tail == NIL
+    with pytest.raises(Exception):
+        linked_list.pop_first()
+
+def test_should_insert_and_unlink_around_handles():
+    linked_list = ArrayLinkedList()
+    b = linked_list.add_last("b")
+    linked_list.insert_before(b, "a")
+    c = linked_list.insert_after(b, "c")
+
+    assert list(linked_list) == ["a", "b", "c"]
+    assert linked_list.unlink(b) == "b"
+    assert list(linked_list) == ["a", "c"]
+    assert linked_list.value(c) == "c"
+    assert [linked_list.value(handle) for handle in linked_list.handles()] == ["a", "c"]
+
+def test_should_reuse_unlinked_slots():
+    linked_list = ArrayLinkedList(range(3))
+    linked_list.unlink(1) # the slots are 0, 1 and 2 in order
+
+    assert linked_list.values[1] is None
+    assert linked_list.add_last(3) == 1
+    assert len(linked_list.values) == 3
+    assert list(linked_list) == [0, 2, 3]
+
+def test_should_match_a_deque_under_random_use():
+    random = Random(11)
+    linked_list, expected = ArrayLinkedList(), deque()
+    for item in range(5000):
+        operation = random.randrange(4)
+        if operation == 0:
+            linked_list.add_first(item)
+            expected.appendleft(item)
+        elif operation == 1:
+            linked_list.add_last(item)
+            expected.append(item)
+        elif expected and operation == 2:
+            assert linked_list.pop_first() == expected.popleft()
+        elif expected:
+            assert linked_list.pop_last() == expected.pop()
+
+    assert list(linked_list) == list(expected)
+    assert len(linked_list) == len(expected)
+    assert len(linked_list.values) <= 5000
@@ -0,0 +1,155 @@
+from .cache import Cache, LRUCache, LFUCache, TTLCache, CacheInfo, memoize
+from collections import OrderedDict
+from random import Random
+import pytest
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_should_evict_the_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache["london"] = 1
+    cache["leeds"] = 2
+    cache["london"]
+    cache["york"] = 3
+
+    assert "leeds" not in cache
+    assert cache["london"] == 1 and cache["york"] == 3
+    assert cache.info() == CacheInfo(hits=3, misses=0, evictions=1, expirations=0, entries=2, bytes=0)
+
+def test_should_count_misses():
+    cache = LRUCache()
+
+    with pytest.raises(KeyError):
+        cache["london"]
+    assert cache.get("london", "nowhere") == "nowhere"
+    assert cache.info().misses == 2
+
+def test_should_match_an_ordered_dict_lru_under_random_use():
+    random = Random(7)
+    cache, expected = LRUCache(max_entries=50), OrderedDict()
+    for _ in range(5000):
+        key = random.randrange(120)
+        if random.random() < 0.5:
+            cache[key] = key * 2
+            expected[key] = key * 2
+            expected.move_to_end(key)
+            if len(expected) > 50:
+                expected.popitem(last=False)
+        elif key in expected:
+            expected.move_to_end(key)
+            assert cache[key] == expected[key]
+        else:
+            assert cache.get(key) is None
+
+    assert [entry.data for entry in cache._order] == list(expected)
+
+def test_should_bound_by_byte_size():
+    cache = LRUCache(max_entries=None, max_bytes=10, sizeof=len)
+    cache["a"] = "xxxx"
+    cache["b"] = "xxxx"
+    cache["c"] = "xxxx"
+
+    assert "a" not in cache
+    assert cache.bytes == 8
+
+    cache["d"] = "x" * 11 # never fits
+    assert "d" not in cache
+    assert len(cache) == 2
+
+def test_should_evict_the_least_frequently_used_entry():
+    cache = LFUCache(max_entries=3)
+    cache["a"], cache["b"], cache["c"] = 1, 2, 3
+    cache["a"], cache["a"], cache["b"]
+    cache["d"] = 4
+
+    assert "c" not in cache
+    assert cache.frequency("a") == 3
+    assert cache.frequency("b") == 2
+    assert cache.frequency("d") == 1
+
+def test_should_break_lfu_ties_by_recency():
+    cache = LFUCache(max_entries=2)
+    cache["a"], cache["b"] = 1, 2
+    cache["b"], cache["a"]
+    cache["c"] = 3
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+def test_should_keep_frequency_lists_consistent():
+    random = Random(3)
+    cache = LFUCache(max_entries=20)
+    for _ in range(3000):
+        key = random.randrange(40)
+        if random.random() < 0.3:
+            cache[key] = key
+        else:
+            cache.get(key)
+
+    counts = [frequency.data for frequency in cache._frequencies]
+    assert counts == sorted(set(counts))
+    assert all(frequency.entries for frequency in cache._frequencies)
+    assert sum(len(frequency.entries) for frequency in cache._frequencies) == len(cache) <= 20
+
+def test_should_expire_entries():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache["a"] = 1
+    clock.now = 5
+    cache["b"] = 2
+    clock.now = 10
+
+    assert "a" not in cache
+    with pytest.raises(KeyError):
+        cache["a"]
+    assert cache["b"] == 2
+
+    clock.now = 20
+    cache["c"] = 3
+    assert len(cache) == 1
+    assert cache.info().expirations == 2
+
+def test_should_memoize_results():
+    calls = []
+
+    @memoize(LRUCache(max_entries=2))
+    def route(source, destination, weight="distance"):
+        calls.append((source, destination))
+        return [source, destination]
+
+    assert route("london", "york") == ["london", "york"]
+    assert route("london", "york") == ["london", "york"]
+    assert route("london", "york", weight="hops") == ["london", "york"]
+    assert len(calls) == 2
+    assert route.cache_info().hits == 1
+
+    route.cache_clear()
+    route("london", "york")
+    assert len(calls) == 3
+
+def test_should_memoize_none():
+    calls = []
+
+    @memoize(LFUCache(), key=lambda graph, source, destination: (source, destination))
+    def unreachable(graph, source, destination):
+        calls.append(source)
+        return None
+
+    assert unreachable({}, "london", "belfast") is None
+    assert unreachable({}, "london", "belfast") is None
+    assert len(calls) == 1
+
+def test_should_reject_invalid_bounds():
+    with pytest.raises(ValueError):
+        LRUCache(max_entries=0)
+    with pytest.raises(ValueError):
+        TTLCache(ttl=0)
+
+def test_should_not_create_a_cache_without_an_eviction_policy():
+    with pytest.raises(TypeError):
+        Cache()
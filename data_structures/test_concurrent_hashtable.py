@@ -0,0 +1,83 @@
+from .concurrent_hashtable import ConcurrentHashTable
+from threading import Thread
+import pytest
+
+@pytest.fixture
+def hash_table():
+    sample_data = ConcurrentHashTable(capacity=100)
+
+    sample_data["hola"] = "hello"
+    sample_data[98.6] = 37
+    sample_data[False] = True
+
+    return sample_data
+
+def test_should_not_create_hashtable_with_zero_concurrency_level():
+    with pytest.raises(ValueError):
+        ConcurrentHashTable(concurrency_level=0)
+
+def test_should_round_segments_up_to_power_of_two():
+    assert len(ConcurrentHashTable(concurrency_level=10)._segments) == 16
+    assert len(ConcurrentHashTable(concurrency_level=1)._segments) == 1
+
+def test_should_insert_find_and_delete(hash_table):
+    assert len(hash_table) == 3
+    assert hash_table["hola"] == "hello"
+    assert hash_table.get("missing_key") is None
+
+    del hash_table["hola"]
+
+    assert "hola" not in hash_table
+    assert hash_table.pairs == {(98.6, 37), (False, True)}
+    with pytest.raises(KeyError):
+        hash_table["hola"]
+    with pytest.raises(KeyError):
+        del hash_table["hola"]
+
+def test_should_spread_keys_across_segments():
+    hash_table = ConcurrentHashTable(concurrency_level=8)
+    for i in range(800):
+        hash_table[i] = i
+
+    assert all(len(segment) > 0 for segment in hash_table._segments)
+
+def test_should_only_insert_default_once():
+    hash_table = ConcurrentHashTable()
+    assert hash_table.setdefault("hola", "hello") == "hello"
+    assert hash_table.setdefault("hola", "hallo") == "hello"
+
+def test_should_not_lose_writes_from_concurrent_threads():
+    hash_table = ConcurrentHashTable(capacity=1, concurrency_level=4)
+
+    def write(thread_id):
+        for i in range(2000):
+            hash_table[(thread_id, i)] = i
+
+    threads = [Thread(target=write, args=(thread_id,)) for thread_id in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(hash_table) == 8 * 2000
+    assert all(hash_table[(thread_id, i)] == i for thread_id in range(8) for i in range(2000))
+
+def test_should_read_existing_keys_while_segments_resize():
+    hash_table = ConcurrentHashTable(capacity=1, concurrency_level=2)
+    for i in range(100):
+        hash_table[("stable", i)] = i
+    missed = []
+
+    def read():
+        for _ in range(200):
+            for i in range(100):
+                if hash_table.get(("stable", i)) != i:
+                    missed.append(i)
+
+    reader = Thread(target=read)
+    reader.start()
+    for i in range(20_000):
+        hash_table[i] = i
+    reader.join()
+
+    assert missed == []
@@ -0,0 +1,108 @@
+from .disk_hashtable import DiskHashTable
+from . import disk_hashtable
+from unittest.mock import patch
+import pytest
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "table.bin"
+
+@pytest.fixture
+def hash_table(path):
+    with DiskHashTable(path, capacity=100) as sample_data:
+        sample_data["hola"] = "hello"
+        sample_data["98.6"] = 37
+        sample_data[b"false"] = [True]
+        yield sample_data
+
+def test_should_not_create_hashtable_with_zero_capacity(path):
+    with pytest.raises(ValueError):
+        DiskHashTable(path, capacity=0)
+
+def test_should_not_open_other_files(path):
+    path.write_bytes(b"not a hash table" * 10)
+    with pytest.raises(ValueError):
+        DiskHashTable(path)
+
+def truncated_table(path):
+    DiskHashTable(path, capacity=64).close()
+    return path.read_bytes()[:(len(path.read_bytes()) + 1) // 2]
+
+@pytest.mark.parametrize("content", [b"", b"MYHTBL01", truncated_table])
+def test_should_not_open_empty_or_truncated_files(path, content):
+    path.write_bytes(content(path) if callable(content) else content)
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    with patch.object(disk_hashtable, "open", tracking_open, create=True):
+        with pytest.raises(ValueError):
+            DiskHashTable(path)
+
+    assert opened and all(file.closed for file in opened)
+
+def test_should_only_accept_str_and_bytes_keys(hash_table):
+    with pytest.raises(TypeError):
+        hash_table[98.6] = 37
+
+def test_should_insert_and_find_pairs(hash_table):
+    assert len(hash_table) == 3
+    assert hash_table["hola"] == "hello"
+    assert hash_table[b"false"] == [True]
+    assert "false" not in hash_table
+    assert set(hash_table.keys) == {"hola", "98.6", b"false"}
+
+def test_should_raise_error_on_missing_key(hash_table):
+    with pytest.raises(KeyError):
+        hash_table["missing_key"]
+    with pytest.raises(KeyError):
+        del hash_table["missing_key"]
+    assert hash_table.get("missing_key") is None
+
+def test_should_update_and_delete_pairs(hash_table):
+    hash_table["hola"] = "hallo"
+    del hash_table["98.6"]
+
+    assert hash_table["hola"] == "hallo"
+    assert "98.6" not in hash_table
+    assert len(hash_table) == 2
+
+def test_should_not_grow_when_overwriting_a_key(path):
+    with DiskHashTable(path, capacity=10) as hash_table:
+        for i in range(6):
+            hash_table[f"key{i}"] = i # one more key would cross the load factor threshold
+
+        with patch.object(DiskHashTable, "_resize_and_rehash") as resize:
+            hash_table["key5"] = "five"
+
+        resize.assert_not_called()
+        assert hash_table["key5"] == "five"
+        assert len(hash_table) == 6
+
+def test_should_reopen_without_rehashing(path, hash_table):
+    hash_table["hola"] = "hallo"
+    del hash_table["98.6"]
+    hash_table.close()
+
+    with patch.object(DiskHashTable, "_resize_and_rehash") as resize, DiskHashTable(path) as reopened:
+        assert len(reopened) == 2
+        assert reopened.capacity == 100
+        assert reopened["hola"] == "hallo"
+        assert reopened[b"false"] == [True]
+        assert "98.6" not in reopened
+    resize.assert_not_called()
+
+def test_should_grow_and_keep_pairs_after_reopening(path):
+    with DiskHashTable(path, capacity=4) as hash_table:
+        for i in range(1000):
+            hash_table[f"key{i}"] = i
+        for i in range(0, 1000, 2):
+            del hash_table[f"key{i}"]
+        assert hash_table.capacity > 1000
+
+    with DiskHashTable(path) as hash_table:
+        assert len(hash_table) == 500
+        assert all(hash_table[f"key{i}"] == i for i in range(1, 1000, 2))
+        assert not any(f"key{i}" in hash_table for i in range(0, 1000, 2))
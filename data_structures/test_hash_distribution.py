@@ -0,0 +1,77 @@
+from .hash_distribution import (
+    distribute, analyze, compare, linear_probe_lengths,
+    fnv1a, murmur3, xxhash32,
+)
+from .hashtable import MyHashTable
+from random import Random
+import pytest
+
+@pytest.mark.parametrize("item, expected", [
+    ("", 0xCBF29CE484222325),
+    ("a", 0xAF63DC4C8601EC8C),
+    ("foobar", 0x85944171F73967E8),
+])
+def test_should_match_fnv1a_reference_values(item, expected):
+    assert fnv1a(item) == expected
+
+@pytest.mark.parametrize("item, seed, expected", [
+    ("", 0, 0),
+    ("", 1, 0x514E28B7),
+    ("hello", 0, 0x248BFA47),
+    ("Hello, world!", 1234, 0xFAF6CDB3),
+    ("The quick brown fox jumps over the lazy dog", 0, 0x2E4FF723),
+])
+def test_should_match_murmur3_reference_values(item, seed, expected):
+    assert murmur3(item, seed) == expected
+
+@pytest.mark.parametrize("item, expected", [
+    (b"", 0x02CC5D05),
+    ("a", 0x550D7456),
+    ("abc", 0x32D153FF),
+    ("Nobody inspects the spammish repetition", 0xE2293B2F),
+])
+def test_should_match_xxhash32_reference_values(item, expected):
+    assert xxhash32(item) == expected
+
+def test_should_distribute_items_from_a_stream():
+    assert distribute((i for i in range(10)), num_containers=5) == {i: 2 for i in range(5)}
+
+def test_should_report_perfectly_uniform_spread():
+    report = analyze(range(100), num_containers=10)
+
+    assert report.keys == 100
+    assert report.chi_square == 0
+    assert report.variance == 0
+    assert report.max_load == 10
+    assert report.expected_probes is None
+
+def test_should_report_skewed_spread():
+    report = analyze(range(0, 1000, 10), num_containers=10)
+
+    assert report.max_load == 100
+    assert report.chi_square == pytest.approx(900)
+    assert report.p_value < 0.001
+
+@pytest.mark.parametrize("capacity, keys", [(100, 60), (64, 63), (1000, 900)])
+def test_should_match_probe_lengths_of_linear_probing(capacity, keys):
+    random = Random(capacity)
+    items = [random.randrange(10 ** 9) for _ in range(keys)]
+    hash_table = MyHashTable(capacity=capacity, load_factor_threshold=0.999)
+    for item in items:
+        hash_table[item] = item
+
+    def probes(key, found):
+        for count, (_, pair) in enumerate(hash_table._probe(key), start=1):
+            if found(pair):
+                return count
+
+    hits = [probes(item, lambda pair: pair is not None and pair.key == item) for item in items]
+    misses = [probes(slot, lambda pair: pair is None) for slot in range(capacity)]
+
+    expected_probes, expected_miss_probes = linear_probe_lengths(distribute(items, capacity), capacity)
+    assert expected_probes == pytest.approx(sum(hits) / keys)
+    assert expected_miss_probes == pytest.approx(sum(misses) / capacity)
+
+def test_should_rank_clustered_hash_function_last():
+    ranking = compare(lambda: range(500), num_containers=1000, hash_functions={"hash": hash, "fnv1a": fnv1a})
+    assert list(ranking) == ["fnv1a", "hash"]
@@ -1,4 +1,7 @@
-from .hashtable import MyHashTable
+from .hashtable import (
+    MyHashTable, RobinHoodHashTable, CompactHashTable, DELETED,
+    linear_probing, quadratic_probing, double_hashing,
+)
 from unittest.mock import patch
 import pytest
 
@@ -142,4 +145,285 @@ def test_should_iterate_over_pairs(hash_table):
 
 def test_should_iterate_over_instance(hash_table):
     for key in hash_table:
-        assert key in ("hola", 98.6, False)
\ No newline at end of file
+        assert key in ("hola", 98.6, False)
+
+def test_should_not_create_hashtable_with_invalid_load_factor_threshold():
+    with pytest.raises(ValueError):
+        MyHashTable(capacity=100, load_factor_threshold=0)
+    with pytest.raises(ValueError):
+        MyHashTable(capacity=100, load_factor_threshold=1)
+
+def test_should_not_create_hashtable_with_invalid_shrink_threshold():
+    with pytest.raises(ValueError):
+        MyHashTable(capacity=100, load_factor_threshold=0.6, shrink_threshold=0.5)
+
+def test_should_report_load_factor(hash_table):
+    assert hash_table.load_factor == 0.03
+
+def test_should_grow_when_load_factor_threshold_is_reached():
+    hash_table = MyHashTable(capacity=1)
+
+    for i in range(100):
+        hash_table[i] = str(i)
+
+    assert len(hash_table) == 100
+    assert hash_table.capacity > 100
+    assert hash_table.load_factor <= 0.6
+    assert all(hash_table[i] == str(i) for i in range(100))
+
+def test_should_not_grow_when_overwriting_a_key():
+    hash_table = MyHashTable(capacity=10)
+    for i in range(6):
+        hash_table[i] = i # one more key would cross the load factor threshold
+
+    with patch.object(MyHashTable, "_resize_and_rehash") as resize:
+        hash_table[5] = "five"
+
+    resize.assert_not_called()
+    assert hash_table.capacity == 10
+    assert hash_table[5] == "five"
+    assert len(hash_table) == 6
+
+def test_should_shrink_when_shrink_threshold_is_reached():
+    hash_table = MyHashTable(capacity=8, shrink_threshold=0.1)
+    for i in range(100):
+        hash_table[i] = i
+    grown_capacity = hash_table.capacity
+
+    for i in range(95):
+        del hash_table[i]
+
+    assert hash_table.capacity < grown_capacity
+    assert hash_table.capacity >= 8
+    assert sorted(hash_table.keys) == [95, 96, 97, 98, 99]
+
+def test_should_drop_deleted_slots_when_rehashing():
+    hash_table = MyHashTable(capacity=16)
+
+    for i in range(10_000):
+        hash_table[f"key{i}"] = i
+        del hash_table[f"key{i}"]
+
+    assert len(hash_table) == 0
+    assert hash_table.capacity == 16
+    assert hash_table.load_factor <= 0.6
+
+def test_should_reuse_deleted_slot_on_insert():
+    hash_table = MyHashTable(capacity=100)
+    hash_table["hola"] = "hello"
+    del hash_table["hola"]
+
+    hash_table["hola"] = "hallo"
+
+    assert hash_table._slots.count(None) == 99
+    assert hash_table["hola"] == "hallo"
+
+def test_should_delete_colliding_keys():
+    hash_table = MyHashTable(capacity=100)
+    with patch("builtins.hash", return_value=7):
+        hash_table["foo"] = 1
+        hash_table["bar"] = 2
+
+        del hash_table["bar"]
+
+        assert "foo" in hash_table
+        assert "bar" not in hash_table
+        assert len(hash_table) == 1
+
+def test_should_report_length_without_scanning_slots(hash_table):
+    hash_table._slots = None
+    assert len(hash_table) == 3
+
+def test_should_return_live_views(hash_table):
+    keys, values, pairs = hash_table.keys, hash_table.values, hash_table.pairs
+
+    hash_table["Alice"] = 24
+
+    assert "Alice" in keys
+    assert 24 in values
+    assert ("Alice", 24) in pairs
+    assert len(keys) == len(values) == len(pairs) == 4
+
+def test_should_compare_views_like_sets(hash_table):
+    assert hash_table.keys == {"hola", 98.6, False}
+    assert hash_table.pairs == {("hola", "hello"), (98.6, 37), (False, True)}
+    assert hash_table.keys & {"hola", "missing_key"} == {"hola"}
+
+def test_should_not_find_mismatched_pair(hash_table):
+    assert ("hola", "hallo") not in hash_table.pairs
+    assert ("missing_key", None) not in hash_table.pairs
+
+def test_should_convert_to_string():
+    hash_table = MyHashTable(capacity=100)
+    assert str(hash_table) == "{}"
+
+    hash_table["hola"] = "hello"
+    assert str(hash_table) == "{'hola': 'hello'}"
+
+@pytest.mark.parametrize("probing", [linear_probing, quadratic_probing, double_hashing])
+@pytest.mark.parametrize("capacity", [1, 7, 8, 100])
+def test_should_visit_every_slot(probing, capacity):
+    for hash_code in (0, 1, 12345, -42, 2**61 - 1):
+        assert set(probing(hash_code, capacity)) == set(range(capacity))
+
+@pytest.fixture(params=[
+    lambda: MyHashTable(capacity=8, probing=linear_probing),
+    lambda: MyHashTable(capacity=8, probing=quadratic_probing),
+    lambda: MyHashTable(capacity=8, probing=double_hashing),
+    lambda: RobinHoodHashTable(capacity=8),
+    lambda: CompactHashTable(capacity=8),
+    lambda: CompactHashTable(capacity=8, probing=double_hashing),
+], ids=["linear", "quadratic", "double", "robin_hood", "compact", "compact_double"])
+def empty_table(request):
+    return request.param()
+
+def test_should_insert_find_and_delete_with_any_strategy(empty_table):
+    for i in range(500):
+        empty_table[i * 64] = i
+        empty_table[f"prefix-{i}"] = i
+    for i in range(0, 500, 2):
+        del empty_table[i * 64]
+        del empty_table[f"prefix-{i}"]
+
+    assert len(empty_table) == 500
+    for i in range(500):
+        if i % 2:
+            assert empty_table[i * 64] == i
+            assert empty_table[f"prefix-{i}"] == i
+        else:
+            assert i * 64 not in empty_table
+            assert f"prefix-{i}" not in empty_table
+
+def test_should_update_colliding_keys_with_any_strategy(empty_table):
+    with patch("builtins.hash", return_value=3):
+        empty_table["foo"] = 1
+        empty_table["bar"] = 2
+        empty_table["foo"] = 3
+
+        assert empty_table["foo"] == 3
+        assert empty_table["bar"] == 2
+        assert len(empty_table) == 2
+
+def test_should_not_leave_deleted_slots_with_robin_hood():
+    hash_table = RobinHoodHashTable(capacity=100)
+    with patch("builtins.hash", return_value=7):
+        for key in "abcde":
+            hash_table[key] = key
+        del hash_table["b"]
+
+        assert DELETED not in hash_table._slots
+        assert hash_table._slots[7:11] == [("a", "a"), ("c", "c"), ("d", "d"), ("e", "e")]
+        assert hash_table._slots[11] is None
+        assert "e" in hash_table
+
+def test_should_not_grow_when_overwriting_a_key_with_robin_hood():
+    hash_table = RobinHoodHashTable(capacity=10)
+    for i in range(6):
+        hash_table[i] = i
+
+    with patch.object(RobinHoodHashTable, "_resize_and_rehash") as resize:
+        hash_table[5] = "five"
+
+    resize.assert_not_called()
+    assert hash_table[5] == "five"
+    assert len(hash_table) == 6
+
+def test_should_keep_probe_distances_even_with_robin_hood():
+    hash_table = RobinHoodHashTable(capacity=100)
+    with patch("builtins.hash", side_effect=lambda key: key[0]):
+        hash_table[(0, "a")] = 1
+        hash_table[(0, "b")] = 2
+        hash_table[(1, "c")] = 3
+        hash_table[(1, "d")] = 4
+        hash_table[(0, "e")] = 5 # displaces the richer keys from slot 1
+
+        assert hash_table._slots[2].key == (0, "e")
+        assert {pair.key for pair in hash_table._slots[3:5]} == {(1, "c"), (1, "d")}
+        assert all(hash_table[key] for key in hash_table)
+
+def test_should_keep_insertion_order_in_compact_table():
+    hash_table = CompactHashTable(capacity=8)
+    for key in ["zulu", "alpha", "mike", "bravo", "yankee"]:
+        hash_table[key] = key.upper()
+    del hash_table["mike"]
+    hash_table["alpha"] = "ALFA"
+    hash_table["charlie"] = "CHARLIE"
+
+    assert list(hash_table) == ["zulu", "alpha", "bravo", "yankee", "charlie"]
+    assert list(hash_table.values) == ["ZULU", "ALFA", "BRAVO", "YANKEE", "CHARLIE"]
+    assert str(hash_table).startswith("{'zulu': 'ZULU', 'alpha': 'ALFA'")
+
+def test_should_compare_cached_hash_before_equality_in_compact_table():
+    class Key:
+        comparisons = 0
+
+        def __init__(self, name, hash_code):
+            self.name, self.hash_code = name, hash_code
+
+        def __hash__(self):
+            return self.hash_code
+
+        def __eq__(self, other):
+            Key.comparisons += 1
+            return self.name == other.name
+
+    hash_table = CompactHashTable(capacity=100)
+    for i in range(10):
+        hash_table[Key(f"key{i}", i * 100)] = i # every key starts probing from slot 0
+
+    assert hash_table[Key("key9", 900)] == 9
+    assert Key.comparisons == 1
+
+def test_should_use_narrow_index_array_in_compact_table():
+    assert CompactHashTable(capacity=100)._slots.itemsize == 1
+    assert CompactHashTable(capacity=1000)._slots.itemsize == 2
+
+@pytest.mark.parametrize("table_type", [MyHashTable, RobinHoodHashTable, CompactHashTable])
+def test_should_create_hashtable_from_items(table_type):
+    hash_table = table_type.from_items({"hola": "hello", 98.6: 37, False: True})
+
+    assert len(hash_table) == 3
+    assert hash_table.pairs == {("hola", "hello"), (98.6, 37), (False, True)}
+
+@pytest.mark.parametrize("table_type", [MyHashTable, RobinHoodHashTable, CompactHashTable])
+def test_should_not_resize_when_created_from_items(table_type):
+    with patch.object(table_type, "_resize_and_rehash") as resize:
+        hash_table = table_type.from_items((i, str(i)) for i in range(1000))
+
+    resize.assert_not_called()
+    assert hash_table.get_many(range(1000)) == [str(i) for i in range(1000)]
+
+def test_should_create_hashtable_from_another_hashtable(hash_table):
+    copy = MyHashTable.from_items(hash_table, probing=double_hashing)
+    assert copy.pairs == hash_table.pairs
+
+def test_should_update_from_mapping_and_keywords(empty_table):
+    empty_table["hola"] = "hello"
+
+    empty_table.update([("hola", "hallo"), ("Alice", 24)], Bob=42)
+
+    assert empty_table.pairs == {("hola", "hallo"), ("Alice", 24), ("Bob", 42)}
+
+def test_should_resize_at_most_once_when_setting_many(empty_table):
+    with patch.object(type(empty_table), "_resize_and_rehash", wraps=empty_table._resize_and_rehash) as resize:
+        empty_table.set_many({i: i for i in range(1000)})
+
+    assert resize.call_count == 1
+    assert len(empty_table) == 1000
+
+def test_should_reuse_deleted_slots_when_setting_many():
+    hash_table = MyHashTable(capacity=100)
+    hash_table.set_many([("hola", "hello"), ("Alice", 24)])
+    del hash_table["hola"]
+
+    hash_table.set_many([("hola", "hallo"), ("Alice", 25)])
+
+    assert hash_table._tombstones == 0
+    assert hash_table.pairs == {("hola", "hallo"), ("Alice", 25)}
+
+def test_should_get_many_values(empty_table):
+    empty_table.set_many({"hola": "hello", 98.6: 37})
+    del empty_table[98.6]
+
+    assert empty_table.get_many(["hola", 98.6, "missing_key"]) == ["hello", None, None]
+    assert empty_table.get_many(["missing_key"], default=0) == [0]
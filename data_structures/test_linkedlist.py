@@ -0,0 +1,151 @@
+from .linkedlist import MyLinkedList, Node, NodePool
+from .doubly_linkedlist import MyDoublyLinkedList, Node as DoublyNode
+import pytest
+
+LISTS = [(MyLinkedList, Node), (MyDoublyLinkedList, DoublyNode)]
+
+def data(linked_list):
+    return [node.data for node in linked_list]
+
+@pytest.mark.parametrize("list_class, node_class", LISTS)
+def test_should_not_consume_the_initial_items(list_class, node_class):
+    items = ["a", "b", "c"]
+    linked_list = list_class(items)
+
+    assert items == ["a", "b", "c"]
+    assert data(linked_list) == ["a", "b", "c"]
+    assert len(linked_list) == 3
+    assert linked_list.tail.data == "c"
+
+@pytest.mark.parametrize("list_class, node_class", LISTS)
+def test_should_build_from_an_empty_list(list_class, node_class):
+    linked_list = list_class([])
+
+    assert len(linked_list) == 0
+    assert linked_list.head is None and linked_list.tail is None
+
+@pytest.mark.parametrize("list_class, node_class", LISTS)
+def test_should_add_and_pop_at_both_ends(list_class, node_class):
+    linked_list = list_class()
+    linked_list.add_last(node_class("b"))
+    linked_list.add_first(node_class("a"))
+    linked_list.add_last(node_class("c"))
+
+    assert data(linked_list) == ["a", "b", "c"]
+    assert linked_list.pop_last().data == "c"
+    assert linked_list.pop_first().data == "a"
+    assert linked_list.pop_last().data == "b"
+    assert len(linked_list) == 0
+    assert linked_list.head is None and linked_list.tail is None
+    with pytest.raises(Exception):
+        linked_list.pop_first()
+
+@pytest.mark.parametrize("list_class, node_class", LISTS)
+def test_should_keep_tail_and_size_through_inserts_and_removals(list_class, node_class):
+    linked_list = list_class(["a", "c"])
+    linked_list.add_after("c", node_class("d"))
+    linked_list.add_before("c", node_class("b"))
+    linked_list.add_before("a", node_class("start"))
+
+    assert data(linked_list) == ["start", "a", "b", "c", "d"]
+    assert linked_list.tail.data == "d"
+    assert len(linked_list) == 5
+
+    linked_list.remove("d")
+    linked_list.remove("start")
+
+    assert data(linked_list) == ["a", "b", "c"]
+    assert linked_list.tail.data == "c"
+    assert len(linked_list) == 3
+    linked_list.add_last(node_class("e"))
+    assert data(linked_list) == ["a", "b", "c", "e"]
+
+def test_should_link_doubly_linked_nodes_both_ways():
+    linked_list = MyDoublyLinkedList(["b"])
+    linked_list.add_first(DoublyNode("a"))
+    linked_list.add_after("a", DoublyNode("ab"))
+    linked_list.add_last(DoublyNode("c"))
+
+    backwards, node = [], linked_list.tail
+    while node is not None:
+        backwards.append(node.data)
+        node = node.prev
+
+    assert backwards == ["c", "b", "ab", "a"]
+
+def test_should_insert_and_unlink_around_node_handles():
+    linked_list = MyDoublyLinkedList(["b"])
+    b = linked_list.head
+    linked_list.insert_before(b, DoublyNode("a"))
+    linked_list.insert_after(b, DoublyNode("c"))
+
+    assert data(linked_list) == ["a", "b", "c"]
+    assert linked_list.unlink(linked_list.tail).data == "c"
+    assert linked_list.unlink(b) is b
+    assert b.prev is None and b.next is None
+    assert data(linked_list) == ["a"]
+    assert linked_list.head is linked_list.tail
+    assert len(linked_list) == 1
+
+def test_should_remove_the_last_node():
+    linked_list = MyDoublyLinkedList(["a", "b"])
+    linked_list.remove("b")
+    linked_list.add_last(DoublyNode("c"))
+
+    assert data(linked_list) == ["a", "c"]
+    assert linked_list.tail.prev is linked_list.head
+
+def test_should_move_nodes_to_either_end():
+    linked_list = MyDoublyLinkedList(["a", "b", "c"])
+    linked_list.move_to_end(linked_list.head)
+    linked_list.move_to_front(linked_list.find("b").next)
+
+    assert data(linked_list) == ["c", "b", "a"]
+    assert len(linked_list) == 3
+
+def test_should_find_nodes_through_the_index():
+    linked_list = MyDoublyLinkedList(["a", "b", "c"], indexed=True)
+    linked_list.add_after("c", DoublyNode("d"))
+    linked_list.remove("a")
+
+    assert linked_list.find("d") is linked_list.tail
+    assert "a" not in linked_list
+    assert "b" in linked_list
+    assert set(linked_list.index) == {"b", "c", "d"}
+    with pytest.raises(Exception):
+        linked_list.add_last(DoublyNode("b"))
+    with pytest.raises(Exception):
+        linked_list.remove("a")
+
+@pytest.mark.parametrize("list_class, node_class", LISTS)
+def test_should_not_give_nodes_a_dict(list_class, node_class):
+    assert not hasattr(node_class("a"), "__dict__")
+
+@pytest.mark.parametrize("list_class, node_class", LISTS)
+def test_should_reuse_removed_nodes_from_the_pool(list_class, node_class):
+    pool = NodePool(node_class, max_size=1)
+    linked_list = list_class(["a", "b", "c"], pool=pool)
+    b = linked_list.head.next
+    linked_list.remove("b")
+    linked_list.remove("c") # the pool is full already
+
+    assert len(pool) == 1
+    assert b.data is None and b.next is None
+    reused = pool.acquire("d")
+    assert reused is b and reused.data == "d"
+    assert len(pool) == 0
+    linked_list.add_last(reused)
+    assert data(linked_list) == ["a", "d"]
+    assert pool.acquire("e") is not b
+
+def test_should_unlink_the_previous_node_of_doubly_linked_subclasses():
+    class Entry(DoublyNode):
+        __slots__ = ("value",)
+
+    pool = NodePool(Entry)
+    a, b = Entry("a"), Entry("b")
+    b.prev = a
+    pool.release(b)
+
+    assert b.prev is None and b.data is None
+    assert pool.acquire("c") is b
@@ -0,0 +1,50 @@
+from .queues import IndexedPriorityQueue
+from random import Random
+import pytest
+
+def test_should_dequeue_by_priority_then_insertion_order():
+    queue = IndexedPriorityQueue()
+    for priority, value in [(3, "radio"), (1, "ABS"), (2, "hazard lights"), (1, "brakes")]:
+        queue.enqueue(priority, value)
+
+    assert list(queue) == ["ABS", "brakes", "hazard lights", "radio"]
+
+def test_should_keep_each_value_once():
+    queue = IndexedPriorityQueue()
+    queue.enqueue(5, "london")
+    queue.enqueue(3, "london")
+    queue.enqueue(9, "london")
+
+    assert len(queue) == 1
+    assert queue.priority("london") == 3
+
+def test_should_decrease_key():
+    queue = IndexedPriorityQueue()
+    for priority, value in [(1, "a"), (2, "b"), (3, "c")]:
+        queue.enqueue(priority, value)
+
+    queue.decrease_key("c", 0)
+
+    assert "c" in queue
+    assert queue.peek() == (0, "c")
+    assert queue.dequeue_with_priority() == (0, "c")
+    assert "c" not in queue
+
+def test_should_not_raise_priority_with_decrease_key():
+    queue = IndexedPriorityQueue()
+    queue.enqueue(1, "a")
+    with pytest.raises(ValueError):
+        queue.decrease_key("a", 2)
+
+def test_should_match_sorted_order_under_random_updates():
+    random = Random(42)
+    queue, expected = IndexedPriorityQueue(), {}
+    for _ in range(5000):
+        value, priority = random.randrange(500), random.randrange(1000)
+        queue.enqueue(priority, value)
+        expected[value] = min(expected.get(value, priority), priority)
+
+    popped = [queue.dequeue_with_priority() for _ in range(len(queue))]
+
+    assert [priority for priority, _ in popped] == sorted(expected.values())
+    assert all(expected[value] == priority for priority, value in popped)
@@ -0,0 +1,119 @@
+from .unrolled_linkedlist import UnrolledLinkedList
+from random import Random
+import pytest
+
+def test_should_append_and_index():
+    sequence = UnrolledLinkedList(range(10), chunk_size=4)
+    sequence.append(10)
+
+    assert len(sequence) == 11
+    assert list(sequence) == list(range(11))
+    assert sequence[0] == 0 and sequence[7] == 7 and sequence[-1] == 10
+    assert list(reversed(sequence)) == list(range(10, -1, -1))
+    assert 5 in sequence and 11 not in sequence
+    with pytest.raises(IndexError):
+        sequence[11]
+
+def test_should_stream_chunks():
+    sequence = UnrolledLinkedList(range(10), chunk_size=4)
+
+    assert list(sequence.chunks()) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+def test_should_split_full_chunks_and_merge_sparse_ones():
+    sequence = UnrolledLinkedList(range(8), chunk_size=4)
+    sequence.insert(1, "a")
+
+    assert list(sequence.chunks()) == [[0, "a"], [1, 2, 3], [4, 5, 6, 7]]
+
+    sequence.pop(1)
+    assert list(sequence.chunks()) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+def test_should_match_a_list_under_random_edits():
+    random = Random(5)
+    sequence, expected = UnrolledLinkedList(chunk_size=8), []
+    for item in range(5000):
+        operation = random.randrange(5)
+        if operation < 2:
+            sequence.append(item)
+            expected.append(item)
+        elif operation == 2:
+            index = random.randint(-len(expected) - 1, len(expected) + 1)
+            sequence.insert(index, item)
+            expected.insert(index, item)
+        elif expected and operation == 3:
+            index = random.randrange(-len(expected), len(expected))
+            assert sequence.pop(index) == expected.pop(index)
+        elif expected:
+            index = random.randrange(len(expected))
+            sequence[index] = item
+            expected[index] = item
+            assert sequence[index] == expected[index]
+
+    assert list(sequence) == expected
+    assert len(sequence) == len(expected)
+    assert all(0 < len(items) <= 8 for items in sequence.chunks())
+
+def test_should_grow_chunks_with_the_list():
+    sequence = UnrolledLinkedList()
+    for item in range(100_000):
+        sequence.append(item)
+
+    assert list(sequence) == list(range(100_000))
+    assert 150 <= sequence.chunk_size <= 320 # about √n
+    assert sequence[54_321] == 54_321
+
+def test_should_splice_and_split_off():
+    sequence = UnrolledLinkedList(range(10), chunk_size=4)
+    other = UnrolledLinkedList("abcde", chunk_size=4)
+    sequence.splice(5, other)
+
+    assert list(sequence) == [0, 1, 2, 3, 4, "a", "b", "c", "d", "e", 5, 6, 7, 8, 9]
+    assert len(other) == 0 and list(other) == []
+
+    rest = sequence.split_off(-5)
+    assert list(rest) == [5, 6, 7, 8, 9]
+    assert list(sequence) == [0, 1, 2, 3, 4, "a", "b", "c", "d", "e"]
+    assert len(sequence) == 10 and len(rest) == 5
+
+    rest.splice(0, sequence.split_off(0))
+    assert list(rest) == [0, 1, 2, 3, 4, "a", "b", "c", "d", "e", 5, 6, 7, 8, 9]
+    assert len(sequence) == 0 and sequence.head is None and sequence.tail is None
+    sequence.append("z")
+    assert list(sequence) == ["z"]
+
+def test_should_not_splice_into_itself():
+    sequence = UnrolledLinkedList([1])
+    with pytest.raises(ValueError):
+        sequence.splice(0, sequence)
+
+def chunk_bound(sequence):
+    """Most chunks a list can have when any two neighbouring chunks hold at least chunk_size - 1 elements"""
+    return 2 * len(sequence) // (sequence.chunk_size - 1) + 1
+
+@pytest.mark.parametrize("chunk_size", [100, None])
+def test_should_keep_chunks_full_under_repeated_split_and_splice(chunk_size):
+    random = Random(0)
+    sequence, expected = UnrolledLinkedList(range(10_000), chunk_size=chunk_size), list(range(10_000))
+
+    for _ in range(3_000):
+        index = random.randrange(len(expected) + 1)
+        rest = sequence.split_off(index)
+        tail = expected[index:]
+        del expected[index:]
+        assert len(list(sequence.chunks())) <= chunk_bound(sequence)
+        assert len(list(rest.chunks())) <= chunk_bound(rest)
+
+        position = random.randrange(len(expected) + 1)
+        sequence.splice(position, rest)
+        expected[position:position] = tail
+        assert len(list(sequence.chunks())) <= chunk_bound(sequence)
+
+    assert list(sequence) == expected
+    assert all(sequence[index] == expected[index] for index in range(0, 10_000, 997))
+
+def test_should_pack_smaller_chunks_when_splicing():
+    sequence = UnrolledLinkedList(range(1_000), chunk_size=100)
+    sequence.splice(500, UnrolledLinkedList(range(1_000), chunk_size=4))
+
+    assert list(sequence) == [*range(500), *range(1_000), *range(500, 1_000)]
+    assert len(list(sequence.chunks())) <= chunk_bound(sequence)
@@ -0,0 +1,264 @@
+from itertools import chain
+from math import isqrt
+
+MIN_CHUNK_SIZE = 16
+
+class Chunk():
+    __slots__ = ("items", "next", "prev") # items is a list of at most chunk_size elements
+
+    def __init__(self, items):
+        self.items = items
+        self.next = None
+        self.prev = None
+
+class UnrolledLinkedList():
+    """
+    Sequence stored as a doubly linked list of chunks, each a small list of up to chunk_size elements,
+    so that scans read whole lists instead of following one link per element.
+    * append is amortized O(1), it only fills the last chunk or links a new one
+    * indexing, insertion and deletion walk chunk by chunk from the closest end, then shift one chunk's elements:
+      O(√n) since chunks hold about √n elements
+    * splice and split_off move whole runs of chunks between lists in O(√n), without copying their elements
+    * chunks() streams the chunk lists themselves for bulk consumers
+    A chunk that gets full on insertion is split in two. Neighbouring chunks are merged whenever one of them is
+    under half full and they fit together, after insertions, deletions and the cuts splice and split_off make,
+    so that there are at most about 2n / chunk_size chunks. Without a fixed chunk_size the chunk size follows √n,
+    every chunk being refilled at the new size whenever the list grows fourfold.
+    """
+    def __init__(self, items=(), chunk_size=None):
+        if chunk_size is not None and chunk_size < 2:
+            raise ValueError("Chunk size must be an integer value of at least 2")
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self.chunk_size = chunk_size or MIN_CHUNK_SIZE
+        self._adaptive = chunk_size is None
+        self._rebalance_at = 4 * self.chunk_size ** 2 # size at which chunks hold about √n elements again
+        self.extend(items)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.chunks()) # only one generator step per chunk
+
+    def __reversed__(self):
+        chunk = self.tail
+        while chunk is not None:
+            yield from reversed(chunk.items)
+            chunk = chunk.prev
+
+    def __repr__(self):
+        return f"UnrolledLinkedList({list(self)!r})"
+
+    def __contains__(self, item):
+        return any(item in items for items in self.chunks())
+
+    def __getitem__(self, index):
+        chunk, offset = self._locate(index)
+        return chunk.items[offset]
+
+    def __setitem__(self, index, item):
+        chunk, offset = self._locate(index)
+        chunk.items[offset] = item
+
+    def __delitem__(self, index):
+        self.pop(index)
+
+    def chunks(self):
+        """The chunks' lists from first to last, which must not be modified"""
+        chunk = self.head
+        while chunk is not None:
+            yield chunk.items
+            chunk = chunk.next
+
+    def append(self, item):
+        if self.tail is None or len(self.tail.items) >= self.chunk_size:
+            self._link(Chunk([item]), self.tail, None)
+        else:
+            self.tail.items.append(item)
+        self.size += 1
+        self._rebalance_if_needed()
+
+    def extend(self, items):
+        """Append items, filling whole chunks at a time"""
+        items = list(items)
+        start = 0
+        if self.tail is not None and items:
+            start = max(self.chunk_size - len(self.tail.items), 0)
+            self.tail.items.extend(items[:start])
+        for index in range(start, len(items), self.chunk_size):
+            self._link(Chunk(items[index:index + self.chunk_size]), self.tail, None)
+        self.size += len(items)
+        self._rebalance_if_needed()
+
+    def insert(self, index, item):
+        """Insert item before position index, at the end when index is len(self) or more"""
+        if index < 0:
+            index = max(index + self.size, 0)
+        if index >= self.size:
+            return self.append(item)
+        chunk, offset = self._locate(index)
+        chunk.items.insert(offset, item)
+        self.size += 1
+        if len(chunk.items) > self.chunk_size:
+            half = len(chunk.items) // 2
+            self._link(Chunk(chunk.items[half:]), chunk, chunk.next)
+            del chunk.items[half:]
+            self._merge_around(chunk.next)
+            self._merge_around(chunk)
+        self._rebalance_if_needed()
+
+    def pop(self, index=-1):
+        if self.size == 0:
+            raise IndexError("pop from an empty list")
+        chunk, offset = self._locate(index)
+        item = chunk.items.pop(offset)
+        self.size -= 1
+        if not chunk.items:
+            self._unlink(chunk)
+        else:
+            self._merge_around(chunk)
+        return item
+
+    def splice(self, index, other):
+        """Move every element of other, another UnrolledLinkedList, before position index, leaving other empty"""
+        if other is self:
+            raise ValueError("Cannot splice a list into itself")
+        if other.head is None:
+            return
+        if other.chunk_size < self.chunk_size:
+            # pack other's chunks to this list's size first, or its small chunks would sit next to each other
+            other.chunk_size = self.chunk_size
+            chunk = other.head
+            while chunk is not None:
+                if not other._merge(chunk):
+                    chunk = chunk.next
+        if index < 0:
+            index = max(index + self.size, 0)
+        before, after = self._cut(min(index, self.size))
+        if before is None:
+            self.head = other.head
+        else:
+            before.next = other.head
+        other.head.prev = before
+        if after is None:
+            self.tail = other.tail
+        else:
+            after.prev = other.tail
+        other.tail.next = after
+        # the cut may leave small chunks either side of other's
+        if after is not None:
+            self._merge_around(after)
+        if before is not None:
+            self._merge_around(before)
+        self.size += other.size
+        other.head = other.tail = None
+        other.size = 0
+        self._rebalance_if_needed()
+
+    def split_off(self, index):
+        """Remove the elements from position index on and return them as a new list"""
+        if index < 0:
+            index = max(index + self.size, 0)
+        index = min(index, self.size)
+        rest = UnrolledLinkedList(chunk_size=None if self._adaptive else self.chunk_size)
+        rest.chunk_size, rest._rebalance_at = self.chunk_size, self._rebalance_at
+        before, after = self._cut(index)
+        if after is not None:
+            rest.head, rest.tail = after, self.tail
+            after.prev = None
+            self.tail = before
+            if before is None:
+                self.head = None
+            else:
+                before.next = None
+        rest.size = self.size - index
+        self.size = index
+        if before is not None:
+            self._merge_around(before) # the cut may leave a small chunk at the end of this list and the start of rest
+        if after is not None:
+            rest._merge_around(after)
+        self._rebalance_if_needed()
+        rest._rebalance_if_needed()
+        return rest
+
+    def _locate(self, index):
+        """Chunk holding position index and the offset within it, walking from the closest end"""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("list index out of range")
+        if index < self.size // 2:
+            chunk = self.head
+            while index >= len(chunk.items):
+                index -= len(chunk.items)
+                chunk = chunk.next
+            return chunk, index
+        index = self.size - index # distance from the end, at least 1
+        chunk = self.tail
+        while index > len(chunk.items):
+            index -= len(chunk.items)
+            chunk = chunk.prev
+        return chunk, len(chunk.items) - index
+
+    def _cut(self, index):
+        """Split the chunks so that position index starts one, returning the chunks either side of the cut"""
+        if index == self.size:
+            return self.tail, None
+        chunk, offset = self._locate(index)
+        if offset == 0:
+            return chunk.prev, chunk
+        self._link(Chunk(chunk.items[offset:]), chunk, chunk.next)
+        del chunk.items[offset:]
+        return chunk, chunk.next
+
+    def _merge(self, chunk):
+        """Move the chunk after chunk into it when either of them is under half full and they fit in one chunk"""
+        following = chunk.next
+        if following is None or min(len(chunk.items), len(following.items)) >= self.chunk_size // 2 \
+                or len(chunk.items) + len(following.items) > self.chunk_size:
+            return False
+        chunk.items.extend(following.items)
+        self._unlink(following)
+        return True
+
+    def _merge_around(self, chunk):
+        """
+        Merge a chunk that shrank or got new neighbours with them where _merge() allows, so that once again
+        no two neighbouring chunks could be merged: any two of them then hold about chunk_size elements or more
+        """
+        previous = chunk.prev
+        if previous is not None and self._merge(previous):
+            chunk = previous
+        self._merge(chunk)
+
+    def _link(self, chunk, prev_chunk, next_chunk):
+        chunk.prev, chunk.next = prev_chunk, next_chunk
+        if prev_chunk is None:
+            self.head = chunk
+        else:
+            prev_chunk.next = chunk
+        if next_chunk is None:
+            self.tail = chunk
+        else:
+            next_chunk.prev = chunk
+
+    def _unlink(self, chunk):
+        if chunk.prev is None:
+            self.head = chunk.next
+        else:
+            chunk.prev.next = chunk.next
+        if chunk.next is None:
+            self.tail = chunk.prev
+        else:
+            chunk.next.prev = chunk.prev
+
+    def _rebalance_if_needed(self):
+        if self._adaptive and self.size >= self._rebalance_at:
+            self.chunk_size = max(isqrt(self.size), MIN_CHUNK_SIZE)
+            self._rebalance_at = 4 * self.size
+            items = list(self)
+            self.head = self.tail = None
+            self.size = 0
+            self.extend(items)